@@ -6,6 +6,8 @@ from __future__ import absolute_import
 import logging
 log = logging.getLogger(__name__)
 
+import threading
+
 from tornado import gen
 
 from abc import ABCMeta, abstractmethod
@@ -57,6 +59,21 @@ class ServerContext(with_metaclass(ABCMeta)):
         """ Removes a callback added with add_periodic_callback."""
         raise NotImplementedError("remove_periodic_callback")
 
+    @abstractmethod
+    def run_in_executor(self, func, *args, **kwargs):
+        """ Runs func(*args, **kwargs) on the server's executor, so that slow
+        work doesn't stall the server.
+
+        With a process executor (``bokeh serve --executor=process``), func and
+        its arguments must be picklable, e.g. func must be defined at the top
+        level of a module.
+
+        Returns:
+            a Future containing the result of the function
+
+        """
+        raise NotImplementedError("run_in_executor")
+
 class SessionContext(with_metaclass(ABCMeta)):
     def __init__(self, server_context, session_id):
         self._server_context = server_context
@@ -94,13 +111,72 @@ class SessionContext(with_metaclass(ABCMeta)):
         """
         raise NotImplementedError("locked_document")
 
+    @abstractmethod
+    def run_in_executor(self, func, *args, **kwargs):
+        """ Runs func(*args, **kwargs) on the server's executor, so that slow
+        work doesn't stall the server. The function must not touch the
+        document; update the document with the result in
+        ``with_locked_document``, for example::
+
+            @gen.coroutine
+            def update():
+                data = yield session_context.run_in_executor(load_data, path)
+                def apply(doc):
+                    source.data = data
+                yield session_context.with_locked_document(apply)
+
+        Returns:
+            a Future containing the result of the function
+
+        """
+        raise NotImplementedError("run_in_executor")
+
 class Application(object):
     ''' An Application is a factory for Document instances.
 
+    Args:
+        handlers (Handler) : handlers that initialize new documents
+        clone_documents (bool, optional) :
+            Whether to run the handlers only once and initialize new
+            documents with copies of the result (default: False).
+            See ``clone_documents``.
+
     '''
 
-    def __init__(self, *handlers):
+    def __init__(self, *handlers, **kwargs):
         self._handlers = list(handlers)
+        self._clone_documents = kwargs.pop('clone_documents', False)
+        if kwargs:
+            raise TypeError("unexpected keyword arguments: %s" % ", ".join(sorted(kwargs)))
+        # the document that new documents are cloned from, built on first use
+        self._template = None
+        self._template_lock = threading.Lock()
+
+    @property
+    def clone_documents(self):
+        ''' Whether new documents are copies of a document that the
+        handlers initialized once, instead of being initialized by the
+        handlers every time.
+
+        This is much faster for applications whose initial document is
+        the same for every session. Models in the copies have fresh ids,
+        and ``on_session_created`` hooks still run for every session.
+        Copies can't have Python callbacks, so if the handlers add any
+        (with ``on_change``, ``add_periodic_callback``, etc.), a warning
+        is logged and documents are initialized by the handlers again.
+
+        Copies are made without running ``__init__``. Custom model classes
+        that define ``__init__`` to keep state outside of their properties
+        must also define ``_copy_to_clone(self, clone)`` to copy that state
+        to ``clone``. If they don't define it, documents are initialized by
+        the handlers as well.
+
+        '''
+        return self._clone_documents
+
+    @clone_documents.setter
+    def clone_documents(self, value):
+        self._clone_documents = value
 
     def create_document(self):
         ''' Creates and initializes a document using the Application's handlers.'''
@@ -110,6 +186,34 @@ class Application(object):
 
     def initialize_document(self, doc):
         ''' Fills in a new document using the Application's handlers. '''
+        if self._clone_documents:
+            template = self._get_template()
+            if template is not None:
+                template._clone_into(doc)
+                return
+        self._run_handlers(doc)
+
+    def _get_template(self):
+        with self._template_lock:
+            if self._template is None and self._clone_documents:
+                template = Document()
+                self._run_handlers(template)
+                if any(h.failed for h in self._handlers):
+                    log.warning("Not cloning documents because an application handler failed")
+                    self._clone_documents = False
+                elif template._has_python_callbacks():
+                    log.warning("Not cloning documents because the application adds Python callbacks, "
+                                "which can't be copied; documents will be initialized for every session")
+                    self._clone_documents = False
+                elif template._has_uncloneable_models():
+                    log.warning("Not cloning documents because the application uses models with an __init__ "
+                                "and no _copy_to_clone; documents will be initialized for every session")
+                    self._clone_documents = False
+                else:
+                    self._template = template
+            return self._template
+
+    def _run_handlers(self, doc):
         for h in self._handlers:
             # TODO (havocp) we need to check the 'failed' flag on each handler
             # and build a composite error display. In develop mode, we want to
@@ -130,6 +234,7 @@ class Application(object):
 
         '''
         self._handlers.append(handler)
+        self._template = None
 
     @property
     def handlers(self):
@@ -14,6 +14,20 @@ class SomeModelInTestApplication(Model):
     foo = Int(2)
     child = Instance(Model)
 
+class InitModelInTestApplication(Model):
+    # like a model defined by an application, outside of Bokeh
+    __module__ = 'app'
+
+    def __init__(self, **kwargs):
+        super(InitModelInTestApplication, self).__init__(**kwargs)
+        self._state = []
+
+class CopyingInitModelInTestApplication(InitModelInTestApplication):
+    __module__ = 'app'
+
+    def _copy_to_clone(self, clone):
+        clone._state = list(self._state)
+
 class TestApplication(unittest.TestCase):
 
     def test_empty(self):
@@ -44,3 +58,65 @@ class TestApplication(unittest.TestCase):
         a.add(handler2)
         doc = a.create_document()
         assert len(doc.roots) == 3
+
+    def test_clone_documents(self):
+        calls = []
+        def add_roots(doc):
+            calls.append(doc)
+            child = AnotherModelInTestApplication(bar=10)
+            doc.add_root(SomeModelInTestApplication(foo=5, child=child))
+            doc.add_root(child)
+            doc.title = "Cloned"
+        a = Application(FunctionHandler(add_roots), clone_documents=True)
+        doc1 = a.create_document()
+        doc2 = a.create_document()
+        assert len(calls) == 1
+        assert a.clone_documents
+        for doc in (doc1, doc2):
+            assert doc.title == "Cloned"
+            assert len(doc.roots) == 2
+            some, child = sorted(doc.roots, key=lambda r: r.__class__.__name__, reverse=True)
+            assert some.foo == 5
+            assert some.child is child
+            assert child.bar == 10
+            assert child.document is doc
+        assert not set(doc1._all_models) & set(doc2._all_models)
+
+    def test_clone_documents_with_python_callbacks(self):
+        calls = []
+        def add_roots(doc):
+            calls.append(doc)
+            model = AnotherModelInTestApplication()
+            model.on_change('bar', lambda attr, old, new: None)
+            doc.add_root(model)
+        a = Application(FunctionHandler(add_roots), clone_documents=True)
+        doc1 = a.create_document()
+        doc2 = a.create_document()
+        assert not a.clone_documents
+        assert len(calls) == 3
+        assert len(doc1.roots) == 1
+        assert len(doc2.roots) == 1
+
+    def test_clone_documents_with_model_init(self):
+        calls = []
+        def add_roots(doc):
+            calls.append(doc)
+            doc.add_root(InitModelInTestApplication())
+        a = Application(FunctionHandler(add_roots), clone_documents=True)
+        doc = a.create_document()
+        assert not a.clone_documents
+        assert len(calls) == 2
+        assert doc.roots[0]._state == []
+
+    def test_clone_documents_with_copy_to_clone(self):
+        calls = []
+        def add_roots(doc):
+            calls.append(doc)
+            model = CopyingInitModelInTestApplication()
+            model._state.append(1)
+            doc.add_root(model)
+        a = Application(FunctionHandler(add_roots), clone_documents=True)
+        doc = a.create_document()
+        assert a.clone_documents
+        assert len(calls) == 1
+        assert doc.roots[0]._state == [1]
@@ -17,6 +17,8 @@ from tornado.concurrent import Future
 from bokeh.server.exceptions import MessageError, ProtocolError, ValidationError
 from bokeh.server.protocol.receiver import Receiver
 from bokeh.server.protocol import Protocol
+from bokeh.util.tornado import (DEFAULT_WEBSOCKET_COMPRESSION_LEVEL, websocket_compression_options,
+                                write_websocket_message)
 
 class _WebSocketClientConnectionWrapper(object):
     ''' Used for compat across Tornado versions and to add write_lock'''
@@ -28,6 +30,10 @@ class _WebSocketClientConnectionWrapper(object):
         # write_lock allows us to lock the connection to send multiple
         # messages atomically.
         self.write_lock = locks.Lock()
+        # bytes of messages written, and bytes they took on the wire
+        # after compression and framing
+        self.bytes_sent = 0
+        self.wire_bytes_sent = 0
 
     @gen.coroutine
     def write_message(self, message, binary=False, locked=True):
@@ -41,7 +47,10 @@ class _WebSocketClientConnectionWrapper(object):
                 # is closed.
                 raise WebSocketError("Connection to the server has been closed")
 
-            future = self._socket.write_message(message, binary)
+            future, message_bytes, wire_bytes = write_websocket_message(
+                self._socket.protocol, message, binary)
+            self.bytes_sent += message_bytes
+            self.wire_bytes_sent += wire_bytes
             if future is None:
                 # tornado >= 4.3 gives us a Future, simulate that
                 # with this fake Future on < 4.3
@@ -165,8 +174,10 @@ class ClientConnection(object):
             log.info("We're disconnected, so not sending message %r", message)
         else:
             try:
+                wire_bytes_sent = self._socket.wire_bytes_sent
                 sent = yield message.send(self._socket)
-                log.debug("Sent %r [%d bytes]", message, sent)
+                log.debug("Sent %r [%d bytes, %d on the wire]",
+                          message, sent, self._socket.wire_bytes_sent - wire_bytes_sent)
             except WebSocketError as e:
                 # A thing that happens is that we detect the
                 # socket closing by getting a None from
@@ -318,7 +329,9 @@ class ClientConnection(object):
         versioned_url = "%s?bokeh-protocol-version=1.0&bokeh-session-id=%s" % (self._url, self._session.id)
         request = HTTPRequest(versioned_url)
         try:
-            socket = yield websocket_connect(request)
+            # offer compression, the server decides whether to use it
+            socket = yield websocket_connect(request, compression_options=websocket_compression_options(
+                DEFAULT_WEBSOCKET_COMPRESSION_LEVEL))
             self._socket = _WebSocketClientConnectionWrapper(socket)
         except Exception as e:
             log.info("Failed to connect to server: %r", e)
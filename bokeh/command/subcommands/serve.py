@@ -170,6 +170,58 @@ that is SSL-terminated.
     It is not advised to set this option on a Bokeh server directly facing
     the Internet.
 
+Large messages, such as the initial copy of a document with big data
+sources, can be compressed with the websocket permessage-deflate
+extension. To compress messages to clients that support it, set the
+--websocket-compression-level option to a zlib level between 1 (fastest)
+and 9 (smallest):
+
+.. code-block:: sh
+
+    bokeh serve app_script.py --websocket-compression-level 6
+
+Compression is off by default. The debug log reports the bytes sent
+with the other statistics.
+
+To protect the server from clients that send very large messages, set
+the --websocket-max-message-size option to the largest message, in
+bytes, that clients may send. Connections that send larger messages are
+closed. By default there is no limit:
+
+.. code-block:: sh
+
+    bokeh serve app_script.py --websocket-max-message-size 50000000
+
+The JSON content of messages larger than 1 MB, such as the document
+sent by ``push_session``, is decoded on the executor set with the
+--executor option (see below), so that decoding it doesn't stop the
+server from serving other clients. Set a different threshold with the
+--decode-executor-min-size option. The debug log reports the time spent
+decoding each type of message with the other statistics.
+
+Clients on slow connections can fall behind the changes to their
+session's document. To stop them from holding up other clients or
+using more and more server memory, set the --websocket-max-queued-bytes
+option to the number of bytes of messages that can wait to go out to a
+client before it counts as slow:
+
+.. code-block:: sh
+
+    bokeh serve app_script.py --websocket-max-queued-bytes 4000000 --slow-client-policy resync
+
+Document changes for a slow client are handled according to the
+--slow-client-policy option. With ``coalesce`` (the default), they are
+held back until the client catches up and then sent together, with
+repeated changes to a property collapsed and streamed data merged.
+``resync`` also holds them back, but then sends the current values of
+the changed properties instead of any streamed or patched data.
+``disconnect`` closes the connection to the slow client. By default,
+clients never count as slow.
+
+Held back changes are coalesced as they arrive. If more than
+--slow-client-max-held-events of them are still held for a client, its
+connection is closed as with ``disconnect``.
+
 Session ID Options
 ~~~~~~~~~~~~~~~~~~
 
@@ -261,6 +313,103 @@ The value is specified in milliseconds. The default lifetime interval
 for unused sessions is 30 minutes. Only positive integer values are
 accepted.
 
+Session Creation Options
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+By default, the application code that builds the document for a new
+session runs on the server's IO loop, so other sessions are not served
+while it runs. To build session documents on a pool of worker threads
+instead, set the --session-workers option:
+
+.. code-block:: sh
+
+    bokeh serve app_script.py --session-workers 4
+
+Application scripts still run one at a time, because they change the
+process-wide working directory and ``sys.path``, but the server stays
+responsive to existing sessions meanwhile. The default value of 0 builds
+session documents on the IO loop.
+
+To cut the time until a new user sees the application, the server can
+keep initialized sessions ready for users that connect without a
+session ID. Set the number of sessions to keep ready for each
+application with the --session-pool-size option:
+
+.. code-block:: sh
+
+    bokeh serve app_script.py --session-pool-size 2
+
+Whenever a pooled session is handed out, another one is initialized in
+the background. Pooled sessions run the application code (including any
+``on_session_created`` hooks) before anyone connects to them, and their
+session callbacks only start once they are handed out. Pool hits and
+misses are reported with the other statistics in the debug log. The
+default value of 0 disables the pool.
+
+If an application builds the same document for every session, the
+application code only needs to run once. With the --clone-documents
+option, new sessions get copies of the document that the application
+code created the first time it ran:
+
+.. code-block:: sh
+
+    bokeh serve app_script.py --clone-documents
+
+``on_session_created`` hooks still run for every session. Python
+callbacks can't be copied, so applications that add any (for instance
+with ``on_change`` or ``add_periodic_callback``) are still run for every
+session, and a warning is logged.
+
+Background Work Options
+~~~~~~~~~~~~~~~~~~~~~~~
+
+Application code can run slow functions off the server's IO loop with
+``run_in_executor`` on its session context, and then update the
+document with the result inside ``with_locked_document``:
+
+.. code-block:: python
+
+    from tornado import gen
+    from bokeh.io import curdoc
+
+    doc = curdoc()
+
+    @gen.coroutine
+    def refresh():
+        data = yield doc.session_context.run_in_executor(load_data)
+        def update(doc):
+            source.data = data
+        yield doc.session_context.with_locked_document(update)
+
+By default these functions run on a pool of 4 worker processes, so they
+must be picklable (defined at the top level of a module), as must their
+arguments and results. Functions that release the GIL, or that aren't
+picklable, can run on a pool of threads instead. Set the kind of pool
+with the --executor option, and its size with --executor-workers:
+
+.. code-block:: sh
+
+    bokeh serve app_script.py --executor thread --executor-workers 8
+
+Worker Process Options
+~~~~~~~~~~~~~~~~~~~~~~
+
+A single Bokeh server process uses one CPU core. To use more cores, the
+server can fork several worker processes that all accept connections on
+the same port, with the --num-procs option:
+
+.. code-block:: sh
+
+    bokeh serve app_script.py --num-procs 4
+
+A value of 0 starts one worker process per CPU core. Every session lives
+in one worker process: session IDs generated by a worker belong to that
+worker, and requests (including WebSocket connections) for a session
+that arrive at another worker are forwarded to the owner over a private
+port on 127.0.0.1. Sessions are not shared between workers, so each
+worker runs its own copy of any ``on_server_loaded`` hooks. This option
+is not available on Windows.
+
 Logging Options
 ~~~~~~~~~~~~~~~
 
@@ -290,6 +439,7 @@ import argparse
 
 from bokeh.application import Application
 from bokeh.resources import DEFAULT_SERVER_PORT
+from bokeh.server.connection import SLOW_CLIENT_POLICIES, DEFAULT_SLOW_CLIENT_MAX_HELD_EVENTS
 from bokeh.server.server import Server
 from bokeh.util.string import nice_join
 from bokeh.settings import settings
@@ -299,6 +449,7 @@ from ..util import build_single_handler_applications, die
 
 LOGLEVELS = ('debug', 'info', 'warning', 'error', 'critical')
 SESSION_ID_MODES = ('unsigned', 'signed', 'external-signed')
+EXECUTOR_KINDS = ('process', 'thread')
 DEFAULT_LOG_FORMAT = "%(asctime)s %(message)s"
 
 __doc__ = __doc__.format(
@@ -405,6 +556,92 @@ class Serve(Subcommand):
             default=None,
         )),
 
+        ('--websocket-compression-level', dict(
+            metavar='LEVEL',
+            type=int,
+            help="zlib level (0-9) to compress websocket messages with, compression is off by default",
+            default=None,
+        )),
+
+        ('--websocket-max-message-size', dict(
+            metavar='BYTES',
+            type=int,
+            help="Largest message to accept from clients",
+            default=None,
+        )),
+
+        ('--decode-executor-min-size', dict(
+            metavar='BYTES',
+            type=int,
+            help="Smallest message content to decode on the executor instead of the IO loop",
+            default=None,
+        )),
+
+        ('--websocket-max-queued-bytes', dict(
+            metavar='BYTES',
+            type=int,
+            help="How many bytes of messages can wait to go out to a client before it counts as slow",
+            default=None,
+        )),
+
+        ('--slow-client-policy', dict(
+            metavar='POLICY',
+            action='store',
+            choices=SLOW_CLIENT_POLICIES,
+            help="What to do with document changes for slow clients, one of: %s" % nice_join(SLOW_CLIENT_POLICIES),
+            default=None,
+        )),
+
+        ('--slow-client-max-held-events', dict(
+            metavar='CHANGES',
+            type=int,
+            help="How many document changes to hold back for a slow client before disconnecting it (default: %d)"
+                 % DEFAULT_SLOW_CLIENT_MAX_HELD_EVENTS,
+            default=None,
+        )),
+
+        ('--session-workers', dict(
+            metavar='THREADS',
+            type=int,
+            help="How many threads to build session documents with, 0 to build them on the IO loop",
+            default=None,
+        )),
+
+        ('--session-pool-size', dict(
+            metavar='SESSIONS',
+            type=int,
+            help="How many initialized sessions to keep ready for new users of each application",
+            default=None,
+        )),
+
+        ('--clone-documents', dict(
+            action='store_true',
+            help="Run the applications once and give new sessions copies of the resulting documents",
+        )),
+
+        ('--executor', dict(
+            metavar='KIND',
+            action='store',
+            choices=EXECUTOR_KINDS,
+            help="Run functions passed to run_in_executor on a pool of worker processes or threads, one of: %s" % nice_join(EXECUTOR_KINDS),
+            default=None,
+        )),
+
+        ('--executor-workers', dict(
+            metavar='N',
+            type=int,
+            help="How many processes or threads run functions passed to run_in_executor",
+            default=None,
+        )),
+
+        ('--num-procs', dict(
+            metavar='N',
+            action='store',
+            help="Number of worker processes to run, 0 for one per CPU",
+            default=1,
+            type=int,
+        )),
+
         ('--use-xheaders', dict(
             action='store_true',
             help="Prefer X-headers for IP/protocol information",
@@ -469,6 +706,34 @@ class Serve(Subcommand):
             # rename to be compatible with Server
             args.stats_log_frequency_milliseconds = args.stats_log_frequency
 
+        if args.websocket_compression_level is not None:
+            log.info("Compress websocket messages at level %d", args.websocket_compression_level)
+
+        if args.websocket_max_message_size is not None:
+            log.info("Accept messages of up to %d bytes", args.websocket_max_message_size)
+
+        if args.decode_executor_min_size is not None:
+            log.info("Decode messages of %d bytes or more on the executor", args.decode_executor_min_size)
+
+        if args.websocket_max_queued_bytes is not None:
+            log.info("Clients with more than %d bytes of messages waiting are slow, policy: %s",
+                     args.websocket_max_queued_bytes, args.slow_client_policy or 'coalesce')
+
+        if args.session_workers is not None:
+            log.info("Build session documents with %d threads", args.session_workers)
+
+        if args.session_pool_size is not None:
+            log.info("Keep %d initialized sessions ready per application", args.session_pool_size)
+
+        if args.executor is not None or args.executor_workers is not None:
+            log.info("Run background functions on %s %s workers",
+                     args.executor_workers or 4, args.executor or 'process')
+
+        if args.clone_documents:
+            log.info("New sessions get copies of documents the applications initialized once")
+            for application in applications.values():
+                application.clone_documents = True
+
         server_kwargs = { key: getattr(args, key) for key in ['port',
                                                               'address',
                                                               'allow_websocket_origin',
@@ -479,6 +744,17 @@ class Serve(Subcommand):
                                                               'check_unused_sessions_milliseconds',
                                                               'unused_session_lifetime_milliseconds',
                                                               'stats_log_frequency_milliseconds',
+                                                              'websocket_compression_level',
+                                                              'websocket_max_message_size',
+                                                              'decode_executor_min_size',
+                                                              'websocket_max_queued_bytes',
+                                                              'slow_client_policy',
+                                                              'slow_client_max_held_events',
+                                                              'session_workers',
+                                                              'session_pool_size',
+                                                              'executor',
+                                                              'executor_workers',
+                                                              'num_procs',
                                                               'use_xheaders',
                                                             ]
                           if getattr(args, key, None) is not None }
@@ -506,7 +782,7 @@ class Serve(Subcommand):
 
         server = Server(applications, **server_kwargs)
 
-        if args.show:
+        if args.show and server.worker_index == 0:
             # we have to defer opening in browser until we start up the server
             def show_callback():
                 for route in applications.keys():
@@ -111,6 +111,92 @@ def test_args():
             default=None,
         )),
 
+        ('--websocket-compression-level', dict(
+            metavar='LEVEL',
+            type=int,
+            help="zlib level (0-9) to compress websocket messages with, compression is off by default",
+            default=None,
+        )),
+
+        ('--websocket-max-message-size', dict(
+            metavar='BYTES',
+            type=int,
+            help="Largest message to accept from clients",
+            default=None,
+        )),
+
+        ('--decode-executor-min-size', dict(
+            metavar='BYTES',
+            type=int,
+            help="Smallest message content to decode on the executor instead of the IO loop",
+            default=None,
+        )),
+
+        ('--websocket-max-queued-bytes', dict(
+            metavar='BYTES',
+            type=int,
+            help="How many bytes of messages can wait to go out to a client before it counts as slow",
+            default=None,
+        )),
+
+        ('--slow-client-policy', dict(
+            metavar='POLICY',
+            action='store',
+            choices=scserve.SLOW_CLIENT_POLICIES,
+            help="What to do with document changes for slow clients, one of: %s" % nice_join(scserve.SLOW_CLIENT_POLICIES),
+            default=None,
+        )),
+
+        ('--slow-client-max-held-events', dict(
+            metavar='CHANGES',
+            type=int,
+            help="How many document changes to hold back for a slow client before disconnecting it (default: %d)"
+                 % scserve.DEFAULT_SLOW_CLIENT_MAX_HELD_EVENTS,
+            default=None,
+        )),
+
+        ('--session-workers', dict(
+            metavar='THREADS',
+            type=int,
+            help="How many threads to build session documents with, 0 to build them on the IO loop",
+            default=None,
+        )),
+
+        ('--session-pool-size', dict(
+            metavar='SESSIONS',
+            type=int,
+            help="How many initialized sessions to keep ready for new users of each application",
+            default=None,
+        )),
+
+        ('--clone-documents', dict(
+            action='store_true',
+            help="Run the applications once and give new sessions copies of the resulting documents",
+        )),
+
+        ('--executor', dict(
+            metavar='KIND',
+            action='store',
+            choices=scserve.EXECUTOR_KINDS,
+            help="Run functions passed to run_in_executor on a pool of worker processes or threads, one of: %s" % nice_join(scserve.EXECUTOR_KINDS),
+            default=None,
+        )),
+
+        ('--executor-workers', dict(
+            metavar='N',
+            type=int,
+            help="How many processes or threads run functions passed to run_in_executor",
+            default=None,
+        )),
+
+        ('--num-procs', dict(
+            metavar='N',
+            action='store',
+            help="Number of worker processes to run, 0 for one per CPU",
+            default=1,
+            type=int,
+        )),
+
         ('--use-xheaders', dict(
             action='store_true',
             help="Prefer X-headers for IP/protocol information",
@@ -12,6 +12,7 @@ import decimal
 import json
 
 import numpy as np
+from six import integer_types, string_types
 
 from ..settings import settings
 from ..util.dependencies import import_optional
@@ -29,8 +30,11 @@ class BokehJSONEncoder(json.JSONEncoder):
         ''' Handle special scalars, use default json encoder otherwise
 
         '''
+        # Slice (e.g. patch indices)
+        if isinstance(obj, slice):
+            return dict(start=obj.start, stop=obj.stop, step=obj.step)
         # Pandas Timestamp
-        if pd and isinstance(obj, pd.tslib.Timestamp):
+        elif pd and isinstance(obj, pd.tslib.Timestamp):
             return obj.value / 10**6.0  #nanosecond to millisecond
         elif np.issubdtype(type(obj), np.float):
             return float(obj)
@@ -80,9 +84,150 @@ class BokehJSONEncoder(json.JSONEncoder):
         else:
             return self.transform_python_types(obj)
 
-def serialize_json(obj, encoder=BokehJSONEncoder, indent=None, **kwargs):
+_JSON_SCALAR_TYPES = set(string_types + integer_types + (bool, type(None)))
+
+def to_json_compatible(obj, encoder=BokehJSONEncoder):
+    ''' Return a version of ``obj`` that only contains plain JSON types
+    (dict, list, str, int, float, bool and None).
+
+    The result is the same as ``json.loads(serialize_json(obj))``, but
+    it is computed without encoding to and decoding from a string, for
+    callers that need an object they will encode themselves later.
+
+    Raises:
+        ValueError, if ``obj`` contains NaN or infinite floats
+        TypeError, if ``obj`` contains values ``encoder`` can't encode
+
+    '''
+    default = encoder().default
+
+    def convert(obj):
+        cls = type(obj)
+        if cls in _JSON_SCALAR_TYPES:
+            return obj
+        elif cls is float:
+            if obj != obj or obj in (float('inf'), float('-inf')):
+                raise ValueError("Out of range float values are not JSON compliant")
+            return obj
+        elif cls is list or cls is tuple:
+            return [convert(x) for x in obj]
+        elif isinstance(obj, dict):
+            return dict((convert_key(k), convert(v)) for k, v in obj.items())
+        elif isinstance(obj, (list, tuple)):
+            return [convert(x) for x in obj]
+        elif isinstance(obj, bool):
+            return bool(obj)
+        elif isinstance(obj, string_types):
+            return obj
+        elif isinstance(obj, integer_types):
+            return int(obj)
+        elif isinstance(obj, float):
+            return convert(float(obj))
+        elif isinstance(obj, np.floating):
+            return convert(float(obj))
+        elif isinstance(obj, np.integer):
+            return int(obj)
+        elif isinstance(obj, np.bool_):
+            return bool(obj)
+        else:
+            return convert(default(obj))
+
+    def convert_key(key):
+        # the same conversions json.dumps makes for dict keys
+        if isinstance(key, string_types):
+            return key
+        elif key is True:
+            return 'true'
+        elif key is False:
+            return 'false'
+        elif key is None:
+            return 'null'
+        elif isinstance(key, integer_types):
+            return str(int(key))
+        elif isinstance(key, float):
+            return repr(float(key))
+        else:
+            raise TypeError("key %r is not a string" % (key,))
+
+    return convert(obj)
+
+class FastBokehJSONEncoder(BokehJSONEncoder):
+    ''' Encode values like ``BokehJSONEncoder``, but faster for large
+    documents.
+
+    Handlers for values that are not plain JSON types are looked up by
+    the exact type of the value, and cached, instead of going through a
+    chain of ``isinstance`` checks for every value.
+
+    '''
+
+    # type -> handler(encoder, obj), shared by all instances
+    _handlers = {}
+
+    def default(self, obj):
+        handler = self._handlers.get(type(obj))
+        if handler is None:
+            handler = self._handlers[type(obj)] = _find_handler(type(obj))
+        return handler(self, obj)
+
+def _find_handler(cls):
+    ''' Find the handler to use for values of type ``cls`` with
+    ``FastBokehJSONEncoder``, in the same order ``BokehJSONEncoder``
+    checks them.
+
+    '''
+    from ..model import Model
+    from ..colors import Color
+    from .properties import HasProps
+
+    if pd and issubclass(cls, (pd.Series, pd.Index)):
+        return lambda encoder, obj: transform_series(obj)
+    elif issubclass(cls, np.ndarray):
+        return lambda encoder, obj: transform_array(obj)
+    elif issubclass(cls, Model):
+        return lambda encoder, obj: obj.ref
+    elif issubclass(cls, HasProps):
+        return lambda encoder, obj: obj.properties_with_values(include_defaults=False)
+    elif issubclass(cls, Color):
+        return lambda encoder, obj: obj.to_css()
+    elif issubclass(cls, np.floating):
+        return lambda encoder, obj: float(obj)
+    elif issubclass(cls, np.integer):
+        return lambda encoder, obj: int(obj)
+    elif issubclass(cls, np.bool_):
+        return lambda encoder, obj: bool(obj)
+    else:
+        return BokehJSONEncoder.transform_python_types
+
+def _serialize_default(obj, encoder, indent, separators, sort_keys, **kwargs):
+    if sort_keys is None:
+        sort_keys = True
+    return json.dumps(obj, cls=encoder, allow_nan=False, indent=indent, separators=separators, sort_keys=sort_keys, **kwargs)
+
+def _serialize_fast(obj, encoder, indent, separators, sort_keys, **kwargs):
+    if encoder is BokehJSONEncoder:
+        encoder = FastBokehJSONEncoder
+    if sort_keys is None:
+        # sorted keys are only useful for people reading the JSON
+        sort_keys = indent is not None
+    return json.dumps(obj, cls=encoder, allow_nan=False, indent=indent, separators=separators, sort_keys=sort_keys, **kwargs)
+
+#: Engines that ``serialize_json`` can use, selected with ``BOKEH_JSON_SERIALIZER``.
+#: An engine is called as ``engine(obj, encoder, indent, separators, sort_keys, **kwargs)``,
+#: where ``sort_keys`` is None if the caller doesn't require a particular key order.
+JSON_SERIALIZERS = {
+    'default' : _serialize_default,
+    'fast'    : _serialize_fast,
+}
+
+def serialize_json(obj, encoder=BokehJSONEncoder, indent=None, sort_keys=None, **kwargs):
     ''' Return a serialized JSON representation of a Bokeh model.
 
+    The engine used to produce the JSON is selected with the
+    ``BOKEH_JSON_SERIALIZER`` setting. The ``fast`` engine encodes with
+    ``FastBokehJSONEncoder`` and doesn't sort keys unless the output is
+    pretty printed or ``sort_keys`` is True.
+
     '''
     pretty = settings.pretty(False)
 
@@ -94,4 +239,10 @@ def serialize_json(obj, encoder=BokehJSONEncoder, indent=None, **kwargs):
     if pretty and indent is None:
         indent = 2
 
-    return json.dumps(obj, cls=encoder, allow_nan=False, indent=indent, separators=separators, sort_keys=True, **kwargs)
+    engine = settings.json_serializer()
+    try:
+        serialize = JSON_SERIALIZERS[engine]
+    except KeyError:
+        raise ValueError("Unknown JSON serializer %r, expected one of: %s" % (engine, ", ".join(sorted(JSON_SERIALIZERS))))
+
+    return serialize(obj, encoder, indent, separators, sort_keys, **kwargs)
@@ -53,12 +53,13 @@ import logging
 logger = logging.getLogger(__name__)
 
 import collections
+from contextlib import contextmanager
 from copy import copy
 import datetime
 import dateutil.parser
 import difflib
 from importlib import import_module
-import inspect
+from itertools import islice
 import numbers
 import re
 import types
@@ -66,6 +67,7 @@ from warnings import warn
 
 from six import string_types, iteritems
 
+from ..settings import settings
 from ..util.dependencies import import_optional
 from ..util.future import with_metaclass
 from ..util.string import nice_join
@@ -123,10 +125,86 @@ try:
     import numpy as np
     bokeh_bool_types += (np.bool8,)
 except ImportError:
-    pass
+    np = None
 
 bokeh_integer_types = (numbers.Integral,)
 
+#: The number of items that are validated in large containers with
+#: ``BOKEH_CONTAINER_VALIDATION=sampled``
+VALIDATION_SAMPLE_SIZE = 100
+
+# greater than zero while container validation has been forced to "full"
+_full_validation_count = 0
+
+# the BOKEH_CONTAINER_VALIDATION setting while a container is validated, so
+# that it is read once for each top-level container, not for every nested
+# container. The setting is the same for all threads, so threads that see
+# each other's value here get the same result as reading it themselves.
+_validation_mode = None
+
+@contextmanager
+def full_validation():
+    """ Fully validate all container items in this context, regardless of
+    the ``BOKEH_CONTAINER_VALIDATION`` setting.
+
+    """
+    global _full_validation_count
+    _full_validation_count += 1
+    try:
+        yield
+    finally:
+        _full_validation_count -= 1
+
+def _with_validation_mode(check, value):
+    """ Call ``check(value)`` to validate the items of a container, with
+    the ``BOKEH_CONTAINER_VALIDATION`` setting read once for it and any
+    containers nested in it.
+
+    """
+    global _validation_mode
+    if _validation_mode is not None:
+        return check(value)
+    _validation_mode = settings.container_validation()
+    try:
+        return check(value)
+    finally:
+        _validation_mode = None
+
+def _items_to_validate(value):
+    """ Return the items of a list-like or dict (as key, value pairs)
+    container that need to be validated with the current
+    ``BOKEH_CONTAINER_VALIDATION`` setting.
+
+    """
+    if isinstance(value, dict):
+        items = iteritems(value)
+    else:
+        items = value
+
+    if _full_validation_count > 0:
+        return items
+
+    mode = _validation_mode
+    if mode is None:
+        mode = settings.container_validation()
+    if mode == "full":
+        return items
+    elif mode == "trusted":
+        return ()
+    elif mode == "sampled":
+        n = len(value)
+        if n <= VALIDATION_SAMPLE_SIZE:
+            return items
+        elif isinstance(value, dict):
+            return list(islice(items, VALIDATION_SAMPLE_SIZE))
+        elif isinstance(value, collections.Sequence) or (np is not None and isinstance(value, np.ndarray)):
+            step = (n - 1) / (VALIDATION_SAMPLE_SIZE - 1)
+            return [value[int(round(i * step))] for i in range(VALIDATION_SAMPLE_SIZE)]
+        else:
+            return items
+    else:
+        raise ValueError("invalid value %r for BOKEH_CONTAINER_VALIDATION, expected full, sampled or trusted" % mode)
+
 # used to indicate properties that are not set (vs null, None, etc)
 class _NotSet(object):
     pass
@@ -245,6 +323,13 @@ class PropertyDescriptor(PropertyFactory):
         else:
             return True
 
+    def _is_valid_array(self, array):
+        """ Whether every element of a 1d NumPy array is valid, if that can
+        be told from its dtype alone, or None if every element has to be
+        checked.
+        """
+        return None
+
     @classmethod
     def _wrap_container(cls, value):
         if isinstance(value, list):
@@ -455,6 +540,17 @@ class BasicProperty(Property):
         old = self.__get__(obj)
         self._real_set(obj, old, value)
 
+    def _set_unchecked(self, obj, value):
+        """ Set a value that is known to be valid, for instance one copied
+        from another object of the same class, without validating it or
+        notifying anyone of the change.
+
+        """
+        value = self.descriptor._wrap_container(value)
+        if isinstance(value, PropertyValueContainer):
+            value._register_owner(obj, self)
+        obj._property_values[self.name] = value
+
     # called when a container is mutated "behind our back" and
     # we detect it with our collection wrappers. In this case,
     # somewhat weirdly, "old" is a copy and the new "value"
@@ -621,7 +717,20 @@ class MetaHasProps(type):
             path = class_dict["__example__"]
             class_dict["__doc__"] += _EXAMPLE_TEMPLATE % dict(path=path)
 
-        return super(MetaHasProps, meta_cls).__new__(meta_cls, class_name, bases, class_dict)
+        cls = super(MetaHasProps, meta_cls).__new__(meta_cls, class_name, bases, class_dict)
+
+        # precompute everything HasProps needs to know about the properties
+        # of the class, including those of its base classes, so that it
+        # doesn't have to be recomputed (or looked up in a cache) on every
+        # attribute access
+        cls.__all_properties__ = _accumulate_from_superclasses(cls, "__properties__")
+        cls.__all_properties_with_refs__ = _accumulate_from_superclasses(cls, "__properties_with_refs__")
+        cls.__all_container_props__ = _accumulate_from_superclasses(cls, "__container_props__")
+        cls.__all_overridden_defaults__ = _accumulate_dict_from_superclasses(cls, "__overridden_defaults__")
+        cls.__all_dataspecs__ = _accumulate_dict_from_superclasses(cls, "__dataspecs__")
+        cls.__all_dataspec_names__ = frozenset(cls.__all_dataspecs__)
+
+        return cls
 
     def __init__(cls, class_name, bases, nmspc):
         if class_name == 'HasProps':
@@ -654,33 +763,43 @@ class MetaHasProps(type):
                     warn(('Override() of %s in class %s does not override anything.') % (key, class_name),
                          RuntimeWarning, stacklevel=2)
 
+def _accumulate_from_superclasses(cls, propname):
+    s = set()
+    # we MUST use c.__dict__ NOT getattr(), every class only contributes
+    # the values it defines itself
+    for c in cls.__mro__:
+        if propname in c.__dict__:
+            s.update(c.__dict__[propname])
+    return frozenset(s)
+
+def _accumulate_dict_from_superclasses(cls, propname):
+    d = dict()
+    for c in cls.__mro__:
+        if propname in c.__dict__:
+            for k, v in c.__dict__[propname].items():
+                if k not in d:
+                    d[k] = v
+    return d
+
 def accumulate_from_superclasses(cls, propname):
-    cachename = "__cached_all" + propname
-    # we MUST use cls.__dict__ NOT hasattr(). hasattr() would also look at base
-    # classes, and the cache must be separate for each class
-    if cachename not in cls.__dict__:
-        s = set()
-        for c in inspect.getmro(cls):
-            if issubclass(c, HasProps) and hasattr(c, propname):
-                base = getattr(c, propname)
-                s.update(base)
-        setattr(cls, cachename, s)
-    return cls.__dict__[cachename]
+    ''' Return the union of the sets named ``propname`` defined by ``cls``
+    and its base classes.
+
+    '''
+    cachename = "__all_" + propname.strip("_") + "__"
+    if cachename in cls.__dict__:
+        return cls.__dict__[cachename]
+    return _accumulate_from_superclasses(cls, propname)
 
 def accumulate_dict_from_superclasses(cls, propname):
-    cachename = "__cached_all" + propname
-    # we MUST use cls.__dict__ NOT hasattr(). hasattr() would also look at base
-    # classes, and the cache must be separate for each class
-    if cachename not in cls.__dict__:
-        d = dict()
-        for c in inspect.getmro(cls):
-            if issubclass(c, HasProps) and hasattr(c, propname):
-                base = getattr(c, propname)
-                for k,v in base.items():
-                    if k not in d:
-                        d[k] = v
-        setattr(cls, cachename, d)
-    return cls.__dict__[cachename]
+    ''' Return the merged dicts named ``propname`` defined by ``cls`` and
+    its base classes, with values from subclasses taking precedence.
+
+    '''
+    cachename = "__all_" + propname.strip("_") + "__"
+    if cachename in cls.__dict__:
+        return cls.__dict__[cachename]
+    return _accumulate_dict_from_superclasses(cls, propname)
 
 def abstract(cls):
     """ A phony decorator to mark abstract base classes. """
@@ -701,18 +820,16 @@ class HasProps(with_metaclass(MetaHasProps, object)):
             setattr(self, name, value)
 
     def __setattr__(self, name, value):
-        # self.properties() below can be expensive so avoid it
-        # if we're just setting a private underscore field
+        # avoid checking properties if we're just setting a private
+        # underscore field
         if name.startswith("_"):
             super(HasProps, self).__setattr__(name, value)
             return
 
-        props = sorted(self.properties())
-        deprecated = getattr(self, '__deprecated_attributes__', [])
-
-        if name in props or name in deprecated:
+        if name in self.__all_properties__ or name in getattr(self, '__deprecated_attributes__', ()):
             super(HasProps, self).__setattr__(name, value)
         else:
+            props = sorted(self.__all_properties__)
             matches, text = difflib.get_close_matches(name.lower(), props), "similar"
 
             if not matches:
@@ -727,7 +844,7 @@ class HasProps(with_metaclass(MetaHasProps, object)):
         JSON contains references to models.
 
         """
-        if name in self.properties():
+        if name in self.__all_properties__:
             #logger.debug("Patching attribute %s of %r", attr, patched_obj)
             prop = self.lookup(name)
             prop.set_from_json(self, json, models)
@@ -744,6 +861,22 @@ class HasProps(with_metaclass(MetaHasProps, object)):
         for k, v in json_attributes.items():
             self.set_from_json(k, v, models)
 
+    def _validate_containers(self):
+        """ Fully validate the items of all container properties, which may
+        only have been partially validated when they were set, depending on
+        the ``BOKEH_CONTAINER_VALIDATION`` setting.
+
+        Raises:
+            ValueError, if any container property has an invalid item
+
+        """
+        with full_validation():
+            for name in self.__all_container_props__:
+                try:
+                    self.lookup(name).descriptor.validate(getattr(self, name))
+                except ValueError as e:
+                    raise ValueError("invalid value for property %r of %s: %s" % (name, self, e))
+
     def _clone(self):
         """ Returns a duplicate of this object with all its properties
         set appropriately.  Values which are containers are shallow-copied.
@@ -760,13 +893,13 @@ class HasProps(with_metaclass(MetaHasProps, object)):
         have references. We traverse the class hierarchy and
         pull together the full list of properties.
         """
-        return accumulate_from_superclasses(cls, "__properties_with_refs__")
+        return cls.__all_properties_with_refs__
 
     @classmethod
     def properties_containers(cls):
         """ Returns a list of properties that are containers.
         """
-        return accumulate_from_superclasses(cls, "__container_props__")
+        return cls.__all_container_props__
 
     @classmethod
     def properties(cls, with_bases=True):
@@ -785,26 +918,26 @@ class HasProps(with_metaclass(MetaHasProps, object)):
 
         """
         if with_bases:
-            return accumulate_from_superclasses(cls, "__properties__")
+            return cls.__all_properties__
         else:
             return set(cls.__properties__)
 
     @classmethod
     def _overridden_defaults(cls):
         """ Returns a dictionary of defaults that have been overridden; this is an implementation detail of PropertyDescriptor. """
-        return accumulate_dict_from_superclasses(cls, "__overridden_defaults__")
+        return cls.__all_overridden_defaults__
 
     @classmethod
     def dataspecs(cls):
         """ Returns a set of the names of this object's dataspecs (and
         dataspec subclasses).  Traverses the class hierarchy.
         """
-        return set(cls.dataspecs_with_props().keys())
+        return cls.__all_dataspec_names__
 
     @classmethod
     def dataspecs_with_props(cls):
         """ Returns a dict of dataspec names to dataspec properties. """
-        return accumulate_dict_from_superclasses(cls, "__dataspecs__")
+        return cls.__all_dataspecs__
 
     def properties_with_values(self, include_defaults=True):
         ''' Return a dict from property names to the current values of those
@@ -925,6 +1058,13 @@ class PrimitiveProperty(PropertyDescriptor):
             raise ValueError("expected a value of type %s, got %s of type %s" %
                 (nice_join([ cls.__name__ for cls in self._underlying_type ]), value, type(value).__name__))
 
+    def _is_valid_array(self, array):
+        # subclasses may add checks on the values themselves
+        if type(self).validate is not PrimitiveProperty.validate or array.dtype.kind == 'O':
+            return None
+        # the elements of an array are instances of its dtype's scalar type
+        return issubclass(array.dtype.type, self._underlying_type)
+
     def from_json(self, json, models=None):
         if json is None or isinstance(json, self._underlying_type):
             return json
@@ -1045,15 +1185,29 @@ class Seq(ContainerProperty):
         super(Seq, self).validate(value)
 
         if value is not None:
-            if not (self._is_seq(value) and all(self.item_type.is_valid(item) for item in value)):
-                if self._is_seq(value):
-                    invalid = []
-                    for item in value:
-                        if not self.item_type.is_valid(item):
-                            invalid.append(item)
-                    raise ValueError("expected an element of %s, got seq with invalid items %r" % (self, invalid))
-                else:
-                    raise ValueError("expected an element of %s, got %r" % (self, value))
+            if not self._is_seq(value):
+                raise ValueError("expected an element of %s, got %r" % (self, value))
+
+            if isinstance(self.item_type, Any):
+                return
+
+            if np is not None and isinstance(value, np.ndarray) and value.ndim == 1:
+                valid = self.item_type._is_valid_array(value)
+                if valid is True:
+                    return
+                elif valid is False:
+                    raise ValueError("expected an element of %s, got array with dtype %s" % (self, value.dtype))
+
+            _with_validation_mode(self._validate_items, value)
+
+    def _validate_items(self, value):
+        items = _items_to_validate(value)
+        if not all(self.item_type.is_valid(item) for item in items):
+            invalid = []
+            for item in items:
+                if not self.item_type.is_valid(item):
+                    invalid.append(item)
+            raise ValueError("expected an element of %s, got seq with invalid items %r" % (self, invalid))
 
     def __str__(self):
         return "%s(%s)" % (self.__class__.__name__, self.item_type)
@@ -1115,10 +1269,24 @@ class Dict(ContainerProperty):
         super(Dict, self).validate(value)
 
         if value is not None:
-            if not (isinstance(value, dict) and \
-                    all(self.keys_type.is_valid(key) and self.values_type.is_valid(val) for key, val in iteritems(value))):
+            if not isinstance(value, dict):
                 raise ValueError("expected an element of %s, got %r" % (self, value))
 
+            any_keys = isinstance(self.keys_type, Any)
+            any_values = isinstance(self.values_type, Any)
+            if any_keys and any_values:
+                return
+
+            _with_validation_mode(self._validate_items, value)
+
+    def _validate_items(self, value):
+        any_keys = isinstance(self.keys_type, Any)
+        any_values = isinstance(self.values_type, Any)
+        items = _items_to_validate(value)
+        if not all((any_keys or self.keys_type.is_valid(key)) and (any_values or self.values_type.is_valid(val))
+                   for key, val in items):
+            raise ValueError("expected an element of %s, got %r" % (self, value))
+
     def __str__(self):
         return "%s(%s, %s)" % (self.__class__.__name__, self.keys_type, self.values_type)
 
@@ -1237,7 +1405,9 @@ class This(PropertyDescriptor):
 # Fake types, ABCs
 class Any(PropertyDescriptor):
     """ Any type property accepts any values. """
-    pass
+
+    def _is_valid_array(self, array):
+        return True
 
 class Function(PropertyDescriptor):
     """ Function type property. """
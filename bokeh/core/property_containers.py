@@ -43,6 +43,21 @@ class PropertyValueContainer(object):
         for (owner, prop) in self._owners:
             prop._notify_mutated(owner, old, hint)
 
+    def _owners_need_old_value(self):
+        ''' Whether any callbacks that could look at the old value are
+        registered, either on an owner for the property this container is
+        the value of, or on an owner's document.
+
+        '''
+        for (owner, prop) in self._owners:
+            callbacks = getattr(owner, '_callbacks', None)
+            if callbacks and callbacks.get(prop.name):
+                return True
+            document = getattr(owner, 'document', None)
+            if document is not None and document._needs_old_values():
+                return True
+        return False
+
     def _saved_copy(self):
         raise RuntimeError("Subtypes must implement this to make a backup copy")
 
@@ -125,6 +140,8 @@ class PropertyValueDict(PropertyValueContainer, dict):
 
     '''
     def __init__(self, *args, **kwargs):
+        # storage for NumPy columns that have been streamed to, by key
+        self._stream_buffers = {}
         return super(PropertyValueDict, self).__init__(*args, **kwargs)
 
     def _saved_copy(self):
@@ -162,17 +179,24 @@ class PropertyValueDict(PropertyValueContainer, dict):
 
     # notifies owners explicitly
     def _stream(self, doc, source, new_data, rollover=None):
-        old = self._saved_copy()
+        # The old value is only needed for on_change callbacks, session
+        # listeners only use the hint. It is a shallow copy, which is safe
+        # because streaming to a NumPy column never writes to memory that
+        # is visible through previous column values (see _ColumnStreamBuffer).
+        if self._owners_need_old_value():
+            old = self._saved_copy()
+        else:
+            old = None
 
         import numpy as np
 
         for k, v in new_data.items():
             if isinstance(self[k], np.ndarray):
-                data = np.append(self[k], new_data[k])
+                data = self._stream_array(k, v, rollover)
             else:
-                data = self[k] + new_data[k]
-            if rollover and len(data) > rollover:
-                data = data[-rollover:]
+                data = self[k] + v
+                if rollover and len(data) > rollover:
+                    data = data[-rollover:]
 
             super(PropertyValueDict, self).__setitem__(k, data)
 
@@ -181,6 +205,98 @@ class PropertyValueDict(PropertyValueContainer, dict):
         self._notify_owners(old,
                             hint=ColumnsStreamedEvent(doc, source, new_data, rollover))
 
+    # notifies owners explicitly
+    def _patch(self, doc, source, patches):
+        if self._owners_need_old_value():
+            # patches are applied in place, so the patched columns
+            # themselves have to be copied to keep the old value intact
+            old = self._saved_copy()
+            for k in patches:
+                old[k] = old[k].copy() if hasattr(old[k], 'copy') else list(old[k])
+        else:
+            old = None
+
+        for k, patch in patches.items():
+            column = self[k]
+            for ind, value in patch:
+                column[ind] = value
+
+        from ..document import ColumnsPatchedEvent
 
+        self._notify_owners(old,
+                            hint=ColumnsPatchedEvent(doc, source, patches))
+
+    def _stream_array(self, key, new_values, rollover=None):
+        buf = self._stream_buffers.get(key)
+        if buf is None or not buf.is_current(self[key]):
+            buf = _ColumnStreamBuffer(self[key])
+            self._stream_buffers[key] = buf
+        return buf.append(new_values, rollover)
+
+class _ColumnStreamBuffer(object):
+    ''' Preallocated storage for a NumPy column that is being streamed to.
+
+    The column value is always a contiguous view into a larger backing
+    array with spare capacity at the end, so that appending new rows
+    (and dropping old ones for ``rollover``) only needs to copy the new
+    rows. When the spare capacity runs out, the rows to keep are copied
+    into a *new* backing array twice their size. Data visible through
+    previously returned views is therefore never overwritten, and the
+    cost of the copy is amortized over the rows appended since the
+    previous one.
 
+    '''
 
+    def __init__(self, array):
+        self._backing = array
+        self._start = 0
+        self._stop = len(array)
+        self._view = array
+        # the initial array belongs to the user, never write into it
+        self._writable = False
+
+    def is_current(self, value):
+        ''' Whether ``value`` is the column last returned by ``append``. '''
+        return value is self._view
+
+    def append(self, new_values, rollover=None):
+        ''' Append ``new_values``, keeping only the last ``rollover`` rows
+        if ``rollover`` is given, and return the new column value.
+
+        '''
+        import numpy as np
+
+        new_values = np.asarray(new_values)
+        view = self._view
+
+        if view.ndim != 1 or new_values.ndim != 1 or isinstance(view, np.ma.MaskedArray):
+            # not something we can buffer, do what np.append would do
+            data = np.append(view, new_values)
+            if rollover and len(data) > rollover:
+                data = data[-rollover:]
+            self.__init__(data)
+            return data
+
+        n = len(new_values)
+        length = self._stop - self._start + n
+        if rollover and length > rollover:
+            length = rollover
+
+        dtype = np.result_type(view, new_values)
+
+        if not self._writable or dtype != self._backing.dtype or self._stop + n > len(self._backing):
+            backing = np.empty(max(2 * length, 16), dtype=dtype)
+            keep = length - min(n, length)
+            if keep > 0:
+                backing[:keep] = view[len(view) - keep:]
+            backing[keep:length] = new_values[n - (length - keep):]
+            self._backing = backing
+            self._writable = True
+            self._start, self._stop = 0, length
+        else:
+            self._backing[self._stop:self._stop + n] = new_values
+            self._stop += n
+            self._start = self._stop - length
+
+        self._view = self._backing[self._start:self._stop]
+        return self._view
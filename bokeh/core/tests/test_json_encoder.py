@@ -1,5 +1,6 @@
 from __future__ import absolute_import
 
+import os
 import unittest
 from unittest import skipIf
 
@@ -112,5 +113,63 @@ class TestSerializeJson(unittest.TestCase):
         }
         assert deserialized == baseline
 
+class TestToJsonCompatible(unittest.TestCase):
+
+    def setUp(self):
+        from bokeh.core.json_encoder import to_json_compatible, serialize_json
+        from json import loads
+        self.convert = to_json_compatible
+        self.roundtrip = lambda obj: loads(serialize_json(obj))
+
+    def test_same_as_roundtrip(self):
+        from bokeh.models import Range1d
+        obj = {
+            'a': (1, 2.5, u'x', None, True),
+            'b': np.array([1.5, np.nan, np.inf]),
+            'c': [slice(1, None), [np.arange(2)]],
+            'd': {1: Range1d(id='r'), 2.5: {}},
+        }
+        self.assertEqual(self.convert(obj), self.roundtrip(obj))
+
+    def test_numpy_scalars(self):
+        converted = self.convert([np.int64(3), np.float32(0.5), np.bool_(False)])
+        self.assertEqual(converted, [3, 0.5, False])
+        self.assertEqual([type(x) for x in converted], [int, float, bool])
+
+    def test_nan_float(self):
+        self.assertRaises(ValueError, self.convert, [float('nan')])
+        self.assertRaises(ValueError, self.convert, {'a': float('inf')})
+
+class TestSerializeJsonFast(TestSerializeJson):
+
+    def setUp(self):
+        super(TestSerializeJsonFast, self).setUp()
+        self._old_serializer = os.environ.get("BOKEH_JSON_SERIALIZER")
+        os.environ["BOKEH_JSON_SERIALIZER"] = "fast"
+
+    def tearDown(self):
+        if self._old_serializer is None:
+            del os.environ["BOKEH_JSON_SERIALIZER"]
+        else:
+            os.environ["BOKEH_JSON_SERIALIZER"] = self._old_serializer
+
+    def test_numpy_scalars(self):
+        serialized = self.serialize([np.float32(1.5), np.int16(2), np.bool_(True)])
+        self.assertEqual(serialized, '[1.5,2,true]')
+
+    def test_nested_arrays(self):
+        obj = {'a': np.array([[1.5, np.nan], [-np.inf, 2]]), 'b': [np.array([np.inf]), "x"]}
+        deserialized = self.deserialize(self.serialize(obj))
+        assert deserialized == {'a': [[1.5, 'NaN'], ['-Infinity', 2]], 'b': [['Infinity'], "x"]}
+
+    def test_sort_keys(self):
+        obj = dict((k, 1) for k in "zyxabc")
+        self.assertEqual(self.serialize(obj, sort_keys=True), '{"a":1,"b":1,"c":1,"x":1,"y":1,"z":1}')
+        self.assertEqual(self.deserialize(self.serialize(obj)), obj)
+
+    def test_unknown_serializer(self):
+        os.environ["BOKEH_JSON_SERIALIZER"] = "nope"
+        self.assertRaises(ValueError, self.serialize, {})
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,14 +1,16 @@
 from __future__ import absolute_import
 import datetime
+import os
 import unittest
 import numpy as np
 from copy import copy
+from mock import patch
 
 from bokeh.core.properties import (
     HasProps, NumberSpec, ColorSpec, Bool, Int, Float, Complex, String,
-    Regex, List, Dict, Tuple, Array, Instance, Any, Interval, Either,
+    Regex, Seq, List, Dict, Tuple, Array, Instance, Any, Interval, Either,
     Enum, Color, Align, DashPattern, Size, Percent, Angle, AngleSpec,
-    DistanceSpec, Override, Include, MinMaxBounds)
+    DistanceSpec, Override, Include, MinMaxBounds, full_validation)
 
 class Basictest(unittest.TestCase):
 
@@ -166,6 +168,10 @@ class Basictest(unittest.TestCase):
         self.assertIs(s.properties_containers(), s.properties_containers())
         self.assertIs(s.properties(), s.properties())
         self.assertIs(s.properties(with_bases=True), s.properties(with_bases=True))
+        # the cached values are shared, so they must not be modifiable
+        self.assertIsInstance(s.properties(), frozenset)
+        self.assertIsInstance(s.properties_with_refs(), frozenset)
+        self.assertIsInstance(s.properties_containers(), frozenset)
         # this one isn't cached because we store it as a list __properties__ and wrap it
         # in a new set every time
         #self.assertIs(s.properties(with_bases=False), s.properties(with_bases=False))
@@ -1085,6 +1091,71 @@ class TestProperties(unittest.TestCase):
         self.assertTrue(prop.is_valid({}))
         self.assertFalse(prop.is_valid(Foo()))
 
+    def test_Seq_ndarray(self):
+        prop = Seq(Int)
+        self.assertTrue(prop.is_valid(np.arange(10)))
+        self.assertTrue(prop.is_valid(np.array([], dtype=np.int32)))
+        self.assertFalse(prop.is_valid(np.linspace(0, 1, 10)))
+        self.assertTrue(prop.is_valid(np.array([1, 2], dtype=object)))
+        self.assertFalse(prop.is_valid(np.array([1, "a"], dtype=object)))
+        self.assertFalse(List(Int).is_valid(np.arange(10)))
+
+        self.assertTrue(Array(Float).is_valid(np.linspace(0, 1, 10)))
+        self.assertTrue(Array(Any).is_valid(np.array(["a", 1], dtype=object)))
+        self.assertFalse(Array(Bool).is_valid(np.arange(10)))
+        self.assertTrue(Array(String).is_valid(np.array(["a", "b"])))
+        self.assertFalse(Array(Percent).is_valid(np.array([0.5, 2.0])))
+
+    def test_container_validation_modes(self):
+        prop = List(Int)
+        valid = list(range(1000))
+        invalid = list(range(1000))
+        invalid[1] = "a"
+        old = os.environ.get("BOKEH_CONTAINER_VALIDATION")
+        try:
+            os.environ["BOKEH_CONTAINER_VALIDATION"] = "full"
+            self.assertTrue(prop.is_valid(valid))
+            self.assertFalse(prop.is_valid(invalid))
+
+            os.environ["BOKEH_CONTAINER_VALIDATION"] = "sampled"
+            self.assertTrue(prop.is_valid(valid))
+            self.assertTrue(prop.is_valid(invalid))
+            self.assertFalse(prop.is_valid(invalid[:10]))
+            self.assertFalse(prop.is_valid(["a"] + valid))
+            self.assertFalse(prop.is_valid(valid + ["a"]))
+            self.assertFalse(prop.is_valid("a"))
+            self.assertFalse(Dict(String, Int).is_valid(dict(a="a")))
+
+            os.environ["BOKEH_CONTAINER_VALIDATION"] = "trusted"
+            self.assertTrue(prop.is_valid(invalid[:10]))
+            self.assertTrue(Dict(String, Int).is_valid(dict(a="a")))
+            self.assertFalse(prop.is_valid(1))
+            self.assertFalse(Dict(String, Int).is_valid([]))
+
+            with full_validation():
+                self.assertFalse(prop.is_valid(invalid))
+
+            class HasList(HasProps):
+                x = List(Int)
+            obj = HasList(x=invalid)
+            with self.assertRaises(ValueError):
+                obj._validate_containers()
+            obj.x = valid
+            obj._validate_containers()
+        finally:
+            if old is None:
+                del os.environ["BOKEH_CONTAINER_VALIDATION"]
+            else:
+                os.environ["BOKEH_CONTAINER_VALIDATION"] = old
+
+    def test_container_validation_setting_read_once(self):
+        from bokeh.settings import settings
+        prop = List(Dict(String, List(Int)))
+        value = [dict(a=[1, 2]), dict(b=[3])] * 10
+        with patch.object(settings, 'container_validation', return_value="full") as container_validation:
+            self.assertTrue(prop.is_valid(value))
+        self.assertEqual(container_validation.call_count, 1)
+
     def test_Tuple(self):
         with self.assertRaises(TypeError):
             prop = Tuple()
@@ -7,18 +7,25 @@ import logging
 logger = logging.getLogger(__file__)
 
 
+# names of the validator methods of each model class
+_validator_names = {}
+
+def _validators(model):
+    cls = model.__class__
+    names = _validator_names.get(cls)
+    if names is None:
+        names = _validator_names[cls] = [
+            name for name in dir(cls)
+            if name.startswith("_check") and getattr(getattr(cls, name), "validator_type", None)
+        ]
+    return [getattr(model, name) for name in names]
+
 def check_integrity(models):
 
     messages = dict(error=[], warning=[])
 
     for model in models:
-        validators = []
-        for name in dir(model):
-            if not name.startswith("_check"): continue
-            obj = getattr(model, name)
-            if getattr(obj, "validator_type", None):
-                validators.append(obj)
-        for func in validators:
+        for func in _validators(model):
             messages[func.validator_type].extend(func())
 
     for msg in sorted(messages['error']):
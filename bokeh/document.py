@@ -8,23 +8,44 @@ from __future__ import absolute_import
 import logging
 logger = logging.getLogger(__file__)
 
+from collections import OrderedDict
 from json import loads
 
-from six import string_types
+import numpy as np
+from six import iteritems, string_types
 
-from .core.json_encoder import serialize_json
+from .core.json_encoder import serialize_json, to_json_compatible
 from .core.query import find
 from .core.validation import check_integrity
-from .model import Model
+from .model import Model, _ModelIndex
+from .settings import settings
 from .themes import default as default_theme
 from .themes import Theme
 from .util.callback_manager import _check_callback
 from .util.deprecate import deprecated
 from .util.version import __version__
-from .util.serialization import make_id
+from .util.serialization import make_id, transform_column_source_data
 
 DEFAULT_TITLE = "Bokeh Application"
 
+def _clone_value(value, clones):
+    ''' Copy a property value for ``Document._clone_into``, replacing
+    models with their clones from the ``clones`` dict.
+
+    '''
+    if isinstance(value, Model):
+        return clones[value._id]
+    elif isinstance(value, dict):
+        return dict((k, _clone_value(v, clones)) for k, v in iteritems(value))
+    elif isinstance(value, list):
+        return [_clone_value(v, clones) for v in value]
+    elif type(value) is tuple:
+        return tuple(_clone_value(v, clones) for v in value)
+    elif isinstance(value, np.ndarray):
+        return value.copy()
+    else:
+        return value
+
 class DocumentChangedEvent(object):
     def __init__(self, document):
         self.document = document
@@ -69,6 +90,17 @@ class ColumnsStreamedEvent(DocumentPatchedEvent):
         if hasattr(receiver, '_columns_streamed'):
             receiver._columns_streamed(self)
 
+class ColumnsPatchedEvent(DocumentPatchedEvent):
+    def __init__(self, document, column_source, patches):
+        super(ColumnsPatchedEvent, self).__init__(document)
+        self.column_source = column_source
+        self.patches = patches
+
+    def dispatch(self, receiver):
+        super(ColumnsPatchedEvent, self).dispatch(receiver)
+        if hasattr(receiver, '_columns_patched'):
+            receiver._columns_patched(self)
+
 class TitleChangedEvent(DocumentPatchedEvent):
     def __init__(self, document, title):
         super(TitleChangedEvent, self).__init__(document)
@@ -104,6 +136,120 @@ class SessionCallbackRemoved(DocumentChangedEvent):
         if hasattr(receiver, '_session_callback_removed'):
             receiver._session_callback_removed(self)
 
+def _coalesce_events(events):
+    ''' Reduce a list of document events to fewer events with the same
+    effect on a remote document.
+
+    All changes to a property are collapsed into a single change to its
+    current value if the property has been set (rather than streamed to
+    or patched) at least once, and consecutive ``ColumnsStreamed`` events
+    for the same data source with the same ``rollover`` are merged.
+
+    '''
+    # (model id, attr) of properties that have been set
+    assigned = set()
+    for event in events:
+        if isinstance(event, ModelChangedEvent) and event.hint is None:
+            assigned.add((event.model._id, event.attr))
+
+    # events for the same property are only sent at the position
+    # of the last of them, which is the one with the newest value
+    last = {}
+    for i, event in enumerate(events):
+        if isinstance(event, ModelChangedEvent):
+            last[(event.model._id, event.attr)] = i
+
+    result = []
+    # index in result of the last ColumnsStreamed event for each source,
+    # if there has been no other change to the source since
+    streamed = {}
+    for i, event in enumerate(events):
+        if not isinstance(event, ModelChangedEvent):
+            result.append(event)
+            continue
+
+        key = (event.model._id, event.attr)
+        if key in assigned:
+            if last[key] == i:
+                # earlier events may have been streams or patches to the
+                # value this event holds, so send its current state
+                model = event.model
+                new = getattr(model, event.attr)
+                serializable_new = model.lookup(event.attr).serializable_value(model)
+                result.append(ModelChangedEvent(event.document, model, event.attr,
+                                                event.old, new, serializable_new))
+        elif isinstance(event.hint, ColumnsStreamedEvent):
+            j = streamed.get(key)
+            if j is not None and result[j].hint.rollover == event.hint.rollover:
+                result[j] = _merge_streamed_events(result[j], event)
+            else:
+                streamed[key] = len(result)
+                result.append(event)
+        else:
+            # patches, or anything else with a hint we can't merge
+            streamed.pop(key, None)
+            result.append(event)
+
+    return result
+
+def _merge_streamed_events(first, second):
+    ''' Merge two ``ColumnsStreamed`` model changes to the same data source
+    with the same rollover into one.
+
+    '''
+    hint = first.hint
+    rollover = hint.rollover
+    data = {}
+    for name, values in hint.data.items():
+        new_values = second.hint.data[name]
+        if isinstance(values, np.ndarray) or isinstance(new_values, np.ndarray):
+            merged = np.concatenate([np.asarray(values), np.asarray(new_values)])
+        else:
+            merged = list(values) + list(new_values)
+        if rollover and len(merged) > rollover:
+            merged = merged[-rollover:]
+        data[name] = merged
+
+    return ModelChangedEvent(first.document, first.model, first.attr, first.old, second.new, None,
+                             hint=ColumnsStreamedEvent(hint.document, hint.column_source, data, rollover))
+
+class _ChangedProperties(object):
+    ''' Records which model properties of a document changed, in the order
+    of their latest change, without holding on to the new values. Other
+    document events are kept as they are.
+
+    '''
+
+    def __init__(self):
+        # (model id, attr) -> (model, attr), or a unique key -> other event
+        self._changes = OrderedDict()
+
+    def __len__(self):
+        return len(self._changes)
+
+    def add(self, event):
+        if isinstance(event, ModelChangedEvent):
+            key = (event.model._id, event.attr)
+            self._changes.pop(key, None)
+            self._changes[key] = (event.model, event.attr)
+        else:
+            self._changes[object()] = event
+
+    def events(self, document):
+        ''' Return events that set every changed property of ``document``
+        to its current value, along with the other recorded events.
+
+        '''
+        events = []
+        for change in self._changes.values():
+            if isinstance(change, tuple):
+                model, attr = change
+                events.append(ModelChangedEvent(document, model, attr, None, getattr(model, attr),
+                                                model.lookup(attr).serializable_value(model)))
+            else:
+                events.append(change)
+        return events
+
 class SessionCallback(object):
     def __init__(self, document, callback, id=None):
         self._id = make_id() if id is None else id
@@ -156,61 +302,6 @@ class NextTickCallback(SessionCallback):
     def _copy_with_changed_callback(self, new_callback):
         return NextTickCallback(self._document, new_callback, self._id)
 
-class _MultiValuedDict(object):
-    """
-    This is to store a mapping from keys to multiple values, while avoiding
-    the overhead of always having a collection as the value.
-    """
-    def __init__(self):
-        self._dict = dict()
-
-    def add_value(self, key, value):
-        if key is None:
-            raise ValueError("Key is None")
-        if value is None:
-            raise ValueError("Can't put None in this dict")
-        if isinstance(value, set):
-            raise ValueError("Can't put sets in this dict")
-        existing = self._dict.get(key, None)
-        if existing is None:
-            self._dict[key] = value
-        elif isinstance(existing, set):
-            existing.add(value)
-        else:
-            self._dict[key] = set([existing, value])
-
-    def remove_value(self, key, value):
-        if key is None:
-            raise ValueError("Key is None")
-        existing = self._dict.get(key, None)
-        if isinstance(existing, set):
-            existing.discard(value)
-            if len(existing) == 0:
-                del self._dict[key]
-        elif existing == value:
-            del self._dict[key]
-        else:
-            pass
-
-    def get_one(self, k, duplicate_error):
-        existing = self._dict.get(k, None)
-        if isinstance(existing, set):
-            if len(existing) == 1:
-                return next(iter(existing))
-            else:
-                raise ValueError(duplicate_error + (": %r" % (existing)))
-        else:
-            return existing
-
-    def get_all(self, k):
-        existing = self._dict.get(k, None)
-        if existing is None:
-            return []
-        elif isinstance(existing, set):
-            return list(existing)
-        else:
-            return [existing]
-
 class Document(object):
     '''
 
@@ -223,21 +314,24 @@ class Document(object):
 
         # TODO (bev) add vars, stores
 
-        self._all_models_freeze_count = 0
         self._all_models = dict()
-        self._all_models_by_name = _MultiValuedDict()
+        # by name, type and tags, for select()
+        self._all_models_index = _ModelIndex()
+        self._all_models_by_name = self._all_models_index.by_name
+        # for each model in _all_models, by ID: the number of times it is
+        # a root or referred to by other models in _all_models, and the
+        # models it refers to itself (as counted in the reference counts)
+        self._model_ref_counts = dict()
+        self._model_references = dict()
         self._callbacks = {}
         self._session_callbacks = {}
+        self._session_context = None
 
     def clear(self):
         ''' Remove all content from the document (including roots, vars, stores) but do not reset title'''
-        self._push_all_models_freeze()
-        try:
-            while len(self._roots) > 0:
-                r = next(iter(self._roots))
-                self.remove_root(r)
-        finally:
-            self._pop_all_models_freeze()
+        while len(self._roots) > 0:
+            r = next(iter(self._roots))
+            self.remove_root(r)
 
     def _destructively_move(self, dest_doc):
         '''Move all fields in this doc to the dest_doc, leaving this doc empty'''
@@ -248,14 +342,10 @@ class Document(object):
         # to the new doc or else models referenced from multiple
         # roots could be in both docs at once, which isn't allowed.
         roots = []
-        self._push_all_models_freeze()
-        try:
-            while self.roots:
-                r = next(iter(self.roots))
-                self.remove_root(r)
-                roots.append(r)
-        finally:
-            self._pop_all_models_freeze()
+        while self.roots:
+            r = next(iter(self.roots))
+            self.remove_root(r)
+            roots.append(r)
         for r in roots:
             if r.document is not None:
                 raise RuntimeError("Somehow we didn't detach %r" % (r))
@@ -266,39 +356,217 @@ class Document(object):
 
         dest_doc.title = self.title
 
-    def _push_all_models_freeze(self):
-        self._all_models_freeze_count += 1
+    def _clone_into(self, dest_doc):
+        ''' Add copies of all the roots in this doc to dest_doc.
 
-    def _pop_all_models_freeze(self):
-        self._all_models_freeze_count -= 1
-        if self._all_models_freeze_count == 0:
-            self._recompute_all_models()
+        The copies are new models with fresh ids. Lists, dicts and NumPy
+        arrays in property values are copied, other values are shared.
+        Models with a ``_copy_to_clone(clone)`` method copy any other
+        state with it. Python callbacks are not copied, see
+        ``_has_python_callbacks``, and neither is state set by the
+        initializers of models from outside Bokeh, see
+        ``_has_uncloneable_models``.
 
-    def _invalidate_all_models(self):
-        # if freeze count is > 0, we'll recompute on unfreeze
-        if self._all_models_freeze_count == 0:
-            self._recompute_all_models()
+        '''
+        models = list(self._all_models.values())
+        clones = {}
+        for model in models:
+            cls = model.__class__
+            # bypass initializers like Figure's that create more models,
+            # all the models we need are cloned already
+            clone = cls.__new__(cls)
+            Model.__init__(clone)
+            clones[model._id] = clone
+        for model in models:
+            clone = clones[model._id]
+            for name, value in iteritems(model._property_values):
+                if getattr(value, '_unmodified_default_value', False):
+                    # the clone will make its own default
+                    continue
+                # the values are valid already, skip validation and events
+                clone.lookup(name)._set_unchecked(clone, _clone_value(value, clones))
+        for model in models:
+            # models with state outside of their properties copy it themselves
+            if hasattr(model, '_copy_to_clone'):
+                model._copy_to_clone(clones[model._id])
 
-    def _recompute_all_models(self):
-        new_all_models_set = set()
-        for r in self.roots:
-            new_all_models_set = new_all_models_set.union(r.references())
-        old_all_models_set = set(self._all_models.values())
-        to_detach = old_all_models_set - new_all_models_set
-        to_attach = new_all_models_set - old_all_models_set
-
-        recomputed = {}
-        recomputed_by_name = _MultiValuedDict()
-        for m in new_all_models_set:
-            recomputed[m._id] = m
-            if m.name is not None:
-                recomputed_by_name.add_value(m.name, m)
-        for d in to_detach:
-            d._detach_document()
-        for a in to_attach:
-            a._attach_document(self)
-        self._all_models = recomputed
-        self._all_models_by_name = recomputed_by_name
+        for r in self._roots:
+            dest_doc.add_root(clones[r._id])
+
+        if self.title != DEFAULT_TITLE:
+            dest_doc.title = self.title
+        if self._theme is not default_theme:
+            dest_doc.theme = self._theme
+
+    def _has_python_callbacks(self):
+        ''' Whether any Python callbacks are attached to this doc or its
+        models, which ``_clone_into`` can't copy.
+
+        '''
+        if self._callbacks or self._session_callbacks:
+            return True
+        return any(any(callbacks for callbacks in model._callbacks.values())
+                   for model in self._all_models.values())
+
+    def _has_uncloneable_models(self):
+        ''' Whether any models of this doc have a class with an ``__init__``
+        from outside Bokeh and no ``_copy_to_clone`` method.
+
+        ``_clone_into`` doesn't run initializers, so it can't copy state
+        that they keep outside of properties. Initializers of Bokeh's own
+        models only set properties, or the models copy their state with
+        ``_copy_to_clone``.
+
+        '''
+        for cls in set(type(model) for model in self._all_models.values()):
+            if hasattr(cls, '_copy_to_clone'):
+                continue
+            for base in cls.__mro__:
+                if base is Model:
+                    break
+                if '__init__' in base.__dict__ and not base.__module__.startswith('bokeh.'):
+                    return True
+        return False
+
+    def _add_references(self, models):
+        ''' Count one more reference to each of ``models``, adding
+        models that are not in the document yet, along with anything
+        they refer to, to the document.
+
+        '''
+        attached = []
+        pending = list(models)
+        while pending:
+            model = pending.pop()
+            count = self._model_ref_counts.get(model._id, 0)
+            self._model_ref_counts[model._id] = count + 1
+            if count == 0:
+                pending.extend(self._add_model(model))
+                attached.append(model)
+        # attaching applies the theme, which may change references, so
+        # only do it once the model graph is consistent again
+        for model in attached:
+            model._attach_document(self)
+
+    def _remove_references(self, models):
+        ''' Count one reference less to each of ``models``, removing
+        models from the document that are no longer reachable from any
+        of its roots.
+
+        '''
+        # models that are still referred to, but possibly only by models
+        # that refer back to them through some cycle
+        candidates = []
+        pending = list(models)
+        while pending:
+            model = pending.pop()
+            count = self._model_ref_counts[model._id] - 1
+            if count == 0:
+                del self._model_ref_counts[model._id]
+                pending.extend(self._model_references.pop(model._id))
+                self._detach_model(model)
+            else:
+                self._model_ref_counts[model._id] = count
+                candidates.append(model)
+        if candidates:
+            self._remove_unreachable_cycles(candidates)
+
+    def _remove_unreachable_cycles(self, candidates):
+        ''' Remove models that are only kept in the document by references
+        from cycles that can no longer be reached from any root, looking
+        only at the part of the model graph that is reachable from
+        ``candidates``.
+
+        '''
+        root_ids = set(r._id for r in self._roots)
+
+        # roots are always reachable, and so is everything they refer to,
+        # so there is no need to look past them
+        subgraph = {}
+        pending = [c for c in candidates if c._id in self._model_ref_counts]
+        while pending:
+            model = pending.pop()
+            if model._id in subgraph or model._id in root_ids:
+                continue
+            subgraph[model._id] = model
+            pending.extend(self._model_references[model._id])
+
+        if not subgraph:
+            return
+
+        internal_counts = {}
+        for model_id in subgraph:
+            for ref in self._model_references[model_id]:
+                internal_counts[ref._id] = internal_counts.get(ref._id, 0) + 1
+
+        # models with references from outside the subgraph are reachable,
+        # and so is everything in the subgraph they refer to
+        reachable = set()
+        pending = [m for (i, m) in subgraph.items()
+                   if self._model_ref_counts[i] > internal_counts.get(i, 0)]
+        while pending:
+            model = pending.pop()
+            if model._id in reachable or model._id not in subgraph:
+                continue
+            reachable.add(model._id)
+            pending.extend(self._model_references[model._id])
+
+        unreachable = [m for (i, m) in subgraph.items() if i not in reachable]
+        for model in unreachable:
+            for ref in self._model_references[model._id]:
+                if ref._id in reachable or ref._id not in subgraph:
+                    self._model_ref_counts[ref._id] -= 1
+        for model in unreachable:
+            del self._model_ref_counts[model._id]
+            del self._model_references[model._id]
+            self._detach_model(model)
+
+    def _add_model(self, model):
+        ''' Add ``model`` to the document's models and return the models
+        it refers to, which the caller must count references to.
+
+        '''
+        refs = []
+        Model._visit_immediate_value_references(model, refs.append)
+        self._model_references[model._id] = refs
+        self._all_models[model._id] = model
+        self._all_models_index.add(model)
+        return refs
+
+    def _detach_model(self, model):
+        del self._all_models[model._id]
+        self._all_models_index.remove(model)
+        model._detach_document()
+
+    def _update_model_references(self, model):
+        ''' Update the model graph after the references held by ``model``,
+        which must be in the document, may have changed.
+
+        '''
+        refs = []
+        Model._visit_immediate_value_references(model, refs.append)
+        old_refs = self._model_references[model._id]
+        self._model_references[model._id] = refs
+
+        # work out the difference, keeping duplicate references
+        counts = {}
+        for ref in refs:
+            counts[ref._id] = counts.get(ref._id, 0) + 1
+        removed = []
+        for ref in old_refs:
+            if counts.get(ref._id, 0) > 0:
+                counts[ref._id] -= 1
+            else:
+                removed.append(ref)
+        added = []
+        for ref in reversed(refs):
+            if counts.get(ref._id, 0) > 0:
+                counts[ref._id] -= 1
+                added.append(ref)
+
+        # add first, so that models that just moved don't get detached
+        self._add_references(added)
+        self._remove_references(removed)
 
     @property
     def roots(self):
@@ -348,11 +616,8 @@ class Document(object):
         '''
         if model in self._roots:
             return
-        self._push_all_models_freeze()
-        try:
-            self._roots.append(model)
-        finally:
-            self._pop_all_models_freeze()
+        self._roots.append(model)
+        self._add_references([model])
         self._trigger_on_change(RootAddedEvent(self, model))
 
     @deprecated("Bokeh 0.11.0", "document.add_root")
@@ -382,11 +647,8 @@ class Document(object):
         '''
         if model not in self._roots:
             return # TODO (bev) ValueError?
-        self._push_all_models_freeze()
-        try:
-            self._roots.remove(model)
-        finally:
-            self._pop_all_models_freeze()
+        self._roots.remove(model)
+        self._remove_references([model])
         self._trigger_on_change(RootRemovedEvent(self, model))
 
     def get_model_by_id(self, model_id):
@@ -414,12 +676,15 @@ class Document(object):
         Returns:
             seq[Model]
 
+        Queries on name, type or tags only test the models with a matching
+        name, type or tag.
+
         '''
         if self._is_single_string_selector(selector, 'name'):
             # special-case optimization for by-name query
             return self._all_models_by_name.get_all(selector['name'])
         else:
-            return find(self._all_models.values(), selector)
+            return find(self._all_models_index.candidates(selector), selector)
 
     def select_one(self, selector):
         ''' Query this document for objects that match the given selector.
@@ -474,6 +739,17 @@ class Document(object):
         if not receiver in self._callbacks:
             self._callbacks[receiver] = lambda event: event.dispatch(receiver)
 
+    def _needs_old_values(self):
+        ''' Whether any callbacks added with on_change() are registered.
+
+        Receivers added with on_change_dispatch_to() (i.e. sessions) never
+        look at the old values of change events.
+        '''
+        for key, callback in self._callbacks.items():
+            if key is callback:
+                return True
+        return False
+
     def remove_on_change(self, *callbacks):
         ''' Remove a callback added earlier with on_change()
 
@@ -509,12 +785,9 @@ class Document(object):
     def _notify_change(self, model, attr, old, new, hint=None):
         ''' Called by Model when it changes
         '''
-        # if name changes, update by-name index
-        if attr == 'name':
-            if old is not None:
-                self._all_models_by_name.remove_value(old, model)
-            if new is not None:
-                self._all_models_by_name.add_value(new, model)
+        # if name or tags change, update the index
+        if attr == 'name' or attr == 'tags':
+            self._all_models_index.update(model, attr, old, new)
 
         if hint is None:
             serializable_new = model.lookup(attr).serializable_value(model)
@@ -523,12 +796,16 @@ class Document(object):
         self._trigger_on_change(ModelChangedEvent(self, model, attr, old, new, serializable_new, hint))
 
     @classmethod
-    def _references_json(cls, references):
-        '''Given a list of all models in a graph, return JSON representing them and their properties.'''
+    def _references_json(cls, references, buffers=None):
+        '''Given a list of all models in a graph, return JSON representing them and their properties.
+
+        If ``buffers`` is a list, array data that can be sent as binary
+        buffers is appended to it rather than included in the JSON.
+        '''
         references_json = []
         for r in references:
             ref = r.ref
-            ref['attributes'] = r._to_json_like(include_defaults=False)
+            ref['attributes'] = r._to_json_like(include_defaults=False, buffers=buffers)
             references_json.append(ref)
 
         return references_json
@@ -696,15 +973,10 @@ class Document(object):
             references=list(value_refs.values())
         )
 
-    def to_json_string(self, indent=None):
-        ''' Convert the document to a JSON string.
-
-        Args:
-            indent (int or None, optional) : number of spaces to indent, or
-                None to suppress all newlines and indentation (default: None)
-
-        Returns:
-            str
+    def _to_json_like(self, buffers=None):
+        ''' Return a dictionary representing the document, which still
+        needs to be serialized with ``serialize_json`` or converted with
+        ``to_json_compatible`` to become plain JSON.
 
         '''
         root_ids = []
@@ -713,24 +985,45 @@ class Document(object):
 
         root_references = self._all_models.values()
 
-        json = {
+        return {
             'title' : self.title,
             'roots' : {
                 'root_ids' : root_ids,
-                'references' : self._references_json(root_references)
+                'references' : self._references_json(root_references, buffers=buffers)
             },
             'version' : __version__
         }
 
-        return serialize_json(json, indent=indent)
+    def to_json_string(self, indent=None, buffers=None):
+        ''' Convert the document to a JSON string.
+
+        Args:
+            indent (int or None, optional) : number of spaces to indent, or
+                None to suppress all newlines and indentation (default: None)
+            buffers (list or None, optional) : a list to collect binary
+                buffers for NumPy array columns in, or None to encode all
+                array data as JSON (default: None)
+
+        Returns:
+            str
+
+        '''
+        return serialize_json(self._to_json_like(buffers=buffers), indent=indent)
+
+    def to_json(self, buffers=None):
+        ''' Convert the document to a JSON object.
 
-    def to_json(self):
-        ''' Convert the document to a JSON object. '''
+        The result only contains plain JSON types, and is the same as
+        parsing the result of ``to_json_string()``, but is created without
+        encoding the document to a string first.
 
-        # this is a total hack to go via a string, needed because
-        # our BokehJSONEncoder goes straight to a string.
-        doc_json = self.to_json_string()
-        return loads(doc_json)
+        Args:
+            buffers (list or None, optional) : a list to collect binary
+                buffers for NumPy array columns in, or None to encode all
+                array data as JSON (default: None)
+
+        '''
+        return to_json_compatible(self._to_json_like(buffers=buffers))
 
     @classmethod
     def from_json_string(cls, json):
@@ -761,15 +1054,39 @@ class Document(object):
         replacement = self.from_json(json)
         replacement._destructively_move(self)
 
-    def create_json_patch_string(self, events):
+    def create_json_patch_string(self, events, buffers=None):
         ''' Create a JSON string describing a patch to be applied with apply_json_patch_string()
 
             Args:
               events : list of events to be translated into patches
+              buffers (list or None, optional) : a list to collect binary
+                buffers for NumPy array columns in, or None to encode all
+                array data as JSON (default: None)
 
             Returns:
               str :  JSON string which can be applied to make the given updates to obj
         '''
+        return serialize_json(self._create_json_patch_like(events, buffers=buffers))
+
+    def create_json_patch(self, events, buffers=None):
+        ''' Create a JSON object describing a patch to be applied with apply_json_patch()
+
+            This is the same as parsing the result of create_json_patch_string(),
+            but without encoding the patch to a string first.
+
+            Args:
+              events : list of events to be translated into patches
+              buffers (list or None, optional) : a list to collect binary
+                buffers for NumPy array columns in, or None to encode all
+                array data as JSON (default: None)
+
+            Returns:
+              dict :  JSON object which can be applied to make the given updates to obj
+        '''
+        return to_json_compatible(self._create_json_patch_like(events, buffers=buffers))
+
+    def _create_json_patch_like(self, events, buffers=None):
+        from .models.sources import ColumnDataSource
         references = set()
         json_events = []
         for event in events:
@@ -778,13 +1095,24 @@ class Document(object):
 
             if isinstance(event, ModelChangedEvent):
                 if isinstance(event.hint, ColumnsStreamedEvent):
+                    data = event.hint.data
+                    if buffers is not None:
+                        data = transform_column_source_data(data, buffers=buffers)
                     json_events.append({ 'kind' : 'ColumnsStreamed',
                                          'column_source' : event.hint.column_source.ref,
-                                         'data' : event.hint.data,
+                                         'data' : data,
                                          'rollover' : event.hint.rollover })
+                elif isinstance(event.hint, ColumnsPatchedEvent):
+                    json_events.append({ 'kind' : 'ColumnsPatched',
+                                         'column_source' : event.hint.column_source.ref,
+                                         'patches' : event.hint.patches })
                 else:
                     value = event.serializable_new
 
+                    if buffers is not None and event.attr == 'data' and \
+                       isinstance(event.model, ColumnDataSource):
+                        value = transform_column_source_data(value, buffers=buffers)
+
                     # the new value is an object that may have
                     # not-yet-in-the-remote-doc references, and may also
                     # itself not be in the remote doc yet.  the remote may
@@ -819,12 +1147,10 @@ class Document(object):
                 json_events.append({ 'kind' : 'TitleChanged',
                                      'title' : event.title })
 
-        json = {
+        return {
             'events' : json_events,
-            'references' : self._references_json(references)
-            }
-
-        return serialize_json(json)
+            'references' : self._references_json(references, buffers=buffers)
+        }
 
     def apply_json_patch_string(self, patch):
         ''' Apply a JSON patch string created by create_json_patch_string() '''
@@ -868,6 +1194,18 @@ class Document(object):
                 data = event_json['data']
                 rollover = event_json['rollover']
                 source.stream(data, rollover)
+            elif event_json['kind'] == 'ColumnsPatched':
+                source_id = event_json['column_source']['id']
+                if source_id not in self._all_models:
+                    raise RuntimeError("Cannot apply patch to %s which is not in the document" % (str(source_id)))
+                source = self._all_models[source_id]
+                patches = event_json['patches']
+                for patch in patches.values():
+                    for i, (ind, value) in enumerate(patch):
+                        # slices are sent as {start, stop, step} dicts
+                        if isinstance(ind, dict):
+                            patch[i] = (slice(ind['start'], ind['stop'], ind['step']), value)
+                source.patch(patches)
             elif event_json['kind'] == 'RootAdded':
                 root_id = event_json['model']['id']
                 root_obj = references[root_id]
@@ -886,6 +1224,9 @@ class Document(object):
         # some logging configured. We want to make sure warnings
         # go somewhere so configure here if nobody has.
         logging.basicConfig(level=logging.INFO)
+        if settings.container_validation() != "full":
+            for model in self._all_models.values():
+                model._validate_containers()
         root_sets = []
         for r in self.roots:
             refs = r.references()
@@ -896,6 +1237,14 @@ class Document(object):
     def session_callbacks(self):
         return list(self._session_callbacks.values())
 
+    @property
+    def session_context(self):
+        """ The ``SessionContext`` of the Bokeh server session this document
+        belongs to, or None if it is not being served.
+
+        """
+        return self._session_context
+
     def _add_session_callback(self, callback_obj, callback, one_shot):
         if callback in self._session_callbacks:
             raise ValueError("callback has already been added")
@@ -14,7 +14,9 @@ these different cases.
 from __future__ import absolute_import
 
 from collections import Sequence
+import re
 from warnings import warn
+from weakref import WeakKeyDictionary
 
 from six import string_types
 
@@ -454,7 +456,7 @@ def _script_for_render_items(docs_json, render_items, websocket_url=None, wrap_s
         return plot_js
 
 def _html_page_for_render_items(bundle, docs_json, render_items, title, websocket_url=None,
-                                template=FILE, template_variables={}):
+                                template=FILE, template_variables={}, encode=True):
     if title is None:
         title = DEFAULT_TITLE
 
@@ -473,7 +475,9 @@ def _html_page_for_render_items(bundle, docs_json, render_items, title, websocke
     ))
 
     html = template.render(template_variables_full)
-    return encode_utf8(html)
+    if encode:
+        return encode_utf8(html)
+    return html
 
 def _check_models(models, allow_dict=False):
     input_type_valid = False
@@ -611,13 +615,59 @@ def server_html_page_for_models(session_id, model_ids, resources, title, websock
     return _html_page_for_render_items(bundle, {}, render_items, title, websocket_url=websocket_url)
 
 def server_html_page_for_session(session_id, resources, title, websocket_url):
-    elementid = make_id()
-    render_items = [{
-        'sessionid' : session_id,
-        'elementid' : elementid,
-        'use_for_title' : True
-        # no 'modelid' implies the entire session document
-    }]
+    return _server_page_template(resources).render(session_id, title, websocket_url)
 
-    bundle = _bundle_for_objs_and_resources(None, resources)
-    return _html_page_for_render_items(bundle, {}, render_items, title, websocket_url=websocket_url)
+class _ServerPageTemplate(object):
+    ''' The page for a server session, rendered once with placeholders for
+    the parts that differ between sessions, so that pages for new sessions
+    only take string substitution instead of bundling the resources and
+    rendering the Jinja templates again.
+
+    '''
+
+    def __init__(self, resources):
+        placeholders = dict((name, "%s-%s" % (name, make_id()))
+                            for name in ('sessionid', 'elementid', 'title', 'websocket_url'))
+        render_items = [{
+            'sessionid' : placeholders['sessionid'],
+            'elementid' : placeholders['elementid'],
+            'use_for_title' : True
+            # no 'modelid' implies the entire session document
+        }]
+
+        bundle = _bundle_for_objs_and_resources(None, resources)
+        html = _html_page_for_render_items(bundle, {}, render_items, placeholders['title'],
+                                           websocket_url=placeholders['websocket_url'], encode=False)
+
+        names = dict((placeholder, name) for name, placeholder in placeholders.items())
+        pattern = "(%s)" % "|".join(re.escape(p) for p in placeholders.values())
+        # even items are literal html, odd items are the names of placeholders
+        self._parts = [names.get(part, part) if i % 2 else part
+                       for i, part in enumerate(re.split(pattern, html))]
+
+    def render(self, session_id, title, websocket_url):
+        if title is None:
+            title = DEFAULT_TITLE
+        elif not title:
+            # what FILE renders for an empty title
+            title = "Bokeh Plot"
+        values = {
+            # the session id is in the render items JSON
+            'sessionid' : serialize_json(session_id)[1:-1],
+            'elementid' : make_id(),
+            'title' : title,
+            'websocket_url' : websocket_url,
+        }
+        parts = list(self._parts)
+        parts[1::2] = [values[name] for name in parts[1::2]]
+        return encode_utf8("".join(parts))
+
+_server_page_templates = WeakKeyDictionary()
+
+def _server_page_template(resources):
+    # the server keeps one Resources object per root URL
+    try:
+        return _server_page_templates[resources]
+    except KeyError:
+        template = _server_page_templates[resources] = _ServerPageTemplate(resources)
+        return template
@@ -18,17 +18,19 @@ from __future__ import absolute_import
 import logging
 logger = logging.getLogger(__name__)
 
+from contextlib import contextmanager
 import io
 import itertools
 import json
 import os
+import threading
 import warnings
 
 # Third-party imports
 
 # Bokeh imports
 from .core.state import State
-from .document import Document
+from .document import Document, _coalesce_events
 from .embed import notebook_div, standalone_html_page_for_models, autoload_server
 from .models import Component
 from .models.plots import GridPlot
@@ -48,6 +50,9 @@ _new_param = {'tab': 2, 'window': 1}
 
 _state = State()
 
+# holds the current document of threads that are inside _thread_local_curdoc()
+_thread_local = threading.local()
+
 #-----------------------------------------------------------------------------
 # Local utilities
 #-----------------------------------------------------------------------------
@@ -57,10 +62,19 @@ _state = State()
 #-----------------------------------------------------------------------------
 
 class _CommsHandle(object):
+    ''' Connects a plot shown in a notebook to the document it was shown
+    from, so that :func:`push_notebook` can update it.
+
+    Changes to the document are recorded as they happen, so that only
+    they need to be sent on the next push, rather than the whole document.
 
-    _json = {}
+    '''
 
-    def __init__(self, comms, doc, json):
+    # after this many changes without a push, even once coalesced, stop
+    # recording them and send the whole document on the next push instead
+    _max_recorded_events = 10000
+
+    def __init__(self, comms, doc):
         self._cellno = None
         try:
             from IPython import get_ipython
@@ -72,8 +86,9 @@ class _CommsHandle(object):
             logger.debug("Could not get Notebook cell number, reason: %s", e)
 
         self._comms = comms
-        self._doc = doc
-        self._json[doc] = json
+        self._doc = None
+        self._events = None
+        self.update(doc)
 
     def _repr_html_(self):
         if self._cellno is not None:
@@ -90,12 +105,43 @@ class _CommsHandle(object):
         return self._doc
 
     @property
-    def json(self):
-        return self._json[self._doc]
-
-    def update(self, doc, json):
-        self._doc = doc
-        self._json[doc] = json
+    def events(self):
+        ''' Events that bring the notebook up to date with the changes to
+        the document since it was last shown or pushed, or None if the
+        whole document has to be sent.
+
+        '''
+        if self._events is None:
+            return None
+        return _coalesce_events(self._events)
+
+    def update(self, doc):
+        ''' Record that the notebook shows the current state of ``doc``. '''
+        if doc is not self._doc:
+            self.close()
+            self._doc = doc
+            doc.on_change_dispatch_to(self)
+        self._events = []
+
+    def close(self):
+        ''' Stop recording changes to the document, e.g. because a newer
+        handle replaced this one.
+
+        '''
+        if self._doc is not None:
+            self._doc.remove_on_change(self)
+            self._doc = None
+        self._events = None
+
+    def _document_patched(self, event):
+        if self._events is None:
+            return
+        self._events.append(event)
+        if len(self._events) > self._max_recorded_events:
+            self._events = _coalesce_events(self._events)
+            if len(self._events) > self._max_recorded_events:
+                logger.debug("Too many changes to a document shown in the notebook, the whole document will be pushed")
+                self._events = None
 
 def output_file(filename, title="Bokeh Plot", autosave=False, mode="cdn", root_dir=None):
     '''Configure the default output state to generate output saved
@@ -245,7 +291,10 @@ def set_curdoc(doc):
         Calling this function will replace any existing document.
 
     '''
-    _state.document = doc
+    if getattr(_thread_local, 'active', False):
+        _thread_local.document = doc
+    else:
+        _state.document = doc
 
 def curdoc():
     ''' Return the document for the current default state.
@@ -254,8 +303,27 @@ def curdoc():
         doc : the current default document object.
 
     '''
+    if getattr(_thread_local, 'active', False):
+        return _thread_local.document
     return _state.document
 
+@contextmanager
+def _thread_local_curdoc():
+    ''' Make ``curdoc()`` and ``set_curdoc()`` only see and affect the
+    current thread while in this context.
+
+    This is used by the Bokeh server to build session documents on worker
+    threads while other sessions use ``curdoc()`` on the IO loop thread.
+
+    '''
+    _thread_local.active = True
+    _thread_local.document = None
+    try:
+        yield
+    finally:
+        _thread_local.active = False
+        _thread_local.document = None
+
 def curstate():
     ''' Return the current State object
 
@@ -328,7 +396,9 @@ def _show_notebook_with_state(obj, state):
     else:
         comms_target = make_id()
         publish_display_data({'text/html': notebook_div(obj, comms_target)})
-        handle = _CommsHandle(get_comms(comms_target), state.document, state.document.to_json())
+        handle = _CommsHandle(get_comms(comms_target), state.document)
+        if state.last_comms_handle is not None:
+            state.last_comms_handle.close()
         state.last_comms_handle = handle
         return handle
 
@@ -417,6 +487,71 @@ def _save_helper(obj, filename, resources, title, validate):
         with io.open(filename, "w", encoding="utf-8") as f:
             f.write(decode_utf8(html))
 
+def save_many(make_obj, jobs, resources=None, title=None, num_procs=None, validate=True):
+    ''' Save many HTML files at once, creating and rendering their
+    documents in a pool of processes.
+
+    Args:
+        make_obj (callable) : a function that returns the Document or model
+            object to save to a file, when called with the arguments for
+            that file. It is called in other processes, so it has to be a
+            function that can be pickled, e.g. one defined at module level
+
+        jobs (seq[tuple(str, tuple)]) : the filename and the arguments to
+            call ``make_obj`` with, for each file to save
+
+        resources (Resources, optional) : A Resources config to use (default: None)
+            If None, use ``resources.CDN``.
+
+        title (str, optional) : a title for the HTML documents (default: None)
+            If None, use the title of each document.
+
+        num_procs (int, optional) : the number of processes to use (default: None)
+            If None, use one per CPU. If 1, save the files in this process.
+
+        validate (bool, optional) : True to check integrity of the models
+
+    Returns:
+        list[str] : the filenames saved to
+
+    Examples:
+
+        .. code-block:: python
+
+            from bokeh.io import save_many
+            from bokeh.plotting import figure
+            from bokeh.resources import INLINE
+
+            def make_plot(n):
+                p = figure(title="Report %d" % n)
+                p.line(range(n), range(n))
+                return p
+
+            save_many(make_plot, [("report%d.html" % n, (n,)) for n in range(1000)],
+                      resources=INLINE)
+
+    '''
+    if resources is None:
+        from .resources import CDN
+        resources = CDN
+
+    jobs = list(jobs)
+
+    if num_procs == 1:
+        return [_save_one(make_obj, args, filename, resources, title, validate) for filename, args in jobs]
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=num_procs) as executor:
+        futures = [executor.submit(_save_one, make_obj, args, filename, resources, title, validate)
+                   for filename, args in jobs]
+        return [future.result() for future in futures]
+
+def _save_one(make_obj, args, filename, resources, title, validate):
+    # runs in the processes of save_many(), where rendering the same
+    # resources again for every file is cached
+    _save_helper(make_obj(*args), filename, resources, title, validate)
+    return filename
+
 # this function exists mostly to be mocked in tests
 def _push_to_server(session_id, url, app_path, document, io_loop):
     session = push_session(document, session_id=session_id, url=url, app_path=app_path, io_loop=io_loop)
@@ -532,13 +667,15 @@ def push_notebook(document=None, state=None, handle=None):
         warnings.warn("Cannot find a last shown plot to update. Call output_notebook() and show() before push_notebook()")
         return
 
-    to_json = document.to_json()
-    if handle.doc is not document:
-        msg = dict(doc=to_json)
+    events = handle.events if handle.doc is document else None
+    if events is not None:
+        if not events:
+            return
+        msg = document.create_json_patch_string(events)
     else:
-        msg = Document._compute_patch_between_json(handle.json, to_json)
-    handle.comms.send(json.dumps(msg))
-    handle.update(document, to_json)
+        msg = json.dumps(dict(doc=document.to_json()))
+    handle.comms.send(msg)
+    handle.update(document)
 
 def reset_output(state=None):
     ''' Clear the default state of all output modes.
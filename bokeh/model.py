@@ -3,13 +3,13 @@ from __future__ import absolute_import, print_function
 import logging
 logger = logging.getLogger(__file__)
 
-from json import loads
+import weakref
 
-from six import iteritems
+from six import iteritems, string_types
 
-from .core.json_encoder import serialize_json
+from .core.json_encoder import serialize_json, to_json_compatible
 from .core.properties import Any, HasProps, List, MetaHasProps, String
-from .core.query import find
+from .core.query import find, IN
 from .themes import default as default_theme
 from .util.callback_manager import CallbackManager
 from .util.future import with_metaclass
@@ -50,7 +50,7 @@ class Viewable(MetaHasProps):
 
     @classmethod
     def _preload_models(cls):
-        from . import models; models
+        from . import models; models._import_all()
         from .plotting import Figure; Figure
         try:
             from .charts import Chart; Chart
@@ -71,12 +71,265 @@ class Viewable(MetaHasProps):
         else:
             raise KeyError("View model name '%s' not found" % view_model_name)
 
+class _MultiValuedDict(object):
+    """
+    This is to store a mapping from keys to multiple values, while avoiding
+    the overhead of always having a collection as the value.
+    """
+    def __init__(self):
+        self._dict = dict()
+
+    def add_value(self, key, value):
+        if key is None:
+            raise ValueError("Key is None")
+        if value is None:
+            raise ValueError("Can't put None in this dict")
+        if isinstance(value, set):
+            raise ValueError("Can't put sets in this dict")
+        existing = self._dict.get(key, None)
+        if existing is None:
+            self._dict[key] = value
+        elif isinstance(existing, set):
+            existing.add(value)
+        else:
+            self._dict[key] = set([existing, value])
+
+    def remove_value(self, key, value):
+        if key is None:
+            raise ValueError("Key is None")
+        existing = self._dict.get(key, None)
+        if isinstance(existing, set):
+            existing.discard(value)
+            if len(existing) == 0:
+                del self._dict[key]
+        elif existing == value:
+            del self._dict[key]
+        else:
+            pass
+
+    def get_one(self, k, duplicate_error):
+        existing = self._dict.get(k, None)
+        if isinstance(existing, set):
+            if len(existing) == 1:
+                return next(iter(existing))
+            else:
+                raise ValueError(duplicate_error + (": %r" % (existing)))
+        else:
+            return existing
+
+    def get_all(self, k):
+        existing = self._dict.get(k, None)
+        if existing is None:
+            return []
+        elif isinstance(existing, set):
+            return list(existing)
+        else:
+            return [existing]
+
+def _is_index_key(value):
+    if value is None:
+        return False
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+class _ModelIndex(object):
+    """ Indexes a collection of models by name, by type (including every
+    base class) and by tag, so that the models a query selector can match
+    are found without testing every model in the collection.
+
+    """
+    def __init__(self, models=()):
+        self._models = dict()
+        self.by_name = _MultiValuedDict()
+        self.by_type = _MultiValuedDict()
+        self.by_tag = _MultiValuedDict()
+        # models with tags that can't be looked up in by_tag, by ID
+        self._unindexed_tags = dict()
+        for model in models:
+            self.add(model)
+
+    def __contains__(self, model):
+        return model._id in self._models
+
+    def __len__(self):
+        return len(self._models)
+
+    def add(self, model):
+        self._models[model._id] = model
+        if model.name is not None:
+            self.by_name.add_value(model.name, model)
+        for cls in type(model).__mro__:
+            self.by_type.add_value(cls, model)
+        self._add_tags(model, model.tags)
+
+    def remove(self, model):
+        del self._models[model._id]
+        if model.name is not None:
+            self.by_name.remove_value(model.name, model)
+        for cls in type(model).__mro__:
+            self.by_type.remove_value(cls, model)
+        self._remove_tags(model, model.tags)
+
+    def update(self, model, attr, old, new):
+        """ Update the index after ``attr`` of ``model`` changed. """
+        if model._id not in self._models:
+            return
+        if attr == 'name':
+            if old is not None:
+                self.by_name.remove_value(old, model)
+            if new is not None:
+                self.by_name.add_value(new, model)
+        elif attr == 'tags':
+            self._remove_tags(model, old)
+            self._add_tags(model, new)
+
+    def _add_tags(self, model, tags):
+        for tag in tags or ():
+            if _is_index_key(tag):
+                self.by_tag.add_value(tag, model)
+            else:
+                self._unindexed_tags[model._id] = model
+
+    def _remove_tags(self, model, tags):
+        for tag in tags or ():
+            if _is_index_key(tag):
+                self.by_tag.remove_value(tag, model)
+        self._unindexed_tags.pop(model._id, None)
+
+    def candidates(self, selector):
+        """ Return the models that may match ``selector``: at least all the
+        models that match it, which still have to be tested with
+        :func:`~bokeh.core.query.match`.
+
+        Only ``'name'``, ``'type'`` and ``'tags'`` selector keys narrow
+        down the result, if there are none of those, all the models are
+        returned.
+
+        """
+        result = None
+        for key, lookup in (('name', self._name_candidates),
+                            ('type', self._type_candidates),
+                            ('tags', self._tag_candidates)):
+            if key not in selector:
+                continue
+            models = lookup(selector[key])
+            if models is not None and (result is None or len(models) < len(result)):
+                result = models
+        if result is None:
+            return list(self._models.values())
+        return result
+
+    def _get_all(self, index, keys):
+        if len(keys) == 1:
+            return index.get_all(keys[0])
+        models = dict()
+        for key in keys:
+            for model in index.get_all(key):
+                models[model._id] = model
+        return list(models.values())
+
+    def _name_candidates(self, value):
+        if isinstance(value, dict) and list(value.keys()) == [IN]:
+            names = value[IN]
+        else:
+            names = [value]
+        if not all(isinstance(name, string_types) for name in names):
+            return None
+        return self._get_all(self.by_name, names)
+
+    def _type_candidates(self, value):
+        # same cases as in match()
+        if isinstance(value, dict) and list(value.keys()) == [IN]:
+            types = value[IN]
+        else:
+            types = [value]
+        if not all(isinstance(cls, type) for cls in types):
+            return None
+        return self._get_all(self.by_type, list(types))
+
+    def _tag_candidates(self, value):
+        # same cases as in match(), which also tests whether the selector
+        # itself is one of the tags if it or the tags aren't hashable
+        if isinstance(value, string_types):
+            tags = [value]
+        else:
+            try:
+                tags = list(set(value))
+            except TypeError:
+                tags = [value] if _is_index_key(value) else []
+        models = self._get_all(self.by_tag, [tag for tag in tags if _is_index_key(tag)])
+        if self._unindexed_tags:
+            models = dict((model._id, model) for model in models)
+            models.update(self._unindexed_tags)
+            models = list(models.values())
+        return models
+
+class _ReferencesIndex(_ModelIndex):
+    """ A _ModelIndex of a model and all of its references, that is kept up
+    to date as references are added, so that the model can be queried
+    repeatedly without collecting its references each time.
+
+    Every model in the index keeps a weak reference to it, so that only
+    the indexes that contain a model are updated when it changes.
+
+    When a reference is removed, the index becomes ``stale``, since the
+    removed model may or may not still be referred to some other way.
+
+    """
+    def __init__(self, model):
+        self.stale = False
+        super(_ReferencesIndex, self).__init__(model.collect_models(model))
+
+    def add(self, model):
+        super(_ReferencesIndex, self).add(model)
+        if not model._references_indexes:
+            model._references_indexes = weakref.WeakSet()
+        model._references_indexes.add(self)
+
+    def remove(self, model):
+        super(_ReferencesIndex, self).remove(model)
+        model._references_indexes.discard(self)
+
+    def references_changed(self, model, old, new):
+        """ Update the index after a property of ``model`` that can hold
+        references changed from ``old`` to ``new``.
+
+        """
+        if self.stale or model._id not in self._models:
+            return
+        if isinstance(old, list) and isinstance(new, list) and len(new) >= len(old) and \
+           all(old_item is new_item for old_item, new_item in zip(old, new)):
+            # items were appended, e.g. plot.renderers = plot.renderers + [r]
+            old, new = [], new[len(old):]
+        old_refs = dict()
+        new_refs = dict()
+        Model._visit_value_and_its_immediate_references(old, lambda obj: old_refs.setdefault(obj._id, obj))
+        Model._visit_value_and_its_immediate_references(new, lambda obj: new_refs.setdefault(obj._id, obj))
+        if any(ref_id not in new_refs for ref_id in old_refs):
+            self.stale = True
+            for obj in self._models.values():
+                obj._references_indexes.discard(self)
+            return
+        queued = [obj for obj in new_refs.values() if obj._id not in self._models]
+        while queued:
+            obj = queued.pop()
+            if obj._id in self._models:
+                continue
+            self.add(obj)
+            Model._visit_immediate_value_references(obj, queued.append)
+
 class Model(with_metaclass(Viewable, HasProps, CallbackManager)):
     """ Base class for all plot-related objects """
 
     name = String()
     tags = List(Any)
 
+    # the _ReferencesIndex instances that contain this model
+    _references_indexes = ()
+
     def __init__(self, **kwargs):
         self._id = kwargs.pop("id", make_id())
         self._document = None
@@ -100,6 +353,13 @@ class Model(with_metaclass(Viewable, HasProps, CallbackManager)):
         return self._document
 
     def trigger(self, attr, old, new, hint=None):
+        if self._references_indexes:
+            if attr in self.properties_with_refs():
+                for index in list(self._references_indexes):
+                    index.references_changed(self, old, new)
+            elif attr in ('name', 'tags'):
+                for index in list(self._references_indexes):
+                    index.update(self, attr, old, new)
         dirty = { 'count' : 0 }
         def mark_dirty(obj):
             dirty['count'] += 1
@@ -107,7 +367,7 @@ class Model(with_metaclass(Viewable, HasProps, CallbackManager)):
             self._visit_value_and_its_immediate_references(new, mark_dirty)
             self._visit_value_and_its_immediate_references(old, mark_dirty)
             if dirty['count'] > 0:
-                self._document._invalidate_all_models()
+                self._document._update_model_references(self)
         # chain up to invoke callbacks
         super(Model, self).trigger(attr, old, new, hint)
 
@@ -137,7 +397,17 @@ class Model(with_metaclass(Viewable, HasProps, CallbackManager)):
             seq[Model]
 
         '''
-        return find(self.references(), selector)
+        return find(self._references_index().candidates(selector), selector)
+
+    def _references_index(self):
+        ''' A cached index of this object and all of its references, for
+        queries.
+
+        '''
+        index = getattr(self, '_cached_references_index', None)
+        if index is None or index.stale:
+            index = self._cached_references_index = _ReferencesIndex(self)
+        return index
 
     def select_one(self, selector):
         ''' Query this object and all of its references for objects that
@@ -237,7 +507,7 @@ class Model(with_metaclass(Viewable, HasProps, CallbackManager)):
         """Returns all ``Models`` that this object has references to. """
         return set(self.collect_models(self))
 
-    def _to_json_like(self, include_defaults):
+    def _to_json_like(self, include_defaults, buffers=None):
         """ Returns a dictionary of the attributes of this object, in
         a layout corresponding to what BokehJS expects at unmarshalling time.
 
@@ -253,6 +523,10 @@ class Model(with_metaclass(Viewable, HasProps, CallbackManager)):
         Args:
             include_defaults (bool) : whether to include attributes
                 that haven't been changed from the default.
+            buffers (list or None, optional) : a list to collect binary
+                buffers in. Models that hold array data may append the
+                raw data here and include only a reference to it in
+                the returned attributes (default: None)
 
         """
         attrs = self.properties_with_values(include_defaults=include_defaults)
@@ -290,7 +564,9 @@ class Model(with_metaclass(Viewable, HasProps, CallbackManager)):
                 that haven't been changed from the default
 
         """
-        return loads(self.to_json_string(include_defaults=include_defaults))
+        json_like = self._to_json_like(include_defaults=include_defaults)
+        json_like['id'] = self._id
+        return to_json_compatible(json_like)
 
     def to_json_string(self, include_defaults):
         """Returns a JSON string encoding the attributes of this object.
@@ -2,38 +2,183 @@ from __future__ import absolute_import
 
 # This file is excluded from flake8 checking in setup.cfg
 
-from .annotations import *
-from .axes import *
-from .callbacks import *
-from .component import *
-from .formatters import *
-from .glyphs import *
-from .grids import *
-from .layouts import *
-from .images import *
-from .map_plots import *
-from .markers import *
-from .mappers import *
-from .plots import *
-from .ranges import *
-from .renderers import *
-from .sources import *
-from .tickers import *
-from .tiles import *
-from .tools import *
+# The submodules of bokeh.models are imported when one of their models is
+# first used, rather than all of them by this module, because that takes a
+# large part of the time it takes to import bokeh. Getting any other name,
+# ``from bokeh.models import *`` and ``dir(bokeh.models)`` import all of
+# them. Model.get_class() does too, so that all models can be looked up
+# by name when a document is loaded from JSON.
+
+import sys as _sys
+from collections import OrderedDict as _OrderedDict
+from importlib import import_module as _import_module
+from types import ModuleType as _ModuleType
 
 ### Deprecation note:
-### bokeh.models.widgets.layouts was deprecated in 0.11.1 in favor of 
-### bokeh.models.layouts and is awaiting removal. The following imports will
-### load all widgets modules except layouts, in order to prevent raising a
-### deprecation warning.
-
-from .widgets.buttons import *
-from .widgets.dialogs import *
-from .widgets.groups import *
-from .widgets.icons import *
-from .widgets.inputs import *
-from .widgets.markups import *
-from .widgets.panels import *
-from .widgets.tables import *
-from .widgets.widget import *
+### bokeh.models.widgets.layouts was deprecated in 0.11.1 in favor of
+### bokeh.models.layouts and is awaiting removal. The widgets submodules
+### below are all widgets modules except layouts, in order to prevent raising
+### a deprecation warning.
+
+# the models defined in each submodule
+_models_by_submodule = _OrderedDict([
+    ('annotations', [
+        'Annotation', 'BoxAnnotation', 'Legend', 'PolyAnnotation', 'Span', 'Tooltip'
+    ]),
+    ('axes', [
+        'Axis', 'CategoricalAxis', 'ContinuousAxis', 'DatetimeAxis', 'LinearAxis', 'LogAxis'
+    ]),
+    ('callbacks', [
+        'Callback', 'CustomJS', 'OpenURL'
+    ]),
+    ('component', [
+        'Component'
+    ]),
+    ('formatters', [
+        'BasicTickFormatter', 'CategoricalTickFormatter', 'DatetimeTickFormatter', 'LogTickFormatter',
+        'NumeralTickFormatter', 'PrintfTickFormatter', 'TickFormatter'
+    ]),
+    ('glyphs', [
+        'AnnularWedge', 'Annulus', 'Arc', 'Bezier', 'Gear', 'Glyph', 'Image', 'ImageRGBA', 'ImageURL',
+        'Line', 'MultiLine', 'Oval', 'Patch', 'Patches', 'Quad', 'Quadratic', 'Ray', 'Rect', 'Segment',
+        'Text', 'Wedge'
+    ]),
+    ('grids', [
+        'Grid'
+    ]),
+    ('layouts', [
+        'BaseBox', 'HBox', 'Layout', 'VBox', 'VBoxForm'
+    ]),
+    ('images', [
+        'ImageSource'
+    ]),
+    ('map_plots', [
+        'GMapOptions', 'GMapPlot', 'MapOptions', 'MapPlot'
+    ]),
+    ('markers', [
+        'Asterisk', 'Circle', 'CircleCross', 'CircleX', 'Cross', 'Diamond', 'DiamondCross',
+        'InvertedTriangle', 'Marker', 'Square', 'SquareCross', 'SquareX', 'Triangle', 'X'
+    ]),
+    ('mappers', [
+        'ColorMapper', 'LinearColorMapper'
+    ]),
+    ('plots', [
+        'GridPlot', 'LayoutBox', 'Plot'
+    ]),
+    ('ranges', [
+        'DataRange', 'DataRange1d', 'FactorRange', 'Range', 'Range1d'
+    ]),
+    ('renderers', [
+        'DataRenderer', 'DynamicImageRenderer', 'GlyphRenderer', 'GuideRenderer', 'Renderer', 'TileRenderer'
+    ]),
+    ('sources', [
+        'AjaxDataSource', 'ColumnDataSource', 'DataSource', 'DownsampledDataSource', 'GeoJSONDataSource',
+        'RemoteSource'
+    ]),
+    ('tickers', [
+        'AdaptiveTicker', 'BasicTicker', 'CategoricalTicker', 'CompositeTicker', 'ContinuousTicker',
+        'DatetimeTicker', 'DaysTicker', 'FixedTicker', 'LogTicker', 'MonthsTicker', 'SingleIntervalTicker',
+        'Ticker', 'YearsTicker'
+    ]),
+    ('tiles', [
+        'BBoxTileSource', 'MercatorTileSource', 'QUADKEYTileSource', 'TMSTileSource', 'TileSource',
+        'WMTSTileSource'
+    ]),
+    ('tools', [
+        'BoxSelectTool', 'BoxZoomTool', 'CrosshairTool', 'HelpTool', 'HoverTool', 'InspectTool',
+        'LassoSelectTool', 'PanTool', 'PolySelectTool', 'PreviewSaveTool', 'RedoTool', 'ResetTool',
+        'ResizeTool', 'TapTool', 'Tool', 'ToolEvents', 'UndoTool', 'WheelZoomTool'
+    ]),
+    ('widgets.buttons', [
+        'AbstractButton', 'Button', 'Dropdown', 'Toggle'
+    ]),
+    ('widgets.dialogs', [
+        'Dialog'
+    ]),
+    ('widgets.groups', [
+        'AbstractGroup', 'ButtonGroup', 'CheckboxButtonGroup', 'CheckboxGroup', 'Group', 'RadioButtonGroup',
+        'RadioGroup'
+    ]),
+    ('widgets.icons', [
+        'AbstractIcon', 'Icon'
+    ]),
+    ('widgets.inputs', [
+        'AutocompleteInput', 'DatePicker', 'DateRangeSlider', 'InputWidget', 'MultiSelect', 'Select',
+        'Slider', 'TextInput'
+    ]),
+    ('widgets.markups', [
+        'Markup', 'Paragraph', 'PreText'
+    ]),
+    ('widgets.panels', [
+        'Panel', 'Tabs'
+    ]),
+    ('widgets.tables', [
+        'BooleanFormatter', 'CellEditor', 'CellFormatter', 'CheckboxEditor', 'DataTable', 'DateEditor',
+        'DateFormatter', 'HTMLTemplateFormatter', 'IntEditor', 'NumberEditor', 'NumberFormatter',
+        'PercentEditor', 'SelectEditor', 'StringEditor', 'StringFormatter', 'TableColumn', 'TableWidget',
+        'TextEditor', 'TimeEditor'
+    ]),
+    ('widgets.widget', [
+        'Widget'
+    ]),
+])
+
+_submodule_by_model = dict((model, submodule)
+                           for submodule, models in _models_by_submodule.items()
+                           for model in models)
+
+_submodules = set(submodule.split('.')[0] for submodule in _models_by_submodule)
+
+class _LazyModelsModule(_ModuleType):
+    """ The ``bokeh.models`` module, which imports its submodules when their
+    models are first used.
+
+    """
+
+    def __getattr__(self, name):
+        # only called for names that haven't been imported yet
+        if name.startswith('__'):
+            raise AttributeError(name)
+        if name in _submodules:
+            return _import_module('.' + name, self.__name__)
+        submodule = _submodule_by_model.get(name)
+        if submodule is None:
+            self._import_all()
+        else:
+            self._import_submodule(submodule)
+        try:
+            return self.__dict__[name]
+        except KeyError:
+            raise AttributeError("module '%s' has no attribute '%s'" % (self.__name__, name))
+
+    def __dir__(self):
+        self._import_all()
+        return sorted(self.__dict__)
+
+    @property
+    def __all__(self):
+        self._import_all()
+        return [name for name in self.__dict__ if not name.startswith('_')]
+
+    def _import_submodule(self, submodule):
+        module = _import_module('.' + submodule, self.__name__)
+        # same as "from .submodule import *", except for names that other
+        # submodules already provided, unless they are models of this one
+        for name, value in list(vars(module).items()):
+            if not name.startswith('_'):
+                self.__dict__.setdefault(name, value)
+        for name in _models_by_submodule[submodule]:
+            self.__dict__[name] = getattr(module, name)
+
+    def _import_all(self):
+        if self.__dict__.get('_imported_all'):
+            return
+        for submodule in _models_by_submodule:
+            self._import_submodule(submodule)
+        self.__dict__['_imported_all'] = True
+
+_lazy_module = _LazyModelsModule(__name__, __doc__)
+_lazy_module.__dict__.update(_sys.modules[__name__].__dict__)
+# keep the original module alive, its globals are used by the class above
+_lazy_module.__dict__['_module'] = _sys.modules[__name__]
+_sys.modules[__name__] = _lazy_module
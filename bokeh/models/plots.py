@@ -128,7 +128,7 @@ class Plot(Component):
 
         # Want to pass selector that is a dictionary
         from ..plotting.helpers import _list_attr_splat
-        return _list_attr_splat(find(self.references(), selector, {'plot': self}))
+        return _list_attr_splat(find(self._references_index().candidates(selector), selector, {'plot': self}))
 
     def row(self, row, gridplot):
         ''' Return whether this plot is in a given row of a GridPlot.
@@ -640,7 +640,7 @@ class GridPlot(Component):
 
         # Want to pass selector that is a dictionary
         from ..plotting.helpers import _list_attr_splat
-        return _list_attr_splat(find(self.references(), selector, {'gridplot': self}))
+        return _list_attr_splat(find(self._references_index().candidates(selector), selector, {'gridplot': self}))
 
     def column(self, col):
         ''' Return a given column of plots from this GridPlot.
@@ -169,10 +169,10 @@ class ColumnDataSource(DataSource):
         self.data[name] = data
         return name
 
-    def _to_json_like(self, include_defaults):
+    def _to_json_like(self, include_defaults, buffers=None):
         attrs = super(ColumnDataSource, self)._to_json_like(include_defaults=include_defaults)
         if 'data' in attrs:
-            attrs['data'] = transform_column_source_data(attrs['data'])
+            attrs['data'] = transform_column_source_data(attrs['data'], buffers=buffers)
         return attrs
 
     def remove(self, name):
@@ -251,6 +251,284 @@ class ColumnDataSource(DataSource):
 
         self.data._stream(self.document, self, new_data, rollover)
 
+    def patch(self, patches):
+        """ Efficiently update data source columns at specific locations.
+
+        Unlike assigning a new ``data`` value, only the changed elements
+        are sent to BokehJS.
+
+        Args:
+            patches (dict[str, list[tuple]]) : a mapping of column names to
+                lists of ``(index, new_value)`` tuples, where ``index`` may
+                be a non-negative integer or a slice with non-negative
+                bounds. For a slice, ``new_value`` must be a sequence of the
+                same length as the slice.
+
+                For example::
+
+                    source.patch({
+                        'foo' : [ (0, 10), (slice(2, 4), [20, 21]) ],
+                        'bar' : [ (5, 'new') ],
+                    })
+
+        Returns:
+            None
+
+        """
+        _check_patches(patches, self.data)
+        self.data._patch(self.document, self, patches)
+
+def _check_patches(patches, data):
+    # raise a ValueError if patches aren't valid for data
+    import numpy as np
+
+    extra = set(patches.keys()) - set(data.keys())
+    if extra:
+        raise ValueError("Can only patch existing columns (extra: %s)" % ", ".join(sorted(extra)))
+
+    for name, patch in patches.items():
+        length = len(data[name])
+        for ind, value in patch:
+            if isinstance(ind, slice):
+                if any(x is not None and x < 0 for x in (ind.start, ind.stop, ind.step)) or ind.step == 0:
+                    raise ValueError("Patch slices must have non-negative bounds and a positive step, got %r" % (ind,))
+                n = len(range(*ind.indices(length)))
+                if len(value) != n:
+                    raise ValueError("Patch for column %s has %d values for a slice of length %d" % (name, len(value), n))
+            elif isinstance(ind, (int, np.integer)) and not isinstance(ind, (bool, np.bool_)):
+                if not 0 <= ind < length:
+                    raise ValueError("Out-of bounds index (%d) in patch for column: %s" % (ind, name))
+            else:
+                raise ValueError("Patch indices must be integers or slices, got %r" % (ind,))
+
+class DownsampledDataSource(ColumnDataSource):
+    """ A ColumnDataSource that keeps the full data in Python, and sends
+    only a downsampled view of the part of it that is in ``x_range`` to
+    BokehJS.
+
+    When the start or end of ``x_range`` changes, for example when a plot
+    in a Bokeh server application is panned or zoomed, the view is
+    recomputed from the full data, so that series with far more points
+    than can be sent to a browser can be explored interactively::
+
+        source = DownsampledDataSource(data=dict(x=x, y=y), x_range=plot.x_range)
+        plot.line('x', 'y', source=source)
+
+    The full data are the ``data`` the source was created with, or the
+    last ``data`` given to ``set_full_data()``. The ``data`` property holds
+    the view. The ``x`` column must be sorted in increasing order, and
+    each column is converted to a NumPy array.
+
+    .. note::
+        The full data are not part of the Document, so a copy of the
+        Document, e.g. one created with ``Document.from_json()``, only
+        has the view. Copies made for new sessions by
+        ``bokeh serve --clone-documents`` share the full data.
+
+    """
+
+    __subtype__ = "DownsampledDataSource"
+    __view_model__ = "ColumnDataSource"
+
+    x_range = Instance(".models.ranges.Range", help="""
+    The range to show the data in. If None, the view covers all the data.
+    """)
+
+    x = String("x", help="""
+    The name of the column with the x-coordinates of the data.
+    """)
+
+    y = String("y", help="""
+    The name of the column with the y-coordinates of the data, used to
+    choose the points to keep with the ``"minmax"`` and ``"lttb"`` methods.
+    """)
+
+    method = Enum("minmax", "lttb", "stride", help="""
+    How to choose the points to keep:
+
+    * ``"minmax"`` keeps the lowest and highest point of each of
+      ``max_points / 2`` buckets of consecutive points
+    * ``"lttb"`` keeps the points chosen by the Largest Triangle Three
+      Buckets algorithm, which follows the shape of a line more closely,
+      but takes longer
+    * ``"stride"`` keeps evenly spaced points, which is fastest, but may
+      miss peaks
+
+    """)
+
+    max_points = Int(2000, help="""
+    The most points to send to BokehJS, at least 4. About twice the width
+    of the plot in pixels is enough for lines to look the same as with all
+    the points.
+    """)
+
+    def __init__(self, *args, **kw):
+        self._full_data = None
+        self._x_values = None
+        self._view_pending = False
+        if len(args) == 1 and "data" not in kw:
+            kw["data"] = args[0]
+            args = ()
+        full_data = kw.pop("data", {})
+        super(DownsampledDataSource, self).__init__(*args, **kw)
+        self.set_full_data(full_data)
+
+    @property
+    def full_data(self):
+        """ The full data, as a dict of NumPy arrays. """
+        return self._full_data
+
+    def set_full_data(self, data):
+        """ Replace all the data of this data source, and update the view.
+
+        Args:
+            data (dict or DataFrame) : the new columns of data
+
+        Returns:
+            None
+
+        """
+        import numpy as np
+
+        if pd and isinstance(data, pd.DataFrame):
+            data = self._data_from_df(data)
+        if not isinstance(data, dict):
+            raise ValueError("expected a dict or pandas.DataFrame, got %s" % data)
+        data = dict((name, np.asarray(column)) for name, column in data.items())
+        lengths = set(len(column) for column in data.values())
+        if len(lengths) > 1:
+            raise ValueError("All columns must be the same length")
+
+        self._full_data = data
+        self._x_values = None
+        self.column_names = list(data.keys())
+        self._update_view()
+
+    def stream(self, new_data, rollover=None):
+        """ Append data to the full data, and update the view.
+
+        Unlike ``ColumnDataSource.stream()``, this sends the whole view to
+        BokehJS, and copies the full data.
+
+        """
+        import numpy as np
+
+        if set(new_data.keys()) != set(self._full_data.keys()):
+            raise ValueError("Must stream updates to all existing columns (got: %s, expected: %s)" %
+                             (", ".join(sorted(new_data.keys())), ", ".join(sorted(self._full_data.keys()))))
+        data = {}
+        for name, column in self._full_data.items():
+            data[name] = np.concatenate([column, np.asarray(new_data[name])])
+            if rollover is not None:
+                data[name] = data[name][-rollover:]
+        self.set_full_data(data)
+
+    def patch(self, patches):
+        """ Update the full data at specific locations, and update the view.
+
+        Patches are given as for ``ColumnDataSource.patch()``, but index
+        the full data. Unlike ``ColumnDataSource.patch()``, this sends the
+        whole view to BokehJS, and copies the patched columns.
+
+        """
+        _check_patches(patches, self._full_data)
+        data = dict(self._full_data)
+        for name, patch in patches.items():
+            # copy, because the arrays may be shared with copies of this source
+            column = data[name] = data[name].copy()
+            for ind, value in patch:
+                column[ind] = value
+        self.set_full_data(data)
+
+    def _copy_to_clone(self, clone):
+        # called by Document._clone_into, which doesn't run __init__ for
+        # clones. The full data arrays are never modified in place, so
+        # they are shared.
+        clone._full_data = dict(self._full_data)
+        clone._x_values = self._x_values
+        clone._view_pending = False
+
+    def trigger(self, attr, old, new, hint=None):
+        super(DownsampledDataSource, self).trigger(attr, old, new, hint)
+        if attr == "x_range":
+            if old is not None:
+                old.remove_on_change('start', self._range_changed)
+                old.remove_on_change('end', self._range_changed)
+            if new is not None:
+                new.on_change('start', self._range_changed)
+                new.on_change('end', self._range_changed)
+        if attr == "x":
+            self._x_values = None
+        if attr in ("x_range", "x", "y", "method", "max_points"):
+            self._view_changed()
+
+    def _range_changed(self, attr, old, new):
+        self._view_changed()
+
+    def _view_changed(self):
+        # when served, the start and end of the range usually change
+        # together, so compute the view once after both have changed
+        doc = self.document
+        if doc is None or doc.session_context is None:
+            self._update_view()
+        elif not self._view_pending:
+            self._view_pending = True
+            doc.add_next_tick_callback(self._update_view)
+
+    def _update_view(self):
+        from ..util import downsample
+
+        self._view_pending = False
+        data = self._full_data
+        if data is None:
+            # still being initialized
+            return
+        if not data:
+            self.data = {}
+            return
+
+        x = self._x_coordinates()
+        start, end = None, None
+        if self.x_range is not None:
+            start = _range_value(getattr(self.x_range, 'start', None))
+            end = _range_value(getattr(self.x_range, 'end', None))
+        lo, hi = downsample.visible_slice(x, start, end)
+
+        if self.method == "stride":
+            indices = downsample.stride_indices(lo, hi, self.max_points)
+        elif self.method == "minmax":
+            indices = downsample.minmax_indices(data[self.y], lo, hi, self.max_points)
+        else:
+            indices = downsample.lttb_indices(x, data[self.y], lo, hi, self.max_points)
+
+        if len(indices) == hi - lo:
+            self.data = dict((name, column[lo:hi]) for name, column in data.items())
+        else:
+            self.data = dict((name, column[indices]) for name, column in data.items())
+
+    def _x_coordinates(self):
+        # the x column as floats, in the units of ranges, e.g. milliseconds
+        # since epoch for datetimes
+        import numpy as np
+
+        if self._x_values is None:
+            x = self._full_data[self.x]
+            if x.dtype.kind == 'M':
+                x = x.astype('datetime64[us]').view(np.int64) / 1000.0
+            self._x_values = x
+        return self._x_values
+
+def _range_value(value):
+    # the start or end of a range, in milliseconds since epoch for datetimes
+    import calendar
+    import datetime as dt
+
+    if isinstance(value, dt.datetime):
+        return calendar.timegm(value.utctimetuple()) * 1000. + value.microsecond / 1000.
+    elif isinstance(value, dt.date):
+        return calendar.timegm(value.timetuple()) * 1000.
+    return value
+
 class GeoJSONDataSource(ColumnDataSource):
 
     geojson = JSON(help="""
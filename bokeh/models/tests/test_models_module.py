@@ -0,0 +1,44 @@
+from __future__ import absolute_import
+
+from importlib import import_module
+import subprocess
+import sys
+
+import bokeh.models as models
+
+
+def _run(code):
+    return subprocess.check_output([sys.executable, '-c', code], stderr=subprocess.STDOUT).decode().strip()
+
+
+def test_models_by_submodule_is_complete():
+    for submodule, names in models._models_by_submodule.items():
+        module = import_module('bokeh.models.' + submodule)
+        defined = [name for name, value in vars(module).items()
+                   if not name.startswith('_') and isinstance(value, type) and value.__module__ == module.__name__]
+        assert sorted(names) == sorted(defined), submodule
+
+
+def test_models_are_attributes():
+    from bokeh.models.glyphs import Line
+    from bokeh.models.widgets.inputs import Slider
+    assert models.Line is Line
+    assert models.Slider is Slider
+    assert 'Slider' in models.__all__
+    assert 'Slider' in dir(models)
+
+
+def test_submodules_are_imported_lazily():
+    out = _run("import sys; from bokeh.models import Plot; "
+               "print(sorted(m for m in sys.modules if m.startswith('bokeh.models.widgets')))")
+    assert out.splitlines()[-1] == "[]"
+
+
+def test_get_class_imports_all_models():
+    out = _run("from bokeh.model import Model; print(Model.get_class('Slider').__module__)")
+    assert out.splitlines()[-1] == "bokeh.models.widgets.inputs"
+
+
+def test_star_import():
+    out = _run("from bokeh.models import *; print(Slider.__name__, Plot.__name__, Float.__name__)")
+    assert out.splitlines()[-1] == "Slider Plot Float"
@@ -11,7 +11,9 @@ try:
 except ImportError as e:
     is_pandas = False
 
-from bokeh.models.sources import DataSource, ColumnDataSource
+from bokeh.document import Document
+from bokeh.models.ranges import Range1d
+from bokeh.models.sources import DataSource, ColumnDataSource, DownsampledDataSource
 
 class TestColumnDataSource(unittest.TestCase):
 
@@ -122,5 +124,177 @@ class TestColumnDataSource(unittest.TestCase):
         self.assertEqual(stuff['args'], ("doc", ds, dict(a=[11, 12], b=[21, 22]), "foo"))
         self.assertEqual(stuff['kw'], {})
 
+    def test_stream_arrays(self):
+        ds = ColumnDataSource(data=dict(a=np.array([0, 1]), b=[0, 1]))
+        ds.stream(dict(a=np.array([2, 3]), b=[2, 3]))
+        self.assertTrue(np.array_equal(ds.data['a'], [0, 1, 2, 3]))
+        self.assertEqual(ds.data['b'], [0, 1, 2, 3])
+        ds.stream(dict(a=[4.5], b=[4]))
+        self.assertEqual(ds.data['a'].dtype, np.float64)
+        self.assertTrue(np.array_equal(ds.data['a'], [0, 1, 2, 3, 4.5]))
+
+    def test_stream_arrays_rollover(self):
+        ds = ColumnDataSource(data=dict(a=np.arange(3.0)))
+        for i in range(100):
+            ds.stream(dict(a=np.array([i, i + 0.5])), rollover=5)
+            expected = np.concatenate([np.arange(3.0)] + [np.array([j, j + 0.5]) for j in range(i + 1)])[-5:]
+            self.assertTrue(np.array_equal(ds.data['a'], expected))
+
+    def test_stream_arrays_does_not_modify_old_values(self):
+        original = np.arange(4.0)
+        ds = ColumnDataSource(data=dict(a=original))
+        seen = []
+        for i in range(50):
+            seen.append((ds.data['a'], ds.data['a'].copy()))
+            ds.stream(dict(a=np.array([i])), rollover=4)
+        self.assertTrue(np.array_equal(original, np.arange(4.0)))
+        for value, copy in seen:
+            self.assertTrue(np.array_equal(value, copy))
+
+    def test_stream_arrays_after_column_replaced(self):
+        ds = ColumnDataSource(data=dict(a=np.arange(3)))
+        ds.stream(dict(a=[3]))
+        ds.data['a'] = np.arange(2)
+        ds.stream(dict(a=[2]))
+        self.assertTrue(np.array_equal(ds.data['a'], [0, 1, 2]))
+
+    def test_stream_old_value_for_callbacks(self):
+        ds = ColumnDataSource(data=dict(a=np.arange(3)))
+        changes = []
+        def cb(attr, old, new):
+            changes.append((old['a'].copy(), new['a'].copy()))
+        ds.on_change('data', cb)
+        ds.stream(dict(a=[3]), rollover=3)
+        self.assertEqual(len(changes), 1)
+        self.assertTrue(np.array_equal(changes[0][0], [0, 1, 2]))
+        self.assertTrue(np.array_equal(changes[0][1], [1, 2, 3]))
+
+    def test_patch_bad_data(self):
+        ds = ColumnDataSource(data=dict(a=[10, 11], b=[20, 21]))
+        with self.assertRaises(ValueError) as cm:
+            ds.patch(dict(c=[(0, 100)]))
+        self.assertEqual(str(cm.exception), "Can only patch existing columns (extra: c)")
+        with self.assertRaises(ValueError) as cm:
+            ds.patch(dict(a=[(2, 100)]))
+        self.assertEqual(str(cm.exception), "Out-of bounds index (2) in patch for column: a")
+        with self.assertRaises(ValueError) as cm:
+            ds.patch(dict(a=[(-1, 100)]))
+        self.assertEqual(str(cm.exception), "Out-of bounds index (-1) in patch for column: a")
+        with self.assertRaises(ValueError) as cm:
+            ds.patch(dict(a=[(slice(0, 2), [1])]))
+        self.assertEqual(str(cm.exception), "Patch for column a has 1 values for a slice of length 2")
+        with self.assertRaises(ValueError):
+            ds.patch(dict(a=[(slice(-2, None), [1, 2])]))
+        with self.assertRaises(ValueError):
+            ds.patch(dict(a=[("0", 100)]))
+        self.assertEqual(ds.data, dict(a=[10, 11], b=[20, 21]))
+
+    def test_patch_good_data(self):
+        ds = ColumnDataSource(data=dict(a=[10, 11, 12], b=np.array([20, 21, 22])))
+        ds.patch(dict(a=[(0, 100), (np.int64(2), 120)], b=[(slice(1, 3), [210, 220])]))
+        self.assertEqual(ds.data['a'], [100, 11, 120])
+        self.assertTrue(np.array_equal(ds.data['b'], [20, 210, 220]))
+
+class TestDownsampledDataSource(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.arange(10000, dtype=np.float64)
+        self.y = np.sin(self.x / 100)
+
+    def test_small_data_is_not_downsampled(self):
+        ds = DownsampledDataSource(dict(x=[1, 2, 3], y=[4, 5, 6]))
+        self.assertTrue(isinstance(ds, ColumnDataSource))
+        self.assertTrue(np.array_equal(ds.data['x'], [1, 2, 3]))
+        self.assertTrue(np.array_equal(ds.full_data['y'], [4, 5, 6]))
+        self.assertEqual(set(ds.column_names), set(['x', 'y']))
+
+    def test_downsampled(self):
+        for method in ("minmax", "lttb", "stride"):
+            ds = DownsampledDataSource(data=dict(x=self.x, y=self.y), method=method, max_points=100)
+            self.assertTrue(len(ds.data['x']) <= 100)
+            self.assertEqual(ds.data['x'][0], 0)
+            self.assertEqual(ds.data['x'][-1], 9999)
+            self.assertTrue(np.array_equal(ds.data['y'], np.sin(ds.data['x'] / 100)))
+
+    def test_minmax_keeps_extremes(self):
+        self.y[1234] = 10
+        ds = DownsampledDataSource(data=dict(x=self.x, y=self.y), max_points=100)
+        self.assertIn(1234, ds.data['x'])
+
+    def test_range_changes(self):
+        r = Range1d(0, 10000)
+        ds = DownsampledDataSource(data=dict(x=self.x, y=self.y), x_range=r, max_points=100)
+        self.assertEqual(len(ds.data['x']), 100)
+        r.start = 1000
+        r.end = 1010
+        self.assertTrue(np.array_equal(ds.data['x'], np.arange(999, 1012)))
+
+        ds.x_range = None
+        r.start = 2000
+        self.assertEqual(ds.data['x'][0], 0)
+
+    def test_view_is_updated_once_per_tick_when_served(self):
+        r = Range1d(0, 10000)
+        ds = DownsampledDataSource(data=dict(x=self.x, y=self.y), x_range=r)
+        doc = Document()
+        doc.add_root(ds)
+        doc._session_context = object()
+        r.start = 1000
+        r.end = 1010
+        self.assertEqual(len(doc.session_callbacks), 1)
+        self.assertEqual(ds.data['x'][0], 0)
+        doc.session_callbacks[0].callback()
+        self.assertTrue(np.array_equal(ds.data['x'], np.arange(999, 1012)))
+
+    def test_datetimes(self):
+        import datetime as dt
+        x = np.arange('2016-01-01', '2016-02-01', dtype='datetime64[h]')
+        r = Range1d(dt.datetime(2016, 1, 10), dt.datetime(2016, 1, 11))
+        ds = DownsampledDataSource(data=dict(x=x, y=np.arange(len(x))), x_range=r)
+        self.assertEqual(len(ds.data['x']), 27)
+        self.assertEqual(ds.data['x'][0], np.datetime64('2016-01-09T23'))
+
+    def test_stream(self):
+        ds = DownsampledDataSource(data=dict(x=[1, 2, 3], y=[4, 5, 6]))
+        ds.stream(dict(x=[4], y=[7]), rollover=3)
+        self.assertTrue(np.array_equal(ds.full_data['x'], [2, 3, 4]))
+        self.assertTrue(np.array_equal(ds.data['y'], [5, 6, 7]))
+        with self.assertRaises(ValueError):
+            ds.stream(dict(x=[5]))
+
+    def test_patch(self):
+        ds = DownsampledDataSource(data=dict(x=self.x, y=self.y), max_points=100)
+        full_y = ds.full_data['y']
+        ds.patch(dict(y=[(1234, 10.0), (slice(0, 2), [5.0, 6.0])]))
+        self.assertEqual(ds.full_data['y'][1234], 10)
+        self.assertEqual(list(ds.full_data['y'][:2]), [5, 6])
+        self.assertIn(1234, ds.data['x'])
+        # the old full data is not modified
+        self.assertEqual(full_y[1234], self.y[1234])
+        with self.assertRaises(ValueError):
+            ds.patch(dict(y=[(10000, 1.0)]))
+        with self.assertRaises(ValueError):
+            ds.patch(dict(z=[(0, 1.0)]))
+
+    def test_clone(self):
+        doc = Document()
+        doc.add_root(DownsampledDataSource(data=dict(x=self.x, y=self.y), max_points=100))
+        doc2 = Document()
+        doc._clone_into(doc2)
+        ds = doc2.roots[0]
+        self.assertTrue(ds.full_data['x'] is doc.roots[0].full_data['x'])
+        ds.max_points = 10
+        self.assertEqual(len(ds.data['x']), 10)
+        self.assertEqual(len(doc.roots[0].data['x']), 100)
+        ds.stream(dict(x=[10000], y=[0]))
+        self.assertEqual(len(ds.full_data['x']), 10001)
+        self.assertEqual(len(doc.roots[0].full_data['x']), 10000)
+
+    def test_bad_data(self):
+        with self.assertRaises(ValueError):
+            DownsampledDataSource(data=dict(x=[1, 2], y=[1]))
+        with self.assertRaises(ValueError):
+            DownsampledDataSource(data=dict(x=self.x, y=self.y), max_points=3)
+
 if __name__ == "__main__":
     unittest.main()
@@ -3,12 +3,14 @@ from __future__ import absolute_import, print_function
 import logging
 logger = logging.getLogger(__name__)
 
+from contextlib import contextmanager
+
 from ..io import curdoc, curstate
 from ..models import Axis, Grid, Legend, Plot
 from ..models import glyphs, markers
 from .helpers import (
     _list_attr_splat, _get_range, _process_axis_and_grid,
-    _process_tools_arg, _glyph_function
+    _process_tools_arg, _glyph_function, _add_glyph_renderers
 )
 
 DEFAULT_TOOLS = "pan,wheel_zoom,box_zoom,save,resize,reset,help"
@@ -22,6 +24,10 @@ class Figure(Plot):
     __subtype__ = "Figure"
     __view_model__ = "Plot"
 
+    # (GlyphRenderer, legend items) for glyphs added in batch(); a class
+    # attribute, so that copies made without __init__ have it too
+    _glyph_batch = None
+
     def __init__(self, *arg, **kw):
 
         tools = kw.pop("tools", DEFAULT_TOOLS)
@@ -52,6 +58,44 @@ class Figure(Plot):
         tool_objs = _process_tools_arg(self, tools)
         self.add_tools(*tool_objs)
 
+    @contextmanager
+    def batch(self):
+        """ Add all the glyphs created in a ``with`` block to this Figure at
+        once, when the block ends.
+
+        Every glyph method call normally replaces the ``renderers`` of this
+        Figure and of its box select tools, and the legends of its legend,
+        with a copy that has one more item, which has to be validated and
+        triggers change events. Adding many glyphs in a batch makes one
+        such change to each list instead.
+
+        The glyph methods still return their GlyphRenderer right away, but
+        it isn't in ``renderers`` before the block ends.
+
+        Examples:
+
+            .. code-block:: python
+
+                p = figure()
+                with p.batch():
+                    for x, y in lines:
+                        p.line(x, y)
+
+        """
+        if self._glyph_batch is not None:
+            # already in a batch, which adds the glyphs when it ends
+            yield
+            return
+        self._glyph_batch = batch = []
+        try:
+            yield
+        finally:
+            self._glyph_batch = None
+            if batch:
+                _add_glyph_renderers(self,
+                                     [glyph_renderer for glyph_renderer, _ in batch],
+                                     [item for _, legend_items in batch for item in legend_items])
+
     def _axis(self, *sides):
         objs = []
         for s in sides:
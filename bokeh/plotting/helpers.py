@@ -4,6 +4,7 @@ from collections import Iterable, OrderedDict, Sequence
 import difflib
 import itertools
 import re
+from types import MethodType
 import warnings
 
 import numpy as np
@@ -130,7 +131,7 @@ def _make_glyph(glyphclass, kws, extra):
         kws.update(extra)
         return glyphclass(**kws)
 
-def _update_legend(plot, legend_name, glyph_renderer):
+def _update_legend(plot, legend_items):
     legends = plot.select(type=Legend)
     if not legends:
         legend = Legend(plot=plot)
@@ -143,9 +144,23 @@ def _update_legend(plot, legend_name, glyph_renderer):
     else:
         raise RuntimeError("Plot %s configured with more than one legend renderer" % plot)
     specs = OrderedDict(legend.legends)
-    specs.setdefault(legend_name, []).append(glyph_renderer)
+    for legend_name, glyph_renderer in legend_items:
+        specs.setdefault(legend_name, []).append(glyph_renderer)
     legend.legends = list(specs.items())
 
+def _add_glyph_renderers(plot, glyph_renderers, legend_items):
+    if legend_items:
+        _update_legend(plot, legend_items)
+
+    for tool in plot.select(type=BoxSelectTool):
+        # this awkward syntax is needed to go through Property.__set__ and
+        # therefore trigger a change event. With improvements to Property
+        # we might be able to use a more natural append() or +=
+        tool.renderers = tool.renderers + glyph_renderers
+
+    # awkward syntax for same reason mentioned above
+    plot.renderers = plot.renderers + glyph_renderers
+
 def _get_range(range_input):
     if range_input is None:
         return DataRange1d()
@@ -402,21 +417,50 @@ def _glyph_function(glyphclass, extra_docs=None):
                                        hover_glyph=hglyph,
                                        **renderer_kws)
 
-        if legend_name:
-            _update_legend(self, legend_name, glyph_renderer)
-
-        for tool in self.select(type=BoxSelectTool):
-            # this awkward syntax is needed to go through Property.__set__ and
-            # therefore trigger a change event. With improvements to Property
-            # we might be able to use a more natural append() or +=
-            tool.renderers = tool.renderers + [glyph_renderer]
-
-        # awkward syntax for same reason mentioned above
-        self.renderers = self.renderers + [glyph_renderer]
+        legend_items = [(legend_name, glyph_renderer)] if legend_name else []
+        batch = getattr(self, '_glyph_batch', None)
+        if batch is not None:
+            # added when the batch ends, see Figure.batch()
+            batch.append((glyph_renderer, legend_items))
+        else:
+            _add_glyph_renderers(self, [glyph_renderer], legend_items)
         return glyph_renderer
 
     func.__name__ = glyphclass.__view_model__
 
+    return _GlyphFunction(func, glyphclass, extra_docs)
+
+class _GlyphFunction(object):
+    """ A glyph method for Figure. Its docstring lists every property of
+    the glyph, and is only generated when it is first looked at, since
+    doing that for every glyph takes a while.
+
+    """
+    def __init__(self, func, glyphclass, extra_docs):
+        self._func = func
+        self._glyphclass = glyphclass
+        self._extra_docs = extra_docs
+        self.__name__ = func.__name__
+        self.__module__ = func.__module__
+        # for inspect.signature()
+        self.__wrapped__ = func
+
+    def __call__(self, *args, **kwargs):
+        return self._func(*args, **kwargs)
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        # the bound method gets its docstring from self
+        return MethodType(self, obj)
+
+    @property
+    def __doc__(self):
+        if self._func.__doc__ is None:
+            self._func.__doc__ = _glyph_docstring(self._glyphclass, self._extra_docs)
+        return self._func.__doc__
+
+def _glyph_docstring(glyphclass, extra_docs=None):
     arglines = []
     for arg in glyphclass._args:
         spec = getattr(glyphclass, arg)
@@ -436,8 +480,8 @@ def _glyph_function(glyphclass, extra_docs=None):
             desc = ""
         kwlines.append(_arg_template % (kw, typ, desc, spec.class_default(glyphclass)))
 
-    func.__doc__ = _doc_template  % (glyphclass.__name__, "\n".join(arglines), "\n".join(kwlines))
+    doc = _doc_template  % (glyphclass.__name__, "\n".join(arglines), "\n".join(kwlines))
 
     if extra_docs:
-        func.__doc__ += extra_docs
-    return func
+        doc += extra_docs
+    return doc
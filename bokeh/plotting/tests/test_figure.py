@@ -2,7 +2,7 @@ from __future__ import absolute_import
 import unittest
 
 from bokeh.models import (
-    LinearAxis, PanTool, BoxZoomTool, LassoSelectTool, ResetTool, ResizeTool)
+    BoxSelectTool, LinearAxis, PanTool, BoxZoomTool, LassoSelectTool, ResetTool, ResizeTool)
 
 import bokeh.plotting as plt
 
@@ -220,5 +220,36 @@ class TestMarkers(unittest.TestCase):
         with self.assertRaises(ValueError):
             p.circle([1, 2, 3], [1, 2, 3], level="bad_input")
 
+    def test_batch(self):
+        p = plt.figure(tools="box_select")
+        tool = p.select_one(dict(type=BoxSelectTool))
+        changes = []
+        p.on_change('renderers', lambda attr, old, new: changes.append(attr))
+        tool.on_change('renderers', lambda attr, old, new: changes.append(attr))
+
+        with p.batch():
+            r1 = p.circle([1, 2, 3], [1, 2, 3], legend="a")
+            with p.batch():
+                r2 = p.line([1, 2, 3], [1, 2, 3], legend="b")
+            r3 = p.circle([1, 2, 3], [1, 2, 3], legend="a")
+            self.assertNotIn(r1, p.renderers)
+            self.assertEqual(changes, [])
+
+        self.assertEqual(p.renderers[-3:], [r1, r2, r3])
+        self.assertEqual(tool.renderers, [r1, r2, r3])
+        self.assertEqual(p.legend[0].legends, [("a", [r1, r3]), ("b", [r2])])
+        # one change for the tool, and one each for the legend and the glyphs
+        self.assertEqual(len(changes), 3)
+
+        r4 = p.circle([1, 2, 3], [1, 2, 3])
+        self.assertEqual(p.renderers[-1], r4)
+
+    def test_glyph_docstring(self):
+        p = plt.figure()
+        self.assertTrue(plt.Figure.circle.__doc__.startswith(" Configure and add Circle glyphs to this Figure."))
+        self.assertIn("fill_color", p.circle.__doc__)
+        self.assertIn("plot.x(x=[1, 2, 3]", p.x.__doc__)
+        self.assertEqual(p.circle.__name__, "Circle")
+
 if __name__ == "__main__":
     unittest.main()
@@ -16,6 +16,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 import json
+import os
 from os.path import basename, join, relpath
 import re
 
@@ -143,6 +144,25 @@ _component_filter = {
     'css': ['bokeh-compiler'],
 }
 
+# the contents of inlined BokehJS files, by path, with the modification
+# time of the file when it was read
+_inline_files = {}
+
+# rendered JS_RESOURCES and CSS_RESOURCES templates, by template name and
+# variables. All inline resources use the same few distinct values, that
+# take a while to render because they are large.
+_rendered_resources = {}
+_max_rendered_resources = 16
+
+def _render_resources(template, **variables):
+    key = (template.name,) + tuple((name, tuple(value)) for name, value in sorted(variables.items()))
+    rendered = _rendered_resources.get(key)
+    if rendered is None:
+        if len(_rendered_resources) >= _max_rendered_resources:
+            _rendered_resources.clear()
+        rendered = _rendered_resources[key] = template.render(**variables)
+    return rendered
+
 def _get_cdn_urls(components, version=None, minified=True):
     if version is None:
         if settings.docs_cdn():
@@ -303,6 +323,14 @@ class BaseResources(object):
         return (files, raw)
 
     def _inline(self, path):
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            mtime = None
+        cached = _inline_files.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
         begin = "/* BEGIN %s */" % basename(path)
         try:
             with open(path, 'rb') as f:
@@ -310,7 +338,9 @@ class BaseResources(object):
         except IOError:
             middle = ""
         end = "/* END %s */"  % basename(path)
-        return "%s\n%s\n%s" % (begin, middle, end)
+        inline = "%s\n%s\n%s" % (begin, middle, end)
+        _inline_files[path] = (mtime, inline)
+        return inline
 
 class JSResources(BaseResources):
     ''' The Resources class encapsulates information relating to loading or embedding Bokeh Javascript.
@@ -467,7 +497,7 @@ class JSResources(BaseResources):
         return self._plugin_template % dict(exports=exports, models=models)
 
     def render_js(self):
-        return JS_RESOURCES.render(js_raw=self.js_raw, js_files=self.js_files)
+        return _render_resources(JS_RESOURCES, js_raw=self.js_raw, js_files=self.js_files)
 
 class CSSResources(BaseResources):
     ''' The CSSResources class encapsulates information relating to loading or embedding Bokeh client-side CSS.
@@ -529,7 +559,7 @@ class CSSResources(BaseResources):
         return [ json.dumps(css) for css in self.css_raw ]
 
     def render_css(self):
-        return CSS_RESOURCES.render(css_raw=self.css_raw, css_files=self.css_files)
+        return _render_resources(CSS_RESOURCES, css_raw=self.css_raw, css_files=self.css_files)
 
 class Resources(JSResources, CSSResources):
     ''' The Resources class encapsulates information relating to loading or
@@ -6,6 +6,8 @@ from __future__ import absolute_import
 import logging
 log = logging.getLogger(__name__)
 
+from collections import OrderedDict
+
 from tornado import gen
 
 from .session import ServerSession
@@ -13,8 +15,14 @@ from .exceptions import ProtocolError
 
 from bokeh.application.application import ServerContext, SessionContext
 from bokeh.document import Document
+from bokeh.io import _thread_local_curdoc
 from bokeh.util.tornado import _CallbackGroup, yield_for_all_futures
 
+def _initialize_document_in_executor(application, doc):
+    # curdoc() on this worker thread must not disturb the IO loop thread
+    with _thread_local_curdoc():
+        application.initialize_document(doc)
+
 class BokehServerContext(ServerContext):
     def __init__(self, application_context):
         self.application_context = application_context
@@ -52,12 +60,16 @@ class BokehServerContext(ServerContext):
     def remove_periodic_callback(self, callback):
         self._callbacks.remove_periodic_callback(callback)
 
+    def run_in_executor(self, func, *args, **kwargs):
+        return self.application_context.run_in_executor(func, *args, **kwargs)
+
 class BokehSessionContext(SessionContext):
     def __init__(self, session_id, server_context, document):
         self._document = document
         self._session = None
         super(BokehSessionContext, self).__init__(server_context,
                                                   session_id)
+        document._session_context = self
 
     def _set_session(self, session):
         self._session = session
@@ -69,7 +81,10 @@ class BokehSessionContext(SessionContext):
             # we have exclusive access
             yield yield_for_all_futures(func(self._document))
         else:
-            self._session.with_document_locked(func, self._document)
+            yield self._session.with_document_locked(func, self._document)
+
+    def run_in_executor(self, func, *args, **kwargs):
+        return self._server_context.run_in_executor(func, *args, **kwargs)
 
     @property
     def destroyed(self):
@@ -85,19 +100,60 @@ class ApplicationContext(object):
         data specific to an "instance" of the application.
     '''
 
-    def __init__(self, application, develop=False, io_loop=None):
+    def __init__(self, application, develop=False, io_loop=None, executor=None,
+                 session_executor=None, session_pool_size=0, session_id_generator=None):
         self._application = application
         self._develop = develop
         self._loop = io_loop
+        self._executor = executor
+        self._session_executor = session_executor
         self._sessions = dict()
         self._pending_sessions = dict()
         self._session_contexts = dict()
         self._server_context = BokehServerContext(self)
 
+        if session_pool_size > 0 and session_id_generator is None:
+            raise ValueError("session_id_generator is needed to pre-initialize sessions")
+        self._session_pool_size = session_pool_size
+        self._session_id_generator = session_id_generator
+        # session id => (document, session context) for initialized
+        # documents that have not been handed out yet
+        self._session_pool = OrderedDict()
+        self._session_pool_filling = 0
+        self._session_pool_hits = 0
+        self._session_pool_misses = 0
+
     @property
     def io_loop(self):
         return self._loop
 
+    @property
+    def executor(self):
+        ''' The ``concurrent.futures`` executor that ``run_in_executor``
+        uses, or None.
+
+        '''
+        return self._executor
+
+    @property
+    def session_executor(self):
+        ''' The ``concurrent.futures`` executor that new session documents
+        are initialized with, or None to initialize them on the IO loop.
+
+        '''
+        return self._session_executor
+
+    @gen.coroutine
+    def run_in_executor(self, func, *args, **kwargs):
+        ''' Run ``func(*args, **kwargs)`` on the server's executor, off the
+        IO loop, and return a Future with its result.
+
+        '''
+        if self._executor is None:
+            raise RuntimeError("This server has no executor to run functions with")
+        result = yield self._executor.submit(func, *args, **kwargs)
+        raise gen.Return(result)
+
     @property
     def application(self):
         return self._application
@@ -114,6 +170,26 @@ class ApplicationContext(object):
     def sessions(self):
         return self._sessions.values()
 
+    @property
+    def session_pool_size(self):
+        ''' The number of initialized sessions to keep ready for new users. '''
+        return self._session_pool_size
+
+    @property
+    def session_pool_ready(self):
+        ''' The number of initialized sessions that are ready to hand out. '''
+        return len(self._session_pool)
+
+    @property
+    def session_pool_hits(self):
+        ''' The number of new sessions that were taken from the pool. '''
+        return self._session_pool_hits
+
+    @property
+    def session_pool_misses(self):
+        ''' The number of new sessions that were created because the pool was empty. '''
+        return self._session_pool_misses
+
     def run_load_hook(self):
         try:
             result = self._application.on_server_loaded(self._server_context)
@@ -134,6 +210,74 @@ class ApplicationContext(object):
 
         self._server_context._remove_all_callbacks()
 
+    @gen.coroutine
+    def _initialize_session(self, session_id):
+        doc = Document()
+
+        session_context = BokehSessionContext(session_id,
+                                              self._server_context,
+                                              doc)
+        try:
+            result = yield yield_for_all_futures(self._application.on_session_created(session_context))
+        except Exception as e:
+            log.error("Failed to run session creation hooks %r", e, exc_info=True)
+
+        if self._session_executor is None:
+            self._application.initialize_document(doc)
+        else:
+            # the IO loop keeps serving other sessions while the
+            # application code runs, other requests for this session
+            # wait on the pending session future below
+            yield self._session_executor.submit(_initialize_document_in_executor, self._application, doc)
+
+        raise gen.Return((doc, session_context))
+
+    def _start_session(self, session_id, doc, session_context):
+        session = ServerSession(session_id, doc, io_loop=self._loop)
+        self._sessions[session_id] = session
+        session_context._set_session(session)
+        self._session_contexts[session_id] = session_context
+        return session
+
+    @gen.coroutine
+    def fill_session_pool(self):
+        ''' Initialize sessions until the pool has ``session_pool_size``
+        sessions ready (or being initialized).
+
+        '''
+        while len(self._session_pool) + self._session_pool_filling < self._session_pool_size:
+            self._session_pool_filling += 1
+            try:
+                session_id = self._session_id_generator()
+                doc, session_context = yield self._initialize_session(session_id)
+                self._session_pool[session_id] = (doc, session_context)
+            except Exception as e:
+                log.error("Failed to pre-initialize a session %r", e, exc_info=True)
+                break
+            finally:
+                self._session_pool_filling -= 1
+
+        raise gen.Return(None)
+
+    @gen.coroutine
+    def create_new_session(self):
+        ''' Create a session with a newly generated id, taking an already
+        initialized one from the pool if one is ready.
+
+        '''
+        if self._session_pool_size > 0:
+            if self._session_pool:
+                self._session_pool_hits += 1
+                session_id, (doc, session_context) = self._session_pool.popitem(last=False)
+                session = self._start_session(session_id, doc, session_context)
+                self._loop.add_callback(self.fill_session_pool)
+                raise gen.Return(session)
+            self._session_pool_misses += 1
+            self._loop.add_callback(self.fill_session_pool)
+
+        session = yield self.create_session_if_needed(self._session_id_generator())
+        raise gen.Return(session)
+
     @gen.coroutine
     def create_session_if_needed(self, session_id):
         # this is because empty session_ids would be "falsey" and
@@ -141,27 +285,19 @@ class ApplicationContext(object):
         if len(session_id) == 0:
             raise ProtocolError("Session ID must not be empty")
 
+        if session_id in self._session_pool:
+            doc, session_context = self._session_pool.pop(session_id)
+            self._start_session(session_id, doc, session_context)
+            self._loop.add_callback(self.fill_session_pool)
+
         if session_id not in self._sessions and \
            session_id not in self._pending_sessions:
             future = self._pending_sessions[session_id] = gen.Future()
 
-            doc = Document()
-
-            session_context = BokehSessionContext(session_id,
-                                                  self._server_context,
-                                                  doc)
-            try:
-                result = yield yield_for_all_futures(self._application.on_session_created(session_context))
-            except Exception as e:
-                log.error("Failed to run session creation hooks %r", e, exc_info=True)
-
-            self._application.initialize_document(doc)
+            doc, session_context = yield self._initialize_session(session_id)
 
-            session = ServerSession(session_id, doc, io_loop=self._loop)
             del self._pending_sessions[session_id]
-            self._sessions[session_id] = session
-            session_context._set_session(session)
-            self._session_contexts[session_id] = session_context
+            session = self._start_session(session_id, doc, session_context)
 
             # notify anyone waiting on the pending session
             future.set_result(session)
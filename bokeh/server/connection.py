@@ -3,19 +3,65 @@
 '''
 from __future__ import absolute_import
 
+import logging
+log = logging.getLogger(__name__)
+
 import codecs
 
+from tornado import gen
+
+from bokeh.document import _ChangedProperties, _coalesce_events
+
+# what to do with document changes for a client that is too far behind
+SLOW_CLIENT_POLICIES = ('coalesce', 'resync', 'disconnect')
+
+# how many document changes to hold back for a slow client by default
+DEFAULT_SLOW_CLIENT_MAX_HELD_EVENTS = 10000
+
 class ServerConnection(object):
     ''' Wraps a websocket connection to a client.
+
+    If more than ``max_queued_bytes`` written to the websocket are still
+    waiting to go out over the network when the session's document
+    changes, the client is falling behind, and ``slow_client_policy``
+    decides what happens to the change:
+
+    * ``'coalesce'`` holds the changes back until the client catches up,
+      then sends them in one PATCH-DOC, with repeated changes to the same
+      property collapsed and streamed data merged
+    * ``'resync'`` holds the changes back like ``'coalesce'``, but then
+      sends the current value of every changed property instead of any
+      streamed or patched data
+    * ``'disconnect'`` closes the connection
+
+    Held changes are coalesced as they arrive, so they only grow with the
+    number of properties that changed (and of patches, with ``'coalesce'``).
+    If more than ``max_held_events`` changes would be held, the connection
+    is closed as with ``'disconnect'``.
+
     '''
 
-    def __init__(self, protocol, socket, application_context, session):
+    # how often to check whether a client that is behind has caught up
+    _held_events_check_milliseconds = 100
+
+    def __init__(self, protocol, socket, application_context, session,
+                 max_queued_bytes=None, slow_client_policy='coalesce', max_held_events=None,
+                 io_loop=None):
+        if slow_client_policy not in SLOW_CLIENT_POLICIES:
+            raise ValueError("slow_client_policy must be one of %r, got %r" % (SLOW_CLIENT_POLICIES, slow_client_policy))
         self._protocol = protocol
         self._socket = socket
         self._application_context = application_context
         self._session = session
         self._session.subscribe(self)
         self._ping_count = 0
+        self._max_queued_bytes = max_queued_bytes
+        self._slow_client_policy = slow_client_policy
+        self._max_held_events = max_held_events
+        self._loop = io_loop
+        # document changes held back while the client is behind: a list of
+        # events with 'coalesce', and a _ChangedProperties with 'resync'
+        self._held_events = None
 
     @property
     def session(self):
@@ -25,11 +71,30 @@ class ServerConnection(object):
     def application_context(self):
         return self._application_context
 
+    @property
+    def queued_bytes(self):
+        ''' Number of bytes written to the client that are still waiting to
+        be sent over the network.
+
+        '''
+        return self._socket.queued_bytes
+
+    @property
+    def behind(self):
+        ''' Whether the client isn't keeping up with the messages sent to it. '''
+        return self._max_queued_bytes is not None and self.queued_bytes > self._max_queued_bytes
+
+    @property
+    def held_event_count(self):
+        ''' Number of document events held back until the client catches up. '''
+        return len(self._held_events) if self._held_events is not None else 0
+
     def detach_session(self):
         """Allow the session to be discarded and don't get change notifications from it anymore"""
         if self._session is not None:
             self._session.unsubscribe(self)
             self._session = None
+        self._held_events = None
 
     def ok(self, message):
         return self.protocol.create('OK', message.header['msgid'])
@@ -40,7 +105,77 @@ class ServerConnection(object):
     def send_patch_document(self, event):
         """ Sends a PATCH-DOC message, returning a Future that's completed when it's written out. """
         msg = self.protocol.create('PATCH-DOC', [event])
-        return self._socket.send_message(msg)
+        return self.send_message(msg)
+
+    def send_patch(self, message, events):
+        """ Sends a PATCH-DOC message created for the given document events,
+        unless the client is behind, in which case the slow client policy
+        applies. Returns a Future that's completed when the message is
+        written out or held back.
+
+        """
+        if self._held_events is None and not self.behind:
+            return self.send_message(message)
+
+        if self._slow_client_policy == 'disconnect':
+            log.warning("Closing connection to a client with %d bytes of messages still to send", self.queued_bytes)
+            self._close()
+        else:
+            if self._held_events is None:
+                log.debug("Holding back document changes from a client with %d bytes of messages still to send",
+                          self.queued_bytes)
+                self._check_held_events_later()
+            self._hold_events(events)
+            if self._max_held_events is not None and self.held_event_count > self._max_held_events:
+                log.warning("Closing connection to a client with more than %d held back document changes",
+                            self._max_held_events)
+                self._close()
+        return gen.maybe_future(None)
+
+    def _hold_events(self, events):
+        if self._slow_client_policy == 'resync':
+            if self._held_events is None:
+                self._held_events = _ChangedProperties()
+            for event in events:
+                self._held_events.add(event)
+        else:
+            self._held_events = _coalesce_events((self._held_events or []) + list(events))
+
+    def _close(self):
+        self._held_events = None
+        self._socket.close()
+
+    def _check_held_events_later(self):
+        self._loop.call_later(self._held_events_check_milliseconds / 1000.0, self._check_held_events)
+
+    def _check_held_events(self):
+        if self._held_events is None:
+            # detached from the session
+            return
+        if self.behind:
+            self._check_held_events_later()
+            return
+        self._loop.add_future(self._session.with_document_locked(self._send_held_events),
+                              lambda future: future.result())
+
+    def _send_held_events(self):
+        # called with the document locked, so that the current values
+        # that replace the held events are consistent
+        held = self._held_events
+        self._held_events = None
+        if held is None:
+            return
+        if self._slow_client_policy == 'resync':
+            events = held.events(self._session.document)
+        else:
+            # refresh the values of properties that were set
+            events = _coalesce_events(held)
+        log.debug("Sending %d held back document changes to a client that caught up", len(events))
+        self.send_message(self.protocol.create('PATCH-DOC', events))
+
+    def send_message(self, message):
+        """ Sends an already created message, returning a Future that's completed when it's written out. """
+        return self._socket.send_message(message)
 
     def send_ping(self):
         self._socket.ping(codecs.encode(str(self._ping_count), "utf-8"))
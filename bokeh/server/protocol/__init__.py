@@ -45,13 +45,14 @@ class Protocol(object):
             raise ProtocolError("Unknown message type %r for protocol version %s" % (msgtype, self._version))
         return self._messages[msgtype].create(*args, **kwargs)
 
-    def assemble(self, header_json, metadata_json, content_json):
+    def assemble(self, header_json, metadata_json, content_json, content=None):
         ''' Create a Message instance assembled from json fragments.
 
         Args:
             header_json (JSON) :
             metadata_json (JSON) :
             content_json (JSON) :
+            content (dict, optional) : content_json, if it has already been decoded
 
         Returns:
             message
@@ -62,7 +63,7 @@ class Protocol(object):
             log.error("Bad header with no msgtype was: %r", header)
             raise ProtocolError("No 'msgtype' in header")
         return self._messages[header['msgtype']].assemble(
-            header_json, metadata_json, content_json
+            header_json, metadata_json, content_json, content=content
         )
 
     @property
@@ -38,13 +38,14 @@ class Message(object):
         return "Message %r (revision %d)" % (self.msgtype, self.revision)
 
     @classmethod
-    def assemble(cls, header_json, metadata_json, content_json):
+    def assemble(cls, header_json, metadata_json, content_json, content=None):
         ''' Creates a new message, assembled from JSON fragments.
 
         Args:
             header_json (JSON) :
             metadata_json (JSON) :
             content_json (JSON) :
+            content (dict, optional) : content_json, if it has already been decoded
 
         Returns:
             Message subclass
@@ -64,10 +65,11 @@ class Message(object):
         except ValueError:
             raise MessageError("metadata could not be decoded")
 
-        try:
-            content = json_decode(content_json)
-        except ValueError:
-            raise MessageError("content could not be decoded")
+        if content is None:
+            try:
+                content = json_decode(content_json)
+            except ValueError:
+                raise MessageError("content could not be decoded")
 
         msg = cls(header, metadata, content)
 
@@ -77,6 +79,24 @@ class Message(object):
 
         return msg
 
+    def copy(self):
+        ''' Return a copy of this message with a new message ID.
+
+        The metadata, content and buffers are encoded at most once and
+        shared with the copy, so that the same message can be sent over
+        many connections without serializing it again for each one.
+
+        Returns:
+            Message subclass
+
+        '''
+        header = dict(self.header, msgid=bkserial.make_id())
+        msg = self.__class__(header, self.metadata, self.content)
+        msg._metadata_json = self.metadata_json
+        msg._content_json = self.content_json
+        msg._buffers = self._buffers
+        return msg
+
     def add_buffer(self, buf_header, buf_payload):
         ''' Associate a buffer header and payload with this message.
 
@@ -98,7 +118,21 @@ class Message(object):
 
         self._header_json = None
 
-        self._buffers.add((buf_header, buf_payload))
+        self._buffers.append((buf_header, buf_payload))
+
+    def add_buffers(self, buffers):
+        ''' Associate a list of buffers, as collected by e.g.
+        ``Document.to_json(buffers=...)``, with this message.
+
+        Args:
+            buffers (list) : a list of ``(header dict, bytes)`` tuples
+
+        Returns:
+            None
+
+        '''
+        for buf_header, buf_payload in buffers:
+            self.add_buffer(json_encode(buf_header), buf_payload)
 
     def assemble_buffer(self, buf_header, buf_payload):
         ''' Add a buffer header and payload that we read from the socket.
@@ -120,6 +154,34 @@ class Message(object):
             raise ProtocolError("too many buffers received expecting " + str(self.header['num_buffers']))
         self._buffers.append((buf_header, buf_payload))
 
+    def resolve_buffers(self, obj):
+        ''' Replace any binary buffer references in a JSON-like object
+        (typically part of this message's content) with NumPy arrays
+        created from this message's buffers.
+
+        Args:
+            obj (JSON-like) : the object to resolve references in
+
+        Returns:
+            JSON-like
+
+        Raises:
+            ProtocolError
+
+        '''
+        if not self._buffers:
+            return obj
+        payloads = {}
+        for buf_header, buf_payload in self._buffers:
+            try:
+                payloads[json_decode(buf_header)['id']] = buf_payload
+            except (ValueError, KeyError):
+                raise ProtocolError("buffer header could not be decoded")
+        try:
+            return bkserial.decode_buffer_refs(obj, payloads)
+        except ValueError as e:
+            raise ProtocolError(str(e))
+
     @gen.coroutine
     def write_buffers(self, conn, locked=True):
         ''' Write any buffer headers and payloads to the given connection.
@@ -168,7 +230,9 @@ class Message(object):
             conn (WebSocketHandler) : a WebSocketHandler to send messages
 
         Returns:
-            int : number of bytes sent
+            int : number of bytes sent, before any websocket compression.
+                Connections count the bytes that went on the wire in
+                their ``wire_bytes_sent`` attribute.
 
         '''
         if conn is None:
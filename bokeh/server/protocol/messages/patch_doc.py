@@ -4,11 +4,17 @@
 from __future__ import absolute_import
 
 from bokeh.model import Model
-from bokeh.document import ModelChangedEvent, TitleChangedEvent, RootAddedEvent, RootRemovedEvent
-from json import loads
+from bokeh.document import (ModelChangedEvent, TitleChangedEvent, RootAddedEvent, RootRemovedEvent,
+                            ColumnsStreamedEvent, ColumnsPatchedEvent)
+from bokeh.core.json_encoder import serialize_json
 from ..message import Message
 from . import register
 
+def _same_patches(patches_json, patches):
+    # patches may hold tuples and slices, or their JSON equivalents
+    # (lists and dicts), so compare their serialized forms
+    return patches_json is patches or serialize_json(patches_json, sort_keys=True) == serialize_json(patches, sort_keys=True)
+
 @register
 class patch_doc_1(Message):
     '''
@@ -32,13 +38,11 @@ class patch_doc_1(Message):
             raise ValueError("PATCH-DOC message requires at least one event")
         document = events[0].document
 
-        patch_json = document.create_json_patch_string(events)
-        # this is a total hack, the need for it is because we have magic
-        # type conversions in our BokehJSONEncoder which keep us from
-        # easily generating non-string JSON.
-        content = loads(patch_json)
+        buffers = []
+        content = document.create_json_patch(events, buffers=buffers)
 
         msg = cls(header, metadata, content)
+        msg.add_buffers(buffers)
 
         return msg
 
@@ -57,10 +61,16 @@ class patch_doc_1(Message):
                         if patch_new == event.serializable_new:
                             return True
                 elif event_json['kind'] == 'ColumnsStreamed' and \
+                   isinstance(event.hint, ColumnsStreamedEvent) and \
                    event_json['column_source']['id'] == event.hint.column_source._id and \
                    event_json['data'] == event.hint.data and \
                    event_json['rollover'] == event.hint.rollover:
                     return True
+                elif event_json['kind'] == 'ColumnsPatched' and \
+                   isinstance(event.hint, ColumnsPatchedEvent) and \
+                   event_json['column_source']['id'] == event.hint.column_source._id and \
+                   _same_patches(event_json['patches'], event.hint.patches):
+                    return True
         elif isinstance(event, RootAddedEvent):
             for event_json in self.content['events']:
                 if event_json['kind'] == 'RootAdded' and \
@@ -82,4 +92,4 @@ class patch_doc_1(Message):
         return False
 
     def apply_to_document(self, doc):
-        doc.apply_json_patch(self.content)
+        doc.apply_json_patch(self.resolve_buffers(self.content))
@@ -29,13 +29,15 @@ class pull_doc_reply_1(Message):
         '''
         header = cls.create_header(request_id=request_id)
 
-        content = { 'doc' : document.to_json() }
+        buffers = []
+        content = { 'doc' : document.to_json(buffers=buffers) }
 
         msg = cls(header, metadata, content)
+        msg.add_buffers(buffers)
 
         return msg
 
     def push_to_document(self, doc):
         if 'doc' not in self.content:
             raise ProtocolError("No doc in PULL-DOC-REPLY")
-        doc.replace_with_json(self.content['doc'])
+        doc.replace_with_json(self.resolve_buffers(self.content['doc']))
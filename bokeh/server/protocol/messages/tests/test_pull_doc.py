@@ -2,10 +2,14 @@ from __future__ import absolute_import, print_function
 
 import unittest
 
+import numpy as np
+
 import bokeh.document as document
 from bokeh.model import Model
+from bokeh.models.sources import ColumnDataSource
 from bokeh.core.properties import Int, Instance
-from bokeh.server.protocol import Protocol
+from bokeh.server.protocol import Protocol, receiver
+from bokeh.util.string import decode_utf8
 
 class AnotherModelInTestPullDoc(Model):
     bar = Int(1)
@@ -37,3 +41,40 @@ class TestPullDocument(unittest.TestCase):
         msg.push_to_document(copy)
         assert len(sample.roots) == 2
         assert len(copy.roots) == 2
+
+    def test_create_reply_with_binary_buffers(self):
+        sample = document.Document()
+        x = np.arange(10, dtype=np.float64)
+        y = np.arange(10, dtype=np.int32)
+        sample.add_root(ColumnDataSource(data=dict(x=x, y=y, z=list(range(10)))))
+        msg = Protocol("1.0").create("PULL-DOC-REPLY", 'fakereqid', sample)
+        assert msg.header['num_buffers'] == 2
+        assert len(msg.buffers) == 2
+        # the array data is not in the JSON content
+        source_json = msg.content['doc']['roots']['references'][0]
+        assert '__buffer__' in source_json['attributes']['data']['x']
+        assert '__buffer__' in source_json['attributes']['data']['y']
+        assert source_json['attributes']['data']['z'] == list(range(10))
+
+    def test_create_reply_with_binary_buffers_then_receive(self):
+        sample = document.Document()
+        x = np.linspace(0, 1, 10)
+        sample.add_root(ColumnDataSource(data=dict(x=x, y=[float('nan')]*10)))
+        msg = Protocol("1.0").create("PULL-DOC-REPLY", 'fakereqid', sample)
+
+        r = receiver.Receiver(Protocol("1.0"))
+        r.consume(decode_utf8(msg.header_json)).result()
+        r.consume(decode_utf8(msg.metadata_json)).result()
+        assert r.consume(decode_utf8(msg.content_json)).result() is None
+        for header, payload in msg.buffers:
+            r.consume(decode_utf8(header)).result()
+            received = r.consume(payload).result()
+        assert received is not None
+
+        copy = document.Document()
+        received.push_to_document(copy)
+        source = copy.roots[0]
+        assert isinstance(source.data['x'], np.ndarray)
+        assert source.data['x'].dtype == np.float64
+        assert np.array_equal(source.data['x'], x)
+        assert source.data['y'] == ['NaN']*10
@@ -4,14 +4,24 @@ message objects that can be processed.
 '''
 from __future__ import absolute_import
 
+import time
+
 import six
-from tornado.concurrent import return_future
+from tornado import gen
+from tornado.escape import json_decode
 
-from ..exceptions import ValidationError
+from ..exceptions import MessageError, ValidationError
 
 import logging
 log = logging.getLogger(__name__)
 
+def _decode_content(content_json):
+    # module level, so that process pools can run it
+    try:
+        return json_decode(content_json)
+    except ValueError:
+        raise MessageError("content could not be decoded")
+
 class Receiver(object):
     '''
 
@@ -33,21 +43,54 @@ class Receiver(object):
         ...
     ]
 
+    Args:
+        protocol (Protocol) : the protocol to assemble messages with
+        max_message_size (int, optional) : the largest message to accept,
+            in characters of text fragments plus bytes of binary fragments.
+            Larger messages raise MessageError. None for no limit.
+        decode_executor (Executor, optional) : a ``concurrent.futures``
+            executor to decode content fragments of at least
+            ``decode_executor_min_size`` characters on, so that decoding
+            them doesn't block the IO loop
+        decode_executor_min_size (int, optional) : smallest content
+            fragment to decode on ``decode_executor``
+        on_decoded (callable, optional) : called as
+            ``on_decoded(msgtype, seconds)`` with the time it took to
+            decode the content of each message
+
     '''
 
-    def __init__(self, protocol):
+    def __init__(self, protocol, max_message_size=None, decode_executor=None,
+                 decode_executor_min_size=0, on_decoded=None):
         self._protocol = protocol
+        self._max_message_size = max_message_size
+        self._decode_executor = decode_executor
+        self._decode_executor_min_size = decode_executor_min_size
+        self._on_decoded = on_decoded
         self._current_consumer = self._HEADER
         self._message = None
+        self._message_size = 0
         self._buf_header = None
 
-    @return_future
-    def consume(self, fragment, callback=None):
+    @gen.coroutine
+    def consume(self, fragment):
         '''
 
         '''
-        self._current_consumer(fragment)
-        callback(self._message)
+        self._check_size(fragment)
+        future = self._current_consumer(fragment)
+        if future is not None:
+            yield future
+        raise gen.Return(self._message)
+
+    def _check_size(self, fragment):
+        if self._current_consumer == self._HEADER:
+            self._message_size = 0
+        self._message_size += len(fragment)
+        if self._max_message_size is not None and self._message_size > self._max_message_size:
+            # start over with the next message
+            self._current_consumer = self._HEADER
+            raise MessageError("message is larger than the limit of %d" % self._max_message_size)
 
     def _HEADER(self, fragment):
         self._assume_text(fragment)
@@ -65,12 +108,39 @@ class Receiver(object):
         self._assume_text(fragment)
         self._fragments.append(fragment)
 
+        if self._decode_executor is not None and len(fragment) >= self._decode_executor_min_size:
+            return self._assemble_in_executor()
+
+        start = time.time()
+        self._assemble()
+        self._record_decode_time(start)
+
+    @gen.coroutine
+    def _assemble_in_executor(self):
+        start = time.time()
+        try:
+            content = yield self._decode_executor.submit(_decode_content, self._fragments[2])
+        except MessageError:
+            self._current_consumer = self._HEADER
+            raise
+        self._assemble(content)
+        self._record_decode_time(start)
+
+    def _assemble(self, content=None):
         header_json, metadata_json, content_json = self._fragments[:3]
 
-        self._partial = self._protocol.assemble(header_json, metadata_json, content_json)
+        try:
+            self._partial = self._protocol.assemble(header_json, metadata_json, content_json, content=content)
+        except MessageError:
+            self._current_consumer = self._HEADER
+            raise
 
         self._check_complete()
 
+    def _record_decode_time(self, start):
+        if self._on_decoded is not None:
+            self._on_decoded(self._partial.msgtype, time.time() - start)
+
     def _BUFFER_HEADER(self, fragment):
         self._assume_text(fragment)
         self._buf_header = fragment
@@ -1,5 +1,11 @@
 from __future__ import absolute_import
 
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from tornado import gen
+from tornado.ioloop import IOLoop
+
+from bokeh.server.exceptions import MessageError
 from bokeh.server.protocol import receiver, Protocol
 from bokeh.util.string import decode_utf8
 
@@ -26,3 +32,47 @@ def test_validation_success():
     assert partial.metadata == msg.metadata
 
 
+@gen.coroutine
+def _consume_all(r, msg):
+    for fragment in (msg.header_json, msg.metadata_json, msg.content_json):
+        result = yield r.consume(decode_utf8(fragment))
+    raise gen.Return(result)
+
+def test_max_message_size():
+    msg = _proto.create('PULL-DOC-REQ')
+    r = receiver.Receiver(_proto, max_message_size=len(msg.header_json) + len(msg.metadata_json))
+
+    r.consume(decode_utf8(msg.header_json)).result()
+    r.consume(decode_utf8(msg.metadata_json)).result()
+    with pytest.raises(MessageError):
+        r.consume(decode_utf8(msg.content_json)).result()
+
+    # the receiver starts over with the next message
+    r.consume(decode_utf8(msg.header_json)).result()
+
+def test_decode_executor():
+    msg = _proto.create('PULL-DOC-REQ')
+    decoded = []
+    executor = ThreadPoolExecutor(max_workers=1)
+    r = receiver.Receiver(_proto, decode_executor=executor, decode_executor_min_size=0,
+                          on_decoded=lambda msgtype, seconds: decoded.append(msgtype))
+    loop = IOLoop()
+    try:
+        result = loop.run_sync(lambda: _consume_all(r, msg))
+    finally:
+        loop.close()
+        executor.shutdown()
+    assert result.msgtype == 'PULL-DOC-REQ'
+    assert result.content == msg.content
+    assert decoded == ['PULL-DOC-REQ']
+
+def test_decode_executor_min_size():
+    msg = _proto.create('PULL-DOC-REQ')
+    decoded = []
+    r = receiver.Receiver(_proto, decode_executor=object(), decode_executor_min_size=len(msg.content_json) + 1,
+                          on_decoded=lambda msgtype, seconds: decoded.append(msgtype))
+    r.consume(decode_utf8(msg.header_json)).result()
+    r.consume(decode_utf8(msg.metadata_json)).result()
+    result = r.consume(decode_utf8(msg.content_json)).result()
+    assert result.msgtype == 'PULL-DOC-REQ'
+    assert decoded == ['PULL-DOC-REQ']
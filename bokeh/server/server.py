@@ -9,6 +9,8 @@ log = logging.getLogger(__name__)
 import sys
 
 from tornado.httpserver import HTTPServer
+from tornado.netutil import bind_sockets
+from tornado.process import cpu_count, fork_processes
 
 from .tornado import BokehTornado
 
@@ -41,6 +43,16 @@ def _create_hosts_whitelist(host_list, port):
             raise ValueError("Invalid host value: %s" % host)
     return hosts
 
+def _log_bind_error(e, port, address):
+    import errno
+    if e.errno == errno.EADDRINUSE:
+        log.critical("Cannot start Bokeh server, port %s is already in use", port)
+    elif e.errno == errno.EADDRNOTAVAIL:
+        log.critical("Cannot start Bokeh server, address '%s' not available", address)
+    else:
+        codename = errno.errorcode[e.errno]
+        log.critical("Cannot start Bokeh server, %s %r", codename, e)
+
 class Server(object):
     ''' A Server which creates a new Session for each connection, using an Application to initialize each Session.
 
@@ -49,6 +61,14 @@ class Server(object):
             mapping from URL paths to Application instances, or a single Application to put at the root URL
             The Application is a factory for Document, with a new Document initialized for each Session.
             Each application should be identified by a path meant to go in a URL, like "/" or "/foo"
+
+    With ``num_procs`` other than 1, the listening socket is bound and then
+    the process forks into ``num_procs`` worker processes (0 means one per
+    CPU) that share it. The original process only waits for the workers
+    and never returns from the constructor. Every session belongs to one
+    worker, and requests for it that arrive at other workers are forwarded
+    to it over a private port on 127.0.0.1, so ``io_loop`` can't be passed
+    in this case and no IOLoop may have been created before.
     '''
 
     def __init__(self, applications, **kwargs):
@@ -68,7 +88,19 @@ class Server(object):
                                                         'keep_alive_milliseconds',
                                                         'check_unused_sessions_milliseconds',
                                                         'unused_session_lifetime_milliseconds',
-                                                        'stats_log_frequency_milliseconds']
+                                                        'stats_log_frequency_milliseconds',
+                                                        'websocket_compression_level',
+                                                        'websocket_max_message_size',
+                                                        'decode_executor_min_size',
+                                                        'websocket_max_queued_bytes',
+                                                        'slow_client_policy',
+                                                        'slow_client_max_held_events',
+                                                        'session_workers',
+                                                        'session_pool_size',
+                                                        'executor',
+                                                        'executor_workers',
+                                                        'worker_index',
+                                                        'worker_addresses']
                            if key in kwargs }
 
         prefix = kwargs.get('prefix', None)
@@ -86,27 +118,56 @@ class Server(object):
         tornado_kwargs['hosts'] = _create_hosts_whitelist(kwargs.get('host', None), self._port)
         tornado_kwargs['extra_websocket_origins'] = _create_hosts_whitelist(kwargs.get('allow_websocket_origin', None), self._port)
 
-        self._tornado = BokehTornado(self._applications, self.prefix, **tornado_kwargs)
-        self._http = HTTPServer(self._tornado, xheaders=kwargs.get('use_xheaders', False))
         self._address = None
         if 'address' in kwargs:
             self._address = kwargs['address']
 
-        # these queue a callback on the ioloop rather than
-        # doing the operation immediately (I think - havocp)
-        try:
-            self._http.bind(self._port, address=self._address)
-            self._http.start(1)
-        except OSError as e:
-            import errno
-            if e.errno == errno.EADDRINUSE:
-                log.critical("Cannot start Bokeh server, port %s is already in use", self._port)
-            elif e.errno == errno.EADDRNOTAVAIL:
-                log.critical("Cannot start Bokeh server, address '%s' not available", self._address)
-            else:
-                codename = errno.errorcode[e.errno]
-                log.critical("Cannot start Bokeh server, %s %r", codename, e)
-            sys.exit(1)
+        num_procs = kwargs.get('num_procs', 1)
+        if num_procs < 0:
+            raise ValueError("num_procs must be >= 0")
+        if num_procs == 0:
+            num_procs = cpu_count()
+
+        sockets = None
+        if num_procs > 1:
+            if 'io_loop' in kwargs:
+                raise ValueError("io_loop can't be passed when forking worker processes")
+            try:
+                sockets = bind_sockets(self._port, address=self._address)
+            except OSError as e:
+                _log_bind_error(e, self._port, self._address)
+                sys.exit(1)
+            # a private port for each worker, that the other workers forward
+            # requests for its sessions to
+            worker_sockets = [bind_sockets(0, address='127.0.0.1') for i in range(num_procs)]
+            worker_addresses = ['127.0.0.1:%d' % s[0].getsockname()[1] for s in worker_sockets]
+            log.info("Starting %d worker processes", num_procs)
+
+            worker_index = fork_processes(num_procs)
+
+            for i, s in enumerate(worker_sockets):
+                if i == worker_index:
+                    sockets.extend(s)
+                else:
+                    for sock in s:
+                        sock.close()
+            tornado_kwargs['worker_index'] = worker_index
+            tornado_kwargs['worker_addresses'] = worker_addresses
+
+        self._tornado = BokehTornado(self._applications, self.prefix, **tornado_kwargs)
+        self._http = HTTPServer(self._tornado, xheaders=kwargs.get('use_xheaders', False))
+
+        if sockets is not None:
+            self._http.add_sockets(sockets)
+        else:
+            # these queue a callback on the ioloop rather than
+            # doing the operation immediately (I think - havocp)
+            try:
+                self._http.bind(self._port, address=self._address)
+                self._http.start(1)
+            except OSError as e:
+                _log_bind_error(e, self._port, self._address)
+                sys.exit(1)
 
     @property
     def port(self):
@@ -120,6 +181,11 @@ class Server(object):
     def prefix(self):
         return self._prefix
 
+    @property
+    def worker_index(self):
+        ''' The index of this worker process, 0 unless ``num_procs`` is not 1. '''
+        return self._tornado.worker_index
+
     @property
     def io_loop(self):
         return self._tornado.io_loop
@@ -7,6 +7,7 @@ import logging
 log = logging.getLogger(__name__)
 
 from tornado import gen, locks
+from bokeh.document import _coalesce_events
 from bokeh.util.tornado import _DocumentCallbackGroup, yield_for_all_futures
 
 import time
@@ -46,13 +47,22 @@ def _needs_document_lock(func):
                     # any callback goes wrong
                     pending_writes = self._pending_writes
                     self._pending_writes = None
-                for p in pending_writes:
-                    yield p
+                    # the document may have changed even if func failed,
+                    # so always send out what we collected
+                    writes = self._send_pending_writes(pending_writes)
+            # don't wait for the writes, slow clients shouldn't hold up
+            # the document or the caller
+            for p in writes:
+                p.add_done_callback(_log_write_error)
             raise gen.Return(result)
         finally:
             self.unblock_expiration()
     return _needs_document_lock_wrapper
 
+def _log_write_error(future):
+    if future.exception() is not None:
+        log.error("Failed to send document changes to a client: %r", future.exception())
+
 class ServerSession(object):
     ''' Hosts an application "instance" (an instantiated Document) for one or more connections.
 
@@ -170,11 +180,40 @@ class ServerSession(object):
         # because if both sides change the same attribute at the
         # same time, they will each end up with the state of the
         # other and their final states will differ.
+
+        # the event is sent when the document lock is released, together
+        # with any other changes made while the lock is held
+        if may_suppress:
+            self._pending_writes.append((event, self._current_patch_connection))
+        else:
+            self._pending_writes.append((event, None))
+
+    def _send_pending_writes(self, pending_writes):
+        ''' Send one PATCH-DOC with the coalesced pending events to each
+        subscribed connection, returning a list of Futures for the writes.
+
+        '''
+        if not pending_writes:
+            return []
+
+        # connections that get the same events share a serialized message
+        messages = {}
+        writes = []
         for connection in self._subscribed_connections:
-            if may_suppress and connection is self._current_patch_connection:
-                pass #log.debug("Not sending notification back to client %r for a change it requested", connection)
+            included = tuple(i for i, (event, suppressed_connection) in enumerate(pending_writes)
+                             if connection is not suppressed_connection)
+            if not included:
+                #log.debug("Not sending notification back to client %r for a change it requested", connection)
+                continue
+            msg = messages.get(included)
+            if msg is None:
+                events = _coalesce_events([pending_writes[i][0] for i in included])
+                msg = connection.protocol.create('PATCH-DOC', events)
+                messages[included] = msg
             else:
-                self._pending_writes.append(connection.send_patch_document(event))
+                msg = msg.copy()
+            writes.append(connection.send_patch(msg, [pending_writes[i][0] for i in included]))
+        return writes
 
     @_needs_document_lock
     def _handle_pull(self, message, connection):
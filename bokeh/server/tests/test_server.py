@@ -3,6 +3,9 @@ from __future__ import absolute_import
 import pytest
 import logging
 import re
+import threading
+
+from mock import patch
 
 from tornado import gen
 from tornado.ioloop import PeriodicCallback
@@ -245,6 +248,202 @@ def test_use_xheaders():
     with ManagedServerLoop(application, use_xheaders=True) as server:
         assert server._http.xheaders == True
 
+class ThreadRecordingHandler(Handler):
+    def __init__(self):
+        super(ThreadRecordingHandler, self).__init__()
+        self.threads = []
+
+    def modify_document(self, doc):
+        from bokeh.io import curdoc, set_curdoc
+        self.threads.append(threading.current_thread())
+        set_curdoc(doc)
+        assert curdoc() is doc
+        doc.add_root(HookListModel(hooks=["modify"]))
+
+def test__session_workers():
+    from bokeh.io import curdoc
+    handler = ThreadRecordingHandler()
+    application = Application()
+    application.add(handler)
+    old_curdoc = curdoc()
+    with ManagedServerLoop(application, session_workers=2) as server:
+        http_get(server.io_loop, url(server))
+        http_get(server.io_loop, url(server))
+
+        sessions = server.get_sessions('/')
+        assert 2 == len(sessions)
+        for session in sessions:
+            assert session.document.roots[0].hooks == ["modify"]
+    assert len(handler.threads) == 2
+    assert threading.current_thread() not in handler.threads
+    assert curdoc() is old_curdoc
+
+def test__session_workers_negative_raises():
+    application = Application()
+    with pytest.raises(ValueError):
+        with ManagedServerLoop(application, session_workers=-1):
+            pass
+
+def test__run_in_executor():
+    application = Application()
+    application.add(ThreadRecordingHandler())
+    with ManagedServerLoop(application, executor='thread', executor_workers=2) as server:
+        http_get(server.io_loop, url(server))
+        session = server.get_sessions('/')[0]
+        doc = session.document
+        session_context = doc.session_context
+        assert session_context.id == session.id
+
+        @gen.coroutine
+        def run():
+            thread = yield session_context.run_in_executor(threading.current_thread)
+            def update(doc):
+                doc.roots[0].hooks.append("update")
+            yield session_context.with_locked_document(update)
+            raise gen.Return(thread)
+        thread = server.io_loop.run_sync(run)
+        assert thread is not threading.current_thread()
+        assert doc.roots[0].hooks == ["modify", "update"]
+
+def test__executor_invalid_raises():
+    application = Application()
+    with pytest.raises(ValueError):
+        with ManagedServerLoop(application, executor='fork'):
+            pass
+    with pytest.raises(ValueError):
+        with ManagedServerLoop(application, executor_workers=0):
+            pass
+
+class LargeDocumentHandler(Handler):
+    def modify_document(self, doc):
+        doc.add_root(HookListModel(hooks=["repeated text"] * 1000))
+
+def _pull_large_document(**server_kwargs):
+    application = Application()
+    application.add(LargeDocumentHandler())
+    with ManagedServerLoop(application, **server_kwargs) as server:
+        client_session = pull_session(session_id='large', url=url(server), io_loop=server.io_loop)
+        assert client_session.document.roots[0].hooks == ["repeated text"] * 1000
+        client_session.close()
+        client_session.loop_until_closed()
+        return server._tornado.bytes_sent, server._tornado.wire_bytes_sent
+
+def test__websocket_compression():
+    sent, wire_sent = _pull_large_document(websocket_compression_level=6)
+    assert sent > 17000
+    assert wire_sent < sent / 10
+
+def test__websocket_compression_disabled():
+    sent, wire_sent = _pull_large_document()
+    assert sent > 17000
+    assert wire_sent == 0
+
+def test__websocket_compression_level_invalid_raises():
+    application = Application()
+    with pytest.raises(ValueError):
+        with ManagedServerLoop(application, websocket_compression_level=10):
+            pass
+
+def test__session_pool():
+    handler = ThreadRecordingHandler()
+    application = Application()
+    application.add(handler)
+    with ManagedServerLoop(application, session_pool_size=1) as server:
+        context = server._tornado._applications['/']
+        server.io_loop.run_sync(context.fill_session_pool)
+        assert context.session_pool_ready == 1
+        assert len(handler.threads) == 1
+        assert 0 == len(server.get_sessions('/'))
+        pooled_id = list(context._session_pool.keys())[0]
+
+        response = http_get(server.io_loop, url(server))
+        sessionid = extract_sessionid_from_json(response.body)
+        assert sessionid == pooled_id
+        assert context.session_pool_hits == 1
+        assert context.session_pool_misses == 0
+
+        sessions = server.get_sessions('/')
+        assert 1 == len(sessions)
+        assert sessions[0].document.roots[0].hooks == ["modify"]
+
+        server.io_loop.run_sync(context.fill_session_pool)
+        assert context.session_pool_ready == 1
+        assert len(handler.threads) == 2
+
+        # a requested session id does not use the pool
+        http_get(server.io_loop, url(server) + "?bokeh-session-id=foo")
+        assert context.session_pool_hits == 1
+        assert context.session_pool_ready == 1
+        assert len(handler.threads) == 3
+
+def test__session_pool_miss():
+    application = Application()
+    with ManagedServerLoop(application, session_pool_size=1) as server:
+        context = server._tornado._applications['/']
+        server.io_loop.run_sync(context.fill_session_pool)
+        context._session_pool.clear()
+        session = server.io_loop.run_sync(context.create_new_session)
+        assert context.session_pool_hits == 0
+        assert context.session_pool_misses == 1
+        assert [session] == server.get_sessions('/')
+
+def test__forward_to_session_worker():
+    from tornado.ioloop import IOLoop
+    from tornado.netutil import bind_sockets
+    from bokeh.util.session_id import generate_session_id, session_id_worker
+
+    sockets = [bind_sockets(0, address='127.0.0.1')[0] for i in range(2)]
+    ports = [sock.getsockname()[1] for sock in sockets]
+    for sock in sockets:
+        sock.close()
+    addresses = ['127.0.0.1:%d' % port for port in ports]
+    hosts = ['localhost:%d' % port for port in ports]
+
+    handler = HookTestHandler()
+    application = Application()
+    application.add(handler)
+    loop = IOLoop()
+    loop.make_current()
+    servers = [server.Server(application, io_loop=loop, port=ports[i], address='127.0.0.1', host=hosts,
+                             worker_index=i, worker_addresses=addresses)
+               for i in range(2)]
+
+    # a header that tells which worker answered a request
+    from bokeh.server.views.doc_handler import DocHandler
+    def set_default_headers(self):
+        self.set_header("X-Bokeh-Worker", str(self.application.worker_index))
+    patcher = patch.object(DocHandler, 'set_default_headers', set_default_headers)
+    patcher.start()
+    try:
+        for s in servers:
+            s.start(start_loop=False)
+
+        # sessions generated by a worker belong to it
+        response = http_get(loop, url(servers[1]))
+        session_id = extract_sessionid_from_json(response.body)
+        assert session_id_worker(session_id, 2) == 1
+        assert [session_id] == [s.id for s in servers[1].get_sessions('/')]
+
+        # requests for sessions of another worker are forwarded
+        session_id = generate_session_id(signed=False, worker=0, num_workers=2)
+        response = http_get(loop, url(servers[1]) + "?bokeh-session-id=" + session_id)
+        assert session_id == extract_sessionid_from_json(response.body)
+        assert response.headers.get_list("X-Bokeh-Worker") == ["0"]
+        assert [session_id] == [s.id for s in servers[0].get_sessions('/')]
+        assert 1 == len(servers[1].get_sessions('/'))
+
+        client_session = pull_session(session_id=session_id, url=url(servers[1]), io_loop=loop)
+        assert client_session.document.roots[0].hooks == ["session_created", "modify"]
+        client_session.close()
+        client_session.loop_until_closed()
+        assert 1 == len(servers[0].get_sessions('/'))
+    finally:
+        patcher.stop()
+        for s in servers:
+            s.unlisten()
+            s.stop()
+        loop.close()
+
 def test__autocreate_session_autoload():
     application = Application()
     with ManagedServerLoop(application) as server:
@@ -0,0 +1,230 @@
+from __future__ import absolute_import
+
+import numpy as np
+
+from tornado import gen
+from tornado.ioloop import IOLoop
+
+import bokeh.document as document
+from bokeh.core.properties import Int
+from bokeh.model import Model
+from bokeh.models import ColumnDataSource
+from bokeh.server.connection import ServerConnection
+from bokeh.server.protocol import Protocol
+from bokeh.server.session import ServerSession
+
+class SomeModelInTestSession(Model):
+    foo = Int(2)
+
+class FakeConnection(object):
+    def __init__(self, session):
+        self.protocol = Protocol("1.0")
+        self.sent = []
+        session.subscribe(self)
+
+    def ok(self, message):
+        return self.protocol.create('OK', message.header['msgid'])
+
+    def send_message(self, message):
+        self.sent.append(message)
+        return gen.maybe_future(None)
+
+    def send_patch(self, message, events):
+        return self.send_message(message)
+
+class FakeSocket(object):
+    def __init__(self):
+        self.queued_bytes = 0
+        self.sent = []
+        self.closed = False
+
+    def send_message(self, message):
+        self.sent.append(message)
+        return gen.maybe_future(None)
+
+    def close(self):
+        self.closed = True
+
+def _record_events(doc):
+    events = []
+    doc.on_change(lambda event: events.append(event))
+    return events
+
+def test_coalesce_model_changes():
+    doc = document.Document()
+    m = SomeModelInTestSession()
+    other = SomeModelInTestSession()
+    doc.add_root(m)
+    doc.add_root(other)
+    events = _record_events(doc)
+    for i in range(10):
+        m.foo = i
+    other.foo = 20
+    doc.title = "title"
+
+    coalesced = document._coalesce_events(events)
+    assert len(coalesced) == 3
+    assert coalesced[0].model is m
+    assert coalesced[0].attr == 'foo'
+    assert coalesced[0].serializable_new == 9
+    assert coalesced[1].model is other
+    assert isinstance(coalesced[2], document.TitleChangedEvent)
+
+def test_coalesce_streams():
+    doc = document.Document()
+    source = ColumnDataSource(data=dict(a=[0], b=np.array([0])))
+    doc.add_root(source)
+    events = _record_events(doc)
+    source.stream(dict(a=[1], b=np.array([1])), rollover=3)
+    source.stream(dict(a=[2], b=np.array([2])), rollover=3)
+    source.stream(dict(a=[3, 4], b=np.array([3, 4])), rollover=3)
+    source.stream(dict(a=[5], b=np.array([5])))
+
+    coalesced = document._coalesce_events(events)
+    assert len(coalesced) == 2
+    assert coalesced[0].hint.rollover == 3
+    assert coalesced[0].hint.data['a'] == [2, 3, 4]
+    assert list(coalesced[0].hint.data['b']) == [2, 3, 4]
+    assert coalesced[1].hint.rollover is None
+    assert coalesced[1].hint.data['a'] == [5]
+
+def test_coalesce_streams_after_set():
+    doc = document.Document()
+    source = ColumnDataSource(data=dict(a=[0]))
+    doc.add_root(source)
+    events = _record_events(doc)
+    source.data = dict(a=[10])
+    source.stream(dict(a=[11]))
+    source.patch(dict(a=[(0, 12)]))
+
+    coalesced = document._coalesce_events(events)
+    assert len(coalesced) == 1
+    assert coalesced[0].hint is None
+    assert coalesced[0].serializable_new == dict(a=[12, 11])
+
+def test_pending_writes_sent_on_lock_release():
+    doc = document.Document()
+    m = SomeModelInTestSession()
+    doc.add_root(m)
+    loop = IOLoop()
+    session = ServerSession('id', doc, io_loop=loop)
+    connections = [FakeConnection(session), FakeConnection(session)]
+
+    def change():
+        for i in range(50):
+            m.foo = i
+    loop.run_sync(lambda: session.with_document_locked(change))
+    loop.close()
+
+    msgids = set()
+    for connection in connections:
+        assert len(connection.sent) == 1
+        msg = connection.sent[0]
+        assert msg.msgtype == 'PATCH-DOC'
+        assert len(msg.content['events']) == 1
+        assert msg.content['events'][0]['new'] == 49
+        msgids.add(msg.header['msgid'])
+    assert len(msgids) == 2
+    assert connections[0].sent[0].content_json is connections[1].sent[0].content_json
+
+def test_lock_released_before_writes_complete():
+    doc = document.Document()
+    m = SomeModelInTestSession()
+    doc.add_root(m)
+    loop = IOLoop()
+    session = ServerSession('id', doc, io_loop=loop)
+    connection = FakeConnection(session)
+    # a client that never reads what is sent to it
+    connection.send_message = lambda message: gen.Future()
+
+    def change():
+        m.foo = 42
+    loop.run_sync(lambda: session.with_document_locked(change), timeout=1)
+    loop.run_sync(lambda: session.with_document_locked(change), timeout=1)
+    loop.close()
+
+def test_pending_writes_suppressed_for_requesting_connection():
+    doc = document.Document()
+    m = SomeModelInTestSession()
+    doc.add_root(m)
+    loop = IOLoop()
+    session = ServerSession('id', doc, io_loop=loop)
+    requester = FakeConnection(session)
+    other = FakeConnection(session)
+
+    patch = requester.protocol.create('PATCH-DOC', [document.ModelChangedEvent(doc, m, 'foo', 2, 42, 42)])
+    loop.run_sync(lambda: session._handle_patch(patch, requester))
+    loop.close()
+
+    assert requester.sent == []
+    assert len(other.sent) == 1
+    assert other.sent[0].content['events'][0]['new'] == 42
+    assert m.foo == 42
+
+def _slow_client(policy, max_held_events=None):
+    doc = document.Document()
+    m = SomeModelInTestSession()
+    source = ColumnDataSource(data=dict(a=[0]))
+    doc.add_root(m)
+    doc.add_root(source)
+    loop = IOLoop()
+    session = ServerSession('id', doc, io_loop=loop)
+    socket = FakeSocket()
+    connection = ServerConnection(Protocol("1.0"), socket, None, session,
+                                  max_queued_bytes=100, slow_client_policy=policy,
+                                  max_held_events=max_held_events, io_loop=loop)
+    connection._held_events_check_milliseconds = 1
+
+    def change():
+        m.foo = 10
+    loop.run_sync(lambda: session.with_document_locked(change))
+    assert len(socket.sent) == 1
+
+    socket.queued_bytes = 1000
+    def change_more():
+        for i in range(5):
+            m.foo = 20 + i
+            source.stream(dict(a=[i]))
+    loop.run_sync(lambda: session.with_document_locked(change_more))
+    # held changes are coalesced as they arrive
+    if not socket.closed:
+        assert connection.held_event_count == 2
+    loop.run_sync(lambda: gen.sleep(0.01))
+    assert len(socket.sent) == 1
+
+    socket.queued_bytes = 0
+    loop.run_sync(lambda: gen.sleep(0.01))
+    loop.close()
+    return connection, socket
+
+def test_slow_client_coalesce():
+    connection, socket = _slow_client('coalesce')
+    assert not socket.closed
+    assert len(socket.sent) == 2
+    assert connection.held_event_count == 0
+    events = socket.sent[1].content['events']
+    assert len(events) == 2
+    # merged streams go where the first of them was
+    assert events[0]['kind'] == 'ColumnsStreamed'
+    assert events[0]['data'] == dict(a=[0, 1, 2, 3, 4])
+    assert events[1]['new'] == 24
+
+def test_slow_client_resync():
+    connection, socket = _slow_client('resync')
+    assert len(socket.sent) == 2
+    events = socket.sent[1].content['events']
+    assert len(events) == 2
+    assert events[0]['new'] == 24
+    assert events[1]['kind'] == 'ModelChanged'
+    assert events[1]['new'] == dict(a=[0, 0, 1, 2, 3, 4])
+
+def test_slow_client_held_events_limit():
+    connection, socket = _slow_client('coalesce', max_held_events=1)
+    assert socket.closed
+    assert connection.held_event_count == 0
+    assert len(socket.sent) == 1
+
+def test_slow_client_disconnect():
+    connection, socket = _slow_client('disconnect')
+    assert socket.closed
+    assert len(socket.sent) == 1
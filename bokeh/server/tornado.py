@@ -7,8 +7,9 @@ import logging
 log = logging.getLogger(__name__)
 
 import atexit
+from functools import partial
 # NOTE: needs PyPI backport on Python 2 (https://pypi.python.org/pypi/futures)
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import os
 import signal
 
@@ -19,9 +20,10 @@ from tornado.web import HTTPError
 
 from bokeh.resources import Resources
 from bokeh.settings import settings
+from bokeh.util.session_id import generate_session_id, session_id_worker
 
 from .urls import per_app_patterns, toplevel_patterns
-from .connection import ServerConnection
+from .connection import ServerConnection, SLOW_CLIENT_POLICIES, DEFAULT_SLOW_CLIENT_MAX_HELD_EVENTS
 from .application_context import ApplicationContext
 from .views.static_handler import StaticHandler
 
@@ -109,6 +111,31 @@ class BokehTornado(TornadoApplication):
         check_unused_sessions_milliseconds (int) : number of milliseconds between check for unused sessions
         unused_session_lifetime_milliseconds (int) : number of milliseconds for unused session lifetime
         stats_log_frequency_milliseconds (int) : number of milliseconds between logging stats
+        session_workers (int) : number of threads used to initialize session documents
+            Set to 0 to initialize session documents on the IO loop.
+        session_pool_size (int) : number of initialized sessions to keep ready for new users of each application
+            Set to 0 to initialize sessions only when they are requested.
+        websocket_compression_level (int) : zlib level (0-9) to compress websocket messages with
+            None disables compression. Clients must support permessage-deflate
+            for messages to be compressed.
+        websocket_max_message_size (int) : largest message to accept from clients, in bytes
+            Connections that send larger messages are closed. None for no limit.
+        decode_executor_min_size (int) : smallest message content, in bytes, to decode on ``executor``
+            Decoding large messages on the IO loop stops the server from serving
+            other clients meanwhile. None to always decode on the IO loop.
+        websocket_max_queued_bytes (int) : bytes of messages waiting to go out to a client before it counts as slow
+            None to never treat clients as slow.
+        slow_client_policy (str) : what to do with document changes for slow clients
+            One of "coalesce", "resync" or "disconnect", see ``ServerConnection``.
+        slow_client_max_held_events (int) : document changes to hold back for a slow client before disconnecting it
+            None for no limit.
+        executor (str) : kind of executor that ``run_in_executor`` runs functions on
+            Either "process" or "thread".
+        executor_workers (int) : number of processes or threads in the executor
+        worker_index (int) : index of this process among the server's worker processes
+        worker_addresses (list) : "host:port" addresses that each worker process listens on
+            Requests for sessions owned by other worker processes are forwarded to these
+            addresses. None or an empty list when the server runs a single process.
         develop (boolean) : True for develop mode
 
     '''
@@ -128,6 +155,25 @@ class BokehTornado(TornadoApplication):
                  unused_session_lifetime_milliseconds=60*30*1000,
                  # how often to log stats
                  stats_log_frequency_milliseconds=15000,
+                 # how many threads initialize session documents
+                 session_workers=0,
+                 # how many initialized sessions to keep ready per application
+                 session_pool_size=0,
+                 # permessage-deflate for websocket messages
+                 websocket_compression_level=None,
+                 # limits and offloading for large messages from clients
+                 websocket_max_message_size=None,
+                 decode_executor_min_size=1024*1024,
+                 # backpressure for clients that don't keep up
+                 websocket_max_queued_bytes=None,
+                 slow_client_policy='coalesce',
+                 slow_client_max_held_events=DEFAULT_SLOW_CLIENT_MAX_HELD_EVENTS,
+                 # where run_in_executor runs functions
+                 executor='process',
+                 executor_workers=4,
+                 # this process's place among the server's worker processes
+                 worker_index=0,
+                 worker_addresses=None,
                  develop=False):
 
         self._prefix = prefix
@@ -149,6 +195,38 @@ class BokehTornado(TornadoApplication):
         if stats_log_frequency_milliseconds <= 0:
             raise ValueError("stats_log_frequency_milliseconds must be > 0")
 
+        if session_workers < 0:
+            # 0 means "initialize on the IO loop"
+            raise ValueError("session_workers must be >= 0")
+
+        if session_pool_size < 0:
+            # 0 means "disable"
+            raise ValueError("session_pool_size must be >= 0")
+
+        if websocket_compression_level is not None and not 0 <= websocket_compression_level <= 9:
+            raise ValueError("websocket_compression_level must be between 0 and 9")
+
+        if websocket_max_message_size is not None and websocket_max_message_size <= 0:
+            raise ValueError("websocket_max_message_size must be > 0")
+
+        if decode_executor_min_size is not None and decode_executor_min_size < 0:
+            raise ValueError("decode_executor_min_size must be >= 0")
+
+        if websocket_max_queued_bytes is not None and websocket_max_queued_bytes < 0:
+            raise ValueError("websocket_max_queued_bytes must be >= 0")
+
+        if slow_client_policy not in SLOW_CLIENT_POLICIES:
+            raise ValueError("slow_client_policy must be one of %r, got %r" % (SLOW_CLIENT_POLICIES, slow_client_policy))
+
+        if slow_client_max_held_events is not None and slow_client_max_held_events <= 0:
+            raise ValueError("slow_client_max_held_events must be > 0")
+
+        if executor not in ('process', 'thread'):
+            raise ValueError("executor must be 'process' or 'thread', got %r" % executor)
+
+        if executor_workers <= 0:
+            raise ValueError("executor_workers must be > 0")
+
         self._hosts = set(hosts)
         self._websocket_origins = self._hosts | set(extra_websocket_origins)
         self._resources = {}
@@ -156,14 +234,56 @@ class BokehTornado(TornadoApplication):
         self._secret_key = secret_key
         self._sign_sessions = sign_sessions
         self._generate_session_ids = generate_session_ids
+        self._websocket_compression_level = websocket_compression_level
+        self._websocket_max_message_size = websocket_max_message_size
+        self._decode_executor_min_size = decode_executor_min_size
+        # msgtype : [number of messages, total seconds, most seconds]
+        self._decode_times = {}
+        self._websocket_max_queued_bytes = websocket_max_queued_bytes
+        self._slow_client_policy = slow_client_policy
+        self._slow_client_max_held_events = slow_client_max_held_events
+        self._bytes_sent = 0
+        self._wire_bytes_sent = 0
 
         log.debug("Allowed Host headers: %r", list(self._hosts))
         log.debug("These host origins can connect to the websocket: %r", list(self._websocket_origins))
 
+        if session_workers > 0:
+            log.debug("Initializing session documents with %d threads", session_workers)
+            self._session_executor = ThreadPoolExecutor(max_workers=session_workers)
+        else:
+            self._session_executor = None
+
+        log.debug("Running background functions with %d %s workers", executor_workers, executor)
+        if executor == 'process':
+            self._executor = ProcessPoolExecutor(max_workers=executor_workers)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=executor_workers)
+
+        self._worker_addresses = list(worker_addresses or [])
+        if self._worker_addresses and not 0 <= worker_index < len(self._worker_addresses):
+            raise ValueError("worker_index must be the index of an address in worker_addresses")
+        self._worker_index = worker_index
+        if self._worker_addresses:
+            log.debug("Running as worker %d of %d", worker_index, len(self._worker_addresses))
+
+        if session_pool_size > 0:
+            log.debug("Keeping %d initialized sessions ready per application", session_pool_size)
+        # only generate ids for sessions that this process owns
+        session_id_generator = partial(generate_session_id,
+                                       secret_key=self._secret_key,
+                                       signed=self._sign_sessions,
+                                       worker=worker_index,
+                                       num_workers=len(self._worker_addresses) or 1)
+
         # Wrap applications in ApplicationContext
         self._applications = dict()
         for k,v in applications.items():
-            self._applications[k] = ApplicationContext(v, self._develop, self._loop)
+            self._applications[k] = ApplicationContext(v, self._develop, self._loop,
+                                                       executor=self._executor,
+                                                       session_executor=self._session_executor,
+                                                       session_pool_size=session_pool_size,
+                                                       session_id_generator=session_id_generator)
 
         extra_patterns = extra_patterns or []
         all_patterns = []
@@ -200,7 +320,7 @@ class BokehTornado(TornadoApplication):
         super(BokehTornado, self).__init__(all_patterns)
 
         self._clients = set()
-        self._executor = ProcessPoolExecutor(max_workers=4)
+        self._forwarding_sockets = set()
         self._loop.add_callback(self._start_async)
         self._stats_job = PeriodicCallback(self.log_stats,
                                            stats_log_frequency_milliseconds,
@@ -223,6 +343,53 @@ class BokehTornado(TornadoApplication):
     def websocket_origins(self):
         return self._websocket_origins
 
+    @property
+    def websocket_compression_level(self):
+        return self._websocket_compression_level
+
+    @property
+    def websocket_max_message_size(self):
+        return self._websocket_max_message_size
+
+    @property
+    def decode_executor_min_size(self):
+        return self._decode_executor_min_size
+
+    @property
+    def decode_times(self):
+        ''' A dict from message type to the number of messages of that type
+        received from clients, and the total and longest number of seconds
+        it took to decode them.
+
+        '''
+        return dict((msgtype, tuple(times)) for msgtype, times in self._decode_times.items())
+
+    def record_decode_time(self, msgtype, seconds):
+        times = self._decode_times.get(msgtype)
+        if times is None:
+            times = self._decode_times[msgtype] = [0, 0.0, 0.0]
+        times[0] += 1
+        times[1] += seconds
+        times[2] = max(times[2], seconds)
+
+    @property
+    def bytes_sent(self):
+        ''' Number of bytes of websocket messages sent to clients. '''
+        return self._bytes_sent
+
+    @property
+    def wire_bytes_sent(self):
+        ''' Number of bytes the websocket messages sent to clients took
+        on the wire, after compression. Only counted when websocket
+        compression is enabled.
+
+        '''
+        return self._wire_bytes_sent
+
+    def record_bytes_sent(self, message_bytes, wire_bytes):
+        self._bytes_sent += message_bytes
+        self._wire_bytes_sent += wire_bytes
+
     @property
     def secret_key(self):
         return self._secret_key
@@ -235,6 +402,22 @@ class BokehTornado(TornadoApplication):
     def generate_session_ids(self):
         return self._generate_session_ids
 
+    @property
+    def worker_index(self):
+        return self._worker_index
+
+    def session_worker_address(self, session_id):
+        ''' Return the address of the worker process that owns a session,
+        or None if this process owns it.
+
+        '''
+        if len(self._worker_addresses) < 2:
+            return None
+        worker = session_id_worker(session_id, len(self._worker_addresses))
+        if worker == self._worker_index:
+            return None
+        return self._worker_addresses[worker]
+
     def root_url_for_request(self, request):
         return request.protocol + "://" + request.host + self._prefix + "/"
 
@@ -274,6 +457,7 @@ class BokehTornado(TornadoApplication):
 
         for context in self._applications.values():
             context.run_load_hook()
+            self._loop.add_callback(context.fill_session_pool)
 
         if start_loop:
             try:
@@ -308,7 +492,11 @@ class BokehTornado(TornadoApplication):
         return self._executor
 
     def new_connection(self, protocol, socket, application_context, session):
-        connection = ServerConnection(protocol, socket, application_context, session)
+        connection = ServerConnection(protocol, socket, application_context, session,
+                                      max_queued_bytes=self._websocket_max_queued_bytes,
+                                      slow_client_policy=self._slow_client_policy,
+                                      max_held_events=self._slow_client_max_held_events,
+                                      io_loop=self._loop)
         self._clients.add(connection)
         return connection
 
@@ -316,6 +504,12 @@ class BokehTornado(TornadoApplication):
         self._clients.discard(connection)
         connection.detach_session()
 
+    def new_forwarding_socket(self, socket):
+        self._forwarding_sockets.add(socket)
+
+    def forwarding_socket_lost(self, socket):
+        self._forwarding_sockets.discard(socket)
+
     def get_session(self, app_path, session_id):
         if app_path not in self._applications:
             raise ValueError("Application %s does not exist on this server" % app_path)
@@ -337,6 +531,19 @@ class BokehTornado(TornadoApplication):
             # avoid the work below if we aren't going to log anything
             return
         log.debug("[pid %d] %d clients connected", os.getpid(), len(self._clients))
+        if self._websocket_max_queued_bytes is not None:
+            behind = [c for c in self._clients if c.held_event_count > 0]
+            if behind:
+                log.debug("[pid %d] %d clients behind with %d held back document changes", os.getpid(),
+                          len(behind), sum(c.held_event_count for c in behind))
+        for msgtype, (count, total, longest) in sorted(self._decode_times.items()):
+            log.debug("[pid %d] decoded %d %s messages in %.3f s, longest %.3f s",
+                      os.getpid(), count, msgtype, total, longest)
+        if self._websocket_compression_level is not None:
+            log.debug("[pid %d] %d bytes of messages sent as %d compressed bytes",
+                      os.getpid(), self._bytes_sent, self._wire_bytes_sent)
+        if self._forwarding_sockets:
+            log.debug("[pid %d] %d clients forwarded to other workers", os.getpid(), len(self._forwarding_sockets))
         for app_path, app in self._applications.items():
             sessions = list(app.sessions)
             unused_count = 0
@@ -345,10 +552,18 @@ class BokehTornado(TornadoApplication):
                     unused_count += 1
             log.debug("[pid %d]   %s has %d sessions with %d unused",
                       os.getpid(), app_path, len(sessions), unused_count)
+            if app.session_pool_size > 0:
+                log.debug("[pid %d]   %s has %d of %d pooled sessions ready, %d pool hits and %d misses",
+                          os.getpid(), app_path, app.session_pool_ready, app.session_pool_size,
+                          app.session_pool_hits, app.session_pool_misses)
 
     def keep_alive(self):
         for c in self._clients:
             c.send_ping()
+        # the worker that owns the session pings the forwarding connection,
+        # keep the client side of it alive as well
+        for s in self._forwarding_sockets:
+            s.ping(b"0")
 
     @gen.coroutine
     def run_in_background(self, _func, *args, **kwargs):
@@ -388,4 +603,6 @@ class BokehTornado(TornadoApplication):
     def _cleanup(self):
         log.debug("Shutdown: cleaning up")
         self._executor.shutdown(wait=False)
+        if self._session_executor is not None:
+            self._session_executor.shutdown(wait=False)
         self._clients.clear()
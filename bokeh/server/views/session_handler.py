@@ -7,9 +7,17 @@ import logging
 log = logging.getLogger(__name__)
 
 from tornado import gen
+from tornado.httpclient import AsyncHTTPClient, HTTPRequest
 from tornado.web import RequestHandler, HTTPError
 
-from bokeh.util.session_id import generate_session_id, check_session_id_signature
+from bokeh.util.session_id import check_session_id_signature
+
+# headers of a worker's response that apply to its connection to this
+# process, rather than to the response itself
+_UNFORWARDED_HEADERS = set([
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailer', 'trailers', 'transfer-encoding', 'upgrade', 'content-length',
+])
 
 class SessionHandler(RequestHandler):
     ''' Implements a custom Tornado handler for document display page
@@ -21,13 +29,46 @@ class SessionHandler(RequestHandler):
         # Note: tornado_app is stored as self.application
         super(SessionHandler, self).__init__(tornado_app, *args, **kw)
 
+    @gen.coroutine
+    def prepare(self):
+        session_id = self.get_argument("bokeh-session-id", default=None)
+        if session_id is not None:
+            address = self.application.session_worker_address(session_id)
+            if address is not None:
+                yield self._forward_to_worker(address)
+
+    @gen.coroutine
+    def _forward_to_worker(self, address):
+        # the session lives in another worker process of this server,
+        # let that worker answer the request
+        log.debug("Forwarding request to worker at %s", address)
+        request = HTTPRequest("http://" + address + self.request.uri,
+                              headers=self.request.headers,
+                              follow_redirects=False)
+        response = yield AsyncHTTPClient().fetch(request, raise_error=False)
+        if response.code == 599:
+            log.error("Failed to forward request to worker at %s: %s", address, response.error)
+            raise HTTPError(status_code=502, reason="Failed to reach server worker")
+        self.set_status(response.code, response.reason)
+        forwarded = set()
+        for name, value in response.headers.get_all():
+            if name.lower() in _UNFORWARDED_HEADERS:
+                continue
+            if name not in forwarded:
+                # replace this handler's default value, if any
+                self.clear_header(name)
+                forwarded.add(name)
+            self.add_header(name, value)
+        self.finish(response.body)
+
     @gen.coroutine
     def get_session(self):
         session_id = self.get_argument("bokeh-session-id", default=None)
         if session_id is None:
             if self.application.generate_session_ids:
-                session_id = generate_session_id(secret_key=self.application.secret_key,
-                                                 signed=self.application.sign_sessions)
+                # may hand out a session from the pool of initialized sessions
+                session = yield self.application_context.create_new_session()
+                raise gen.Return(session)
             else:
                 log.debug("Server configured not to generate session IDs and none was provided")
                 raise HTTPError(status_code=403, reason="No bokeh-session-id provided")
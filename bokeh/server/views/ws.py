@@ -11,7 +11,9 @@ import codecs
 from six.moves.urllib.parse import urlparse
 
 from tornado import gen, locks
-from tornado.websocket import WebSocketHandler, WebSocketClosedError
+from tornado.escape import utf8
+from tornado.httpclient import HTTPRequest
+from tornado.websocket import WebSocketHandler, WebSocketClosedError, websocket_connect
 from tornado.concurrent import Future
 
 from ..exceptions import MessageError, ProtocolError, ValidationError
@@ -21,6 +23,8 @@ from ..protocol.receiver import Receiver
 from ..protocol.server_handler import ServerHandler
 
 from bokeh.util.session_id import check_session_id_signature
+from bokeh.util.tornado import (websocket_compression_options, websocket_write_buffer_size,
+                                write_websocket_message)
 
 class WSHandler(WebSocketHandler):
     ''' Implements a custom Tornado WebSocketHandler for the Bokeh Server.
@@ -32,15 +36,36 @@ class WSHandler(WebSocketHandler):
         self.connection = None
         self.application_context = kw['application_context']
         self.latest_pong = -1
+        # a Future for the connection to the worker process that owns the
+        # session, when it belongs to another worker
+        self.forwarding_connection = None
         # write_lock allows us to lock the connection to send multiple
         # messages atomically.
         self.write_lock = locks.Lock()
+        # receive_lock makes sure fragments are consumed in order even
+        # while the receiver waits for content to be decoded
+        self.receive_lock = locks.Lock()
+        # bytes of messages written, and bytes they took on the wire
+        # after compression and framing
+        self.bytes_sent = 0
+        self.wire_bytes_sent = 0
         # Note: tornado_app is stored as self.application
         super(WSHandler, self).__init__(tornado_app, *args, **kw)
 
     def initialize(self, application_context, bokeh_websocket_path):
         pass
 
+    @property
+    def queued_bytes(self):
+        ''' Number of bytes written to the websocket that are still waiting
+        to be sent over the network.
+
+        '''
+        return websocket_write_buffer_size(self.ws_connection)
+
+    def get_compression_options(self):
+        return websocket_compression_options(self.application.websocket_compression_level)
+
     def check_origin(self, origin):
         from ..tornado import check_whitelist
         parsed_origin = urlparse(origin)
@@ -79,6 +104,11 @@ class WSHandler(WebSocketHandler):
             log.error("Session id had invalid signature: %r", session_id)
             raise ProtocolError("Invalid session ID")
 
+        address = self.application.session_worker_address(session_id)
+        if address is not None:
+            self._forward_to_worker(address)
+            return
+
         def on_fully_opened(future):
             e = future.exception()
             if e is not None:
@@ -91,6 +121,38 @@ class WSHandler(WebSocketHandler):
         self.application.io_loop.add_future(future,
                                             on_fully_opened)
 
+    def _forward_to_worker(self, address):
+        # the session lives in another worker process of this server,
+        # relay all messages to and from that worker
+        log.debug("Forwarding WebSocket connection to worker at %s", address)
+        headers = dict((name, self.request.headers[name]) for name in ("Host", "Origin", "Cookie")
+                       if name in self.request.headers)
+        request = HTTPRequest("ws://" + address + self.request.uri, headers=headers)
+        self.forwarding_connection = websocket_connect(request)
+        self.application.new_forwarding_socket(self)
+        self.application.io_loop.add_future(self._relay_from_worker(), lambda future: future.result())
+
+    @gen.coroutine
+    def _relay_from_worker(self):
+        try:
+            connection = yield self.forwarding_connection
+        except Exception as e:
+            log.error("Failed to forward WebSocket connection to worker: %r", e)
+            self.close()
+            raise gen.Return(None)
+
+        while True:
+            fragment = yield connection.read_message()
+            if fragment is None:
+                break
+            try:
+                yield self.write_message(fragment, binary=isinstance(fragment, bytes))
+            except WebSocketClosedError:
+                break
+        self.close()
+
+        raise gen.Return(None)
+
     @gen.coroutine
     def _async_open(self, session_id, proto_version):
         try:
@@ -98,7 +160,13 @@ class WSHandler(WebSocketHandler):
             session = self.application_context.get_session(session_id)
 
             protocol = Protocol(proto_version)
-            self.receiver = Receiver(protocol)
+            decode_executor_min_size = self.application.decode_executor_min_size
+            decode_executor = self.application.executor if decode_executor_min_size is not None else None
+            self.receiver = Receiver(protocol,
+                                     max_message_size=self.application.websocket_max_message_size,
+                                     decode_executor=decode_executor,
+                                     decode_executor_min_size=decode_executor_min_size,
+                                     on_decoded=self.application.record_decode_time)
             log.debug("Receiver created for %r", protocol)
 
             self.handler = ServerHandler()
@@ -136,8 +204,18 @@ class WSHandler(WebSocketHandler):
         # do with them other than report them as an unhandled
         # Future
 
+        if self.forwarding_connection is not None:
+            try:
+                connection = yield self.forwarding_connection
+                connection.write_message(fragment, binary=isinstance(fragment, bytes))
+            except Exception as e:
+                log.error("Failed to forward a message to worker: %r", e)
+                self.close()
+            raise gen.Return(None)
+
         try:
-            message = yield self._receive(fragment)
+            with (yield self.receive_lock.acquire()):
+                message = yield self._receive(fragment)
         except Exception as e:
             # If you go look at self._receive, it's catching the
             # expected error types... here we have something weird.
@@ -189,7 +267,20 @@ class WSHandler(WebSocketHandler):
     def write_message(self, message, binary=False, locked=True):
         ''' Override parent write_message with a version that consistently returns Future across Tornado versions '''
         def write_message_unlocked():
-            future = super(WSHandler, self).write_message(message, binary)
+            if self.ws_connection is None:
+                raise WebSocketClosedError()
+            if self.application.websocket_compression_level is None:
+                # nothing to measure, bytes on the wire are only counted
+                # to report how well messages compress
+                data = utf8(message)
+                future = super(WSHandler, self).write_message(data, binary)
+                message_bytes, wire_bytes = len(data), 0
+            else:
+                future, message_bytes, wire_bytes = write_websocket_message(
+                    self.ws_connection, message, binary)
+            self.bytes_sent += message_bytes
+            self.wire_bytes_sent += wire_bytes
+            self.application.record_bytes_sent(message_bytes, wire_bytes)
             if future is None:
                 # tornado >= 4.3 gives us a Future, simulate that
                 # with this fake Future on < 4.3
@@ -212,6 +303,10 @@ class WSHandler(WebSocketHandler):
                  self.close_code, self.close_reason)
         if self.connection is not None:
             self.application.client_lost(self.connection)
+        if self.forwarding_connection is not None:
+            self.application.forwarding_socket_lost(self)
+            if self.forwarding_connection.done() and self.forwarding_connection.exception() is None:
+                self.forwarding_connection.result().close()
 
     @gen.coroutine
     def _receive(self, fragment):
@@ -76,6 +76,13 @@ class Settings(object):
         '''
         return self._get_str("VERSION", default)
 
+    def container_validation(self, default="full"):
+        ''' Set how thoroughly the items of container property values are
+        validated.
+
+        '''
+        return self._get_str("CONTAINER_VALIDATION", default)
+
     def docs_cdn(self, default=None):
         ''' Set the version of BokehJS should use for CDN resources when
         building the docs.
@@ -95,6 +102,12 @@ class Settings(object):
         '''
         return self._get_bool("MINIFIED", default, False)
 
+    def json_serializer(self, default="default"):
+        ''' Set which engine Bokeh should use to serialize JSON.
+
+        '''
+        return self._get_str("JSON_SERIALIZER", default)
+
     def log_level(self, default=None):
         ''' Set the log level for JavaScript BokehJS code.
 
@@ -230,6 +243,21 @@ class Settings(object):
 #:
 #:  Accepted values are ``yes``/``no``, ``true``/``false`` or ``0``/``1``.
 #:
+#: ``BOKEH_CONTAINER_VALIDATION`` --- How to validate the items of container
+#:   properties (``List``, ``Dict``, etc.) when they are set
+#:   Valid values are:
+#:
+#:   - ``full``: validate every item
+#:   - ``sampled``: validate a fixed size sample of the items of large
+#:     containers
+#:   - ``trusted``: only validate the type of the container itself
+#:
+#:   NumPy arrays with a dtype matching the item type are always accepted
+#:   without checking their items. In every mode, ``Document.validate()``
+#:   fully validates the items of all container properties.
+#:
+#:   The default mode is ``full``.
+#:
 #: ``BOKEH_DOCS_CDN`` --- What version of BokehJS to use when building sphinx
 #:   `~bokeh.resources.Resources` class reference for full details.
 #:
@@ -260,6 +288,15 @@ class Settings(object):
 #:       This variable is only used when building documentation from the
 #:       development version.
 #:
+#: ``BOKEH_JSON_SERIALIZER`` --- What engine to use to serialize JSON
+#:   Valid values are:
+#:
+#:   - ``default``: the standard library ``json`` module, with sorted keys
+#:   - ``fast``: a faster engine for large documents, see
+#:     :func:`~bokeh.core.json_encoder.serialize_json` for details
+#:
+#:   The default engine is ``default``.
+#:
 #: ``BOKEH_LOG_LEVEL`` --- The BokehJS console logging level to use
 #:   Valid values are, in order of increasing severity:
 #:
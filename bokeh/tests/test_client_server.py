@@ -258,6 +258,37 @@ class TestClientServer(unittest.TestCase):
             client_session.loop_until_closed()
             assert not client_session.connected
 
+    def test_push_document_decoded_in_executor(self):
+        application = Application()
+        with ManagedServerLoop(application, executor='thread', decode_executor_min_size=0) as server:
+            doc = document.Document()
+            doc.add_root(DictModel(values=dict(a=list(range(1000)))))
+
+            client_session = push_session(doc,
+                                          session_id='test_push_document_decoded_in_executor',
+                                          url=url(server),
+                                          io_loop=server.io_loop)
+
+            server_session = server.get_session('/', client_session.id)
+            assert server_session.document.roots[0].values == dict(a=list(range(1000)))
+            assert server._tornado.decode_times['PUSH-DOC'][0] == 1
+
+            client_session.close()
+            client_session.loop_until_closed()
+
+    def test_push_document_too_large(self):
+        application = Application()
+        with ManagedServerLoop(application, websocket_max_message_size=1000) as server:
+            doc = document.Document()
+            doc.add_root(DictModel(values=dict(a=list(range(1000)))))
+
+            with self.assertRaises(RuntimeError):
+                push_session(doc,
+                             session_id='test_push_document_too_large',
+                             url=url(server),
+                             io_loop=server.io_loop)
+            assert server.get_session('/', 'test_push_document_too_large').document.roots == []
+
     def test_pull_document(self):
         application = Application()
         def add_roots(doc):
@@ -3,12 +3,17 @@ from __future__ import absolute_import, print_function
 import unittest
 
 from copy import copy
+import json
+import os
+
+import numpy as np
 
 import bokeh.document as document
 from bokeh.io import curdoc
 from bokeh.model import Model
 from bokeh.models import ColumnDataSource
-from bokeh.core.properties import Int, Instance, String, DistanceSpec
+from bokeh.core.properties import Int, Instance, List, String, DistanceSpec
+from bokeh.core.query import IN
 
 class AnotherModelInTestDocument(Model):
     bar = Int(1)
@@ -17,6 +22,9 @@ class SomeModelInTestDocument(Model):
     foo = Int(2)
     child = Instance(Model)
 
+class ModelWithListInTestDocument(Model):
+    children = List(Instance(Model))
+
 class ModelThatOverridesName(Model):
     name = String()
 
@@ -204,6 +212,71 @@ class TestDocument(unittest.TestCase):
         assert set([child3, root3]) == set(d.select(dict(foo=57)))
         assert set([child3, root3]) == set(root3.select(dict(foo=57)))
 
+    def test_select_by_type_and_tags(self):
+        d = document.Document()
+        root1 = SomeModelInTestDocument(foo=42, tags=['a', 1])
+        child1 = AnotherModelInTestDocument(tags=['b'])
+        root2 = ModelWithListInTestDocument(tags=[['unhashable']])
+        root1.child = child1
+        d.add_root(root1)
+        d.add_root(root2)
+
+        assert set([root1]) == set(d.select(dict(type=SomeModelInTestDocument)))
+        assert set([root1, child1, root2]) == set(d.select(dict(type=Model)))
+        assert set([child1, root2]) == set(d.select(dict(type={IN: [AnotherModelInTestDocument, ModelWithListInTestDocument]})))
+        assert set([root1]) == set(d.select(dict(tags='a')))
+        assert set([root1]) == set(d.select(dict(tags=1)))
+        assert set([root1, child1]) == set(d.select(dict(tags=['a', 'b'])))
+        assert set([root2]) == set(d.select(dict(tags=['unhashable'])))
+        assert set([root1]) == set(d.select(dict(type=SomeModelInTestDocument, tags='a')))
+        assert set() == set(d.select(dict(type=SomeModelInTestDocument, tags='b')))
+
+        # the index follows changes to tags and to the models in the document
+        child1.tags = ['a']
+        assert set([root1, child1]) == set(d.select(dict(tags='a')))
+        assert set() == set(d.select(dict(tags='b')))
+        root1.tags.append('b')
+        assert set([root1]) == set(d.select(dict(tags='b')))
+        root1.child = None
+        assert set() == set(d.select(dict(type=AnotherModelInTestDocument)))
+        assert set([root1]) == set(d.select(dict(tags='a')))
+        d.remove_root(root2)
+        assert set([root1]) == set(d.select(dict(type=Model)))
+
+    def test_select_on_object_follows_references(self):
+        root = ModelWithListInTestDocument()
+        child1 = SomeModelInTestDocument(name='a')
+        root.children = [child1]
+        assert set([child1]) == set(root.select(dict(type=SomeModelInTestDocument)))
+
+        # appended references are added to the cached index
+        index = root._references_index()
+        grandchild = AnotherModelInTestDocument(tags=['x'])
+        child2 = SomeModelInTestDocument(child=grandchild)
+        root.children = root.children + [child2]
+        assert root._references_index() is index
+        assert set([child1, child2]) == set(root.select(dict(type=SomeModelInTestDocument)))
+        assert set([grandchild]) == set(root.select(dict(tags='x')))
+
+        # so are changes further down
+        child1.child = AnotherModelInTestDocument(name='b')
+        assert set([child1.child]) == set(root.select(dict(name='b')))
+        grandchild.tags = ['y']
+        assert set([grandchild]) == set(root.select(dict(tags='y')))
+
+        # only the indexes that contain a model know about it
+        other = SomeModelInTestDocument()
+        other_index = other._references_index()
+        assert set(child1._references_indexes) == set([index])
+        assert set(other._references_indexes) == set([other_index])
+
+        # removing references rebuilds it
+        root.children = [child1]
+        assert index.stale
+        assert index not in set(child1._references_indexes)
+        assert set([child1]) == set(root.select(dict(type=SomeModelInTestDocument)))
+        assert set() == set(root.select(dict(tags='y')))
+
     def test_is_single_string_selector(self):
         d = document.Document()
         # this is an implementation detail but just ensuring it works
@@ -271,6 +344,92 @@ class TestDocument(unittest.TestCase):
         d.remove_root(root2)
         assert len(d._all_models) == 0
 
+    def test_all_models_with_unreachable_cycle(self):
+        d = document.Document()
+        root = SomeModelInTestDocument()
+        child1 = SomeModelInTestDocument()
+        child2 = SomeModelInTestDocument()
+        root.child = child1
+        child1.child = child2
+        child2.child = child1
+        d.add_root(root)
+        assert len(d._all_models) == 3
+        root.child = child2
+        assert len(d._all_models) == 3
+        root.child = None
+        assert len(d._all_models) == 1
+        assert child1.document is None
+        assert child2.document is None
+        child2.child = child2
+        root.child = child2
+        assert len(d._all_models) == 2
+        assert child2.document is d
+        root.child = None
+        assert len(d._all_models) == 1
+        assert d._model_ref_counts == {root._id: 1}
+
+    def test_all_models_with_duplicate_references(self):
+        d = document.Document()
+        root = ModelWithListInTestDocument()
+        child = AnotherModelInTestDocument()
+        d.add_root(root)
+        root.children.append(child)
+        root.children.append(child)
+        assert len(d._all_models) == 2
+        root.children.remove(child)
+        assert len(d._all_models) == 2
+        assert child.document is d
+        root.children.remove(child)
+        assert len(d._all_models) == 1
+        assert child.document is None
+
+    def test_validate_deferred_container_items(self):
+        d = document.Document()
+        root = ModelWithListInTestDocument()
+        d.add_root(root)
+        old = os.environ.get("BOKEH_CONTAINER_VALIDATION")
+        os.environ["BOKEH_CONTAINER_VALIDATION"] = "trusted"
+        try:
+            root.children = [AnotherModelInTestDocument(), 10]
+            with self.assertRaises(ValueError):
+                d.validate()
+            root.children = [AnotherModelInTestDocument()]
+            d.validate()
+        finally:
+            if old is None:
+                del os.environ["BOKEH_CONTAINER_VALIDATION"]
+            else:
+                os.environ["BOKEH_CONTAINER_VALIDATION"] = old
+
+    def test_clone_into(self):
+        from bokeh.plotting import Figure
+        d = document.Document()
+        source = ColumnDataSource(data=dict(x=np.array([1, 2, 3]), y=[4, 5, 6]))
+        p = Figure(title="clone")
+        p.circle('x', 'y', source=source)
+        d.add_root(p)
+        d.title = "Cloned"
+
+        d2 = document.Document()
+        d._clone_into(d2)
+        assert d2.title == "Cloned"
+        assert len(d2._all_models) == len(d._all_models)
+        assert not set(d2._all_models) & set(d._all_models)
+        assert sorted(type(m).__name__ for m in d2._all_models.values()) == \
+            sorted(type(m).__name__ for m in d._all_models.values())
+
+        p2 = d2.roots[0]
+        assert p2.title == "clone"
+        source2 = p2.select_one(dict(type=ColumnDataSource))
+        assert source2.data['y'] == [4, 5, 6]
+        assert source2.data['x'] is not source.data['x']
+        source2.data['y'].append(7)
+        assert source.data['y'] == [4, 5, 6]
+
+        with p2.batch():
+            r = p2.line('x', 'y', source=source2)
+        assert p2.renderers[-1] is r
+
     def test_change_notification(self):
         d = document.Document()
         assert not d.roots
@@ -326,6 +485,85 @@ class TestDocument(unittest.TestCase):
         assert len(curdoc_from_listener) == 1
         assert curdoc_from_listener[0] is d
 
+    def test_stream_notification_for_dispatch_receiver(self):
+        d = document.Document()
+        m = ColumnDataSource(data=dict(a=[10], b=[20]))
+        d.add_root(m)
+        class Receiver(object):
+            def __init__(self):
+                self.events = []
+            def _document_patched(self, event):
+                self.events.append(event)
+        receiver = Receiver()
+        d.on_change_dispatch_to(receiver)
+        m.stream(dict(a=[11, 12], b=[21, 22]), 200)
+        assert len(receiver.events) == 1
+        event = receiver.events[0]
+        assert isinstance(event.hint, document.ColumnsStreamedEvent)
+        # sessions only need the hint, so no old value is saved
+        assert event.old is None
+        assert event.new == dict(a=[10, 11, 12], b=[20, 21, 22])
+
+    def test_patch_notification(self):
+        d = document.Document()
+        m = ColumnDataSource(data=dict(a=[10, 11], b=[20, 21]))
+        d.add_root(m)
+        events = []
+        def listener(event):
+            events.append(event)
+        d.on_change(listener)
+        m.patch(dict(a=[(0, 1)], b=[(slice(0, 2), [2, 3])]))
+        assert len(events) == 1
+        event = events[0]
+        assert isinstance(event, document.ModelChangedEvent)
+        assert isinstance(event.hint, document.ColumnsPatchedEvent)
+        assert event.hint.column_source == m
+        assert event.hint.patches == dict(a=[(0, 1)], b=[(slice(0, 2), [2, 3])])
+        assert event.attr == 'data'
+        assert event.old == dict(a=[10, 11], b=[20, 21])
+        assert event.new == dict(a=[1, 11], b=[2, 3])
+
+    def test_patch_json_roundtrip(self):
+        d = document.Document()
+        m = ColumnDataSource(data=dict(a=np.arange(5), b=list(range(5))))
+        d.add_root(m)
+        copy = document.Document.from_json_string(d.to_json_string())
+        events = []
+        d.on_change(lambda event: events.append(event))
+        m.patch(dict(a=[(1, 10), (slice(2, None, 2), [20, 40])], b=[(0, 100)]))
+        patch = d.create_json_patch_string(events)
+        assert '"ColumnsPatched"' in patch
+        assert '"ModelChanged"' not in patch
+        copy.apply_json_patch_string(patch)
+        patched = copy.get_model_by_id(m._id)
+        assert list(patched.data['a']) == [0, 10, 20, 3, 40]
+        assert list(patched.data['b']) == [100, 1, 2, 3, 4]
+
+    def test_to_json(self):
+        d = document.Document()
+        d.add_root(ColumnDataSource(data=dict(a=np.arange(3), b=[1.5, float('nan'), 2])))
+        d.add_root(AnotherModelInTestDocument(bar=43))
+        d.title = "Title"
+        assert d.to_json() == json.loads(d.to_json_string())
+
+    def test_create_json_patch(self):
+        d = document.Document()
+        m = SomeModelInTestDocument()
+        d.add_root(m)
+        events = []
+        d.on_change(lambda event: events.append(event))
+        m.foo = 57
+        m.child = AnotherModelInTestDocument(bar=3)
+        d.title = "New Title"
+        patch = d.create_json_patch(events)
+        assert patch == json.loads(d.create_json_patch_string(events))
+        copy = document.Document()
+        copy.add_root(SomeModelInTestDocument(id=m._id))
+        copy.apply_json_patch(patch)
+        assert copy.roots[0].foo == 57
+        assert copy.roots[0].child.bar == 3
+        assert copy.title == "New Title"
+
     def test_change_notification_removal(self):
         d = document.Document()
         assert not d.roots
@@ -6,7 +6,7 @@ import unittest
 import bs4
 
 import bokeh.embed as embed
-from bokeh.resources import CDN, JSResources, CSSResources
+from bokeh.resources import CDN, JSResources, CSSResources, Resources
 from bokeh.plotting import figure
 from bokeh.util.string import encode_utf8
 from jinja2 import Template
@@ -256,5 +256,30 @@ class TestAutoloadServer(unittest.TestCase):
     def test_autoload_server_value_error_on_model_id_without_session_id(self):
         self.assertRaises(ValueError, embed.autoload_server, _embed_test_plot)
 
+class TestServerHTMLPageForSession(unittest.TestCase):
+
+    def _uncached_page(self, session_id, resources, title, websocket_url):
+        render_items = [{ 'sessionid' : session_id, 'elementid' : 'ID', 'use_for_title' : True }]
+        bundle = embed._bundle_for_objs_and_resources(None, resources)
+        return embed._html_page_for_render_items(bundle, {}, render_items, title, websocket_url=websocket_url)
+
+    @mock.patch('bokeh.embed.make_id', new=_stable_id)
+    def test_matches_uncached_page(self):
+        resources = Resources(mode="server", root_url="http://localhost:5006/")
+        for title in [None, "", "Title"]:
+            for session_id in ["abc", 'a"b']:
+                page = embed.server_html_page_for_session(session_id, resources, title, "ws://localhost:5006/ws")
+                self.assertEqual(page, self._uncached_page(session_id, resources, title, "ws://localhost:5006/ws"))
+
+    def test_template_cached_per_resources(self):
+        resources = Resources(mode="server", root_url="http://localhost:5006/")
+        template = embed._server_page_template(resources)
+        self.assertIs(template, embed._server_page_template(resources))
+        other = Resources(mode="server", root_url="http://example.com/")
+        self.assertIsNot(template, embed._server_page_template(other))
+        page = embed.server_html_page_for_session("abc", other, "Title", "ws://example.com/ws")
+        self.assertIn("http://example.com/static/js/bokeh.min.js", page)
+        self.assertIn('"ws://example.com/ws"', page)
+
 if __name__ == "__main__":
     unittest.main()
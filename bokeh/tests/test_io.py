@@ -8,11 +8,16 @@
 
 from __future__ import absolute_import
 from mock import patch, Mock
+import json
+import os
+import shutil
+import tempfile
 import unittest
 
 import bokeh.io as io
 from bokeh.resources import Resources, _SessionCoordinates
 from bokeh.document import Document
+from bokeh.models import ColumnDataSource
 from bokeh.models.plots import Plot
 
 class TestDefaultState(unittest.TestCase):
@@ -148,6 +153,35 @@ class Test_GetSaveArgs(DefaultStateTester):
 class Test_SaveHelper(DefaultStateTester):
     pass
 
+def _make_plot(title):
+    return Plot(title=title)
+
+class TestSaveMany(DefaultStateTester):
+
+    def _check_saved(self, num_procs):
+        dirname = tempfile.mkdtemp()
+        try:
+            jobs = [(os.path.join(dirname, "%d.html" % i), ("plot %d" % i,)) for i in range(3)]
+            filenames = io.save_many(_make_plot, jobs, title="title", num_procs=num_procs)
+            self.assertEqual(filenames, [filename for filename, _ in jobs])
+            for i, filename in enumerate(filenames):
+                with open(filename) as f:
+                    html = f.read()
+                self.assertIn("<title>title</title>", html)
+                self.assertIn("plot %d" % i, html)
+        finally:
+            shutil.rmtree(dirname)
+
+    def test_in_process(self):
+        self._check_saved(1)
+
+    def test_in_process_pool(self):
+        self._check_saved(2)
+
+    def test_error(self):
+        with self.assertRaises(TypeError):
+            io.save_many(_make_plot, [("unused.html", ())], num_procs=1)
+
 class TestPush(DefaultStateTester):
 
     @patch('bokeh.io._push_to_server')
@@ -367,6 +401,117 @@ class Test_ShowNotebookWithState(DefaultStateTester):
         io._show_notebook_with_state("obj", s)
         self._check_func_called(mock_publish_display_data, ({"text/html": "notebook_div"},), {})
 
+class Test_PushNotebook(DefaultStateTester):
+
+    def _show(self, s):
+        comms = Mock()
+        s.output_notebook()
+        s.document.add_root(Plot(title="first"))
+        with patch('bokeh.io.get_comms', return_value=comms), \
+             patch('bokeh.io.publish_display_data'), \
+             patch('bokeh.io.notebook_div', return_value="notebook_div"):
+            io._show_notebook_with_state(s.document.roots[0], s)
+        return comms
+
+    def _sent(self, comms):
+        self.assertEqual(comms.send.call_count, 1)
+        msg = json.loads(comms.send.call_args[0][0])
+        comms.send.reset_mock()
+        return msg
+
+    def test_sends_only_changes(self):
+        s = io.State()
+        comms = self._show(s)
+        plot = s.document.roots[0]
+        plot.title = "second"
+        plot.title = "third"
+        io.push_notebook(state=s)
+
+        msg = self._sent(comms)
+        self.assertEqual(msg['references'], [])
+        self.assertEqual(msg['events'], [{'kind' : 'ModelChanged', 'model' : plot.ref,
+                                          'attr' : 'title', 'new' : 'third'}])
+
+        plot.title = "fourth"
+        io.push_notebook(state=s)
+        msg = self._sent(comms)
+        self.assertEqual([e['new'] for e in msg['events']], ['fourth'])
+
+    def _show_source(self, s):
+        comms = self._show(s)
+        source = ColumnDataSource(data=dict(x=list(range(1000))))
+        s.document.add_root(source)
+        io.push_notebook(state=s)
+        self._sent(comms)
+        return comms, source
+
+    def test_sends_streamed_data(self):
+        s = io.State()
+        comms, source = self._show_source(s)
+        source.stream(dict(x=[1000]))
+        source.stream(dict(x=[1001]))
+        io.push_notebook(state=s)
+        self.assertEqual(self._sent(comms)['events'], [{'kind' : 'ColumnsStreamed', 'column_source' : source.ref,
+                                                        'data' : {'x' : [1000, 1001]}, 'rollover' : None}])
+
+    def test_sends_patches(self):
+        s = io.State()
+        comms, source = self._show_source(s)
+        source.patch(dict(x=[(0, 10)]))
+        io.push_notebook(state=s)
+        self.assertEqual(self._sent(comms)['events'], [{'kind' : 'ColumnsPatched', 'column_source' : source.ref,
+                                                        'patches' : {'x' : [[0, 10]]}}])
+
+    def test_nothing_changed(self):
+        s = io.State()
+        comms = self._show(s)
+        io.push_notebook(state=s)
+        self.assertFalse(comms.send.called)
+
+    def test_other_document(self):
+        s = io.State()
+        comms = self._show(s)
+        doc = Document()
+        doc.add_root(Plot())
+        io.push_notebook(document=doc, state=s)
+        self.assertEqual(list(self._sent(comms).keys()), ['doc'])
+
+        # changes to the new document are recorded from now on
+        doc.roots[0].title = "changed"
+        s.document.roots[0].title = "ignored"
+        io.push_notebook(document=doc, state=s)
+        self.assertEqual([e['new'] for e in self._sent(comms)['events']], ['changed'])
+
+    def test_too_many_changes(self):
+        s = io.State()
+        comms = self._show(s)
+        plot = s.document.roots[0]
+        with patch.object(io._CommsHandle, '_max_recorded_events', 2):
+            # repeated changes to a property are coalesced
+            for i in range(3):
+                plot.title = str(i)
+            plot.plot_width = 100
+            io.push_notebook(state=s)
+            self.assertEqual([e['new'] for e in self._sent(comms)['events']], ['2', 100])
+
+            plot.title = "changed"
+            plot.plot_width = 200
+            plot.plot_height = 200
+            io.push_notebook(state=s)
+        self.assertEqual(list(self._sent(comms).keys()), ['doc'])
+
+    def test_show_again_closes_last_handle(self):
+        s = io.State()
+        self._show(s)
+        first = s.last_comms_handle
+        comms = self._show(s)
+        self.assertIsNone(first.doc)
+        self.assertIsNone(first.events)
+        s.document.roots[0].title = "changed"
+        self.assertIsNone(first.events)
+        io.push_notebook(state=s)
+        self.assertEqual([e['new'] for e in self._sent(comms)['events']], ['changed'])
+
 class Test_ShowServerWithState(DefaultStateTester):
 
     @patch('bokeh.io.push')
@@ -3,6 +3,8 @@ from __future__ import absolute_import
 import unittest
 
 import os
+import shutil
+import tempfile
 
 import bokeh.resources as resources
 from bokeh.resources import _get_cdn_urls, websocket_url_for_server_url
@@ -217,3 +219,26 @@ class TestResources(unittest.TestCase):
 
         for mode in ("inline", "cdn", "relative", "relative-dev", "absolute", "absolute-dev"):
             self.assertRaises(ValueError, resources.Resources, mode, root_url="foo")
+
+    def test_inline_is_cached_until_file_changes(self):
+        dirname = tempfile.mkdtemp()
+        try:
+            path = os.path.join(dirname, "bokeh.min.js")
+            with open(path, "w") as f:
+                f.write("first")
+            r = resources.Resources(mode="inline")
+            inline = r._inline(path)
+            self.assertIn("first", inline)
+            self.assertIs(r._inline(path), inline)
+
+            with open(path, "w") as f:
+                f.write("second")
+            os.utime(path, (0, 0))
+            self.assertIn("second", r._inline(path))
+        finally:
+            shutil.rmtree(dirname)
+
+    def test_render_js_is_cached(self):
+        r = resources.Resources(mode="cdn")
+        self.assertIs(r.render_js(), r.render_js())
+        self.assertIs(r.render_css(), r.render_css())
@@ -0,0 +1,118 @@
+''' Functions for choosing which points of a large data series to show.
+
+Each function returns the indices of the points to keep, in increasing
+order, so that the same points can be taken from every column of a data
+source.
+
+'''
+from __future__ import absolute_import, division
+
+import numpy as np
+
+def visible_slice(x, start=None, end=None):
+    ''' Find the points of a sorted series that are between ``start`` and
+    ``end``, plus the point just outside each end, so that lines drawn
+    through the points reach the edges of the range.
+
+    Args:
+        x (np.ndarray) : the x-coordinates of the points, in increasing order
+        start (float, optional) : the start of the range (default: None)
+            If None, start at the first point.
+        end (float, optional) : the end of the range (default: None)
+            If None, end at the last point.
+
+    Returns:
+        tuple(int, int) : the start and stop of the slice of points
+
+    '''
+    if start is not None and end is not None and start > end:
+        start, end = end, start
+    lo = 0 if start is None else max(int(np.searchsorted(x, start, 'left')) - 1, 0)
+    hi = len(x) if end is None else min(int(np.searchsorted(x, end, 'right')) + 1, len(x))
+    return lo, max(lo, hi)
+
+def _check_count(n):
+    if n < 4:
+        raise ValueError("can't downsample to fewer than 4 points, got %d" % n)
+
+def stride_indices(start, stop, n):
+    ''' Keep every k-th point of ``start:stop``, and the last point, for at
+    most ``n`` points.
+
+    Returns:
+        np.ndarray
+
+    '''
+    _check_count(n)
+    if stop - start <= n:
+        return np.arange(start, stop)
+    step = -(-(stop - start) // (n - 1))
+    return np.append(np.arange(start, stop - 1, step), stop - 1)
+
+def minmax_indices(y, start, stop, n):
+    ''' Keep the first and last points of ``start:stop`` and the lowest and
+    highest point of each of a number of buckets of the points in between,
+    for at most ``n`` points.
+
+    For evenly spaced points, when there are about as many buckets as
+    there are pixels across the plot, a line through these points looks
+    the same as a line through all of them.
+
+    Returns:
+        np.ndarray
+
+    '''
+    _check_count(n)
+    if stop - start <= n:
+        return np.arange(start, stop)
+
+    first, last = start + 1, stop - 1
+    size = -(-(last - first) // ((n - 2) // 2))
+    full = first + (last - first) // size * size
+
+    indices = [[start]]
+    if full > first:
+        buckets = np.asarray(y[first:full]).reshape(-1, size)
+        offsets = np.arange(first, full, size)
+        indices.append(offsets + buckets.argmin(axis=1))
+        indices.append(offsets + buckets.argmax(axis=1))
+    if last > full:
+        rest = np.asarray(y[full:last])
+        indices.append([full + rest.argmin(), full + rest.argmax()])
+    indices.append([last])
+    return np.unique(np.concatenate(indices).astype(np.int64))
+
+def lttb_indices(x, y, start, stop, n):
+    ''' Keep ``n`` points of ``start:stop`` chosen with the Largest
+    Triangle Three Buckets algorithm, which keeps the overall shape of a
+    line better than the other methods, but takes longer.
+
+    The points in between the first and last point are split into ``n - 2``
+    buckets, and from each bucket the point that makes the largest
+    triangle with the point kept from the previous bucket and the average
+    of the next bucket is kept.
+
+    Returns:
+        np.ndarray
+
+    '''
+    _check_count(n)
+    if stop - start <= n:
+        return np.arange(start, stop)
+
+    edges = np.linspace(start + 1, stop - 1, n - 1).astype(np.int64)
+    indices = np.empty(n, dtype=np.int64)
+    indices[0], indices[-1] = start, stop - 1
+
+    a = start
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = (edges[i + 1], edges[i + 2]) if i + 2 < n - 1 else (stop - 1, stop)
+        avg_x = np.mean(x[next_lo:next_hi], dtype=np.float64)
+        avg_y = np.mean(y[next_lo:next_hi], dtype=np.float64)
+        ax, ay = float(x[a]), float(y[a])
+        bx, by = np.asarray(x[lo:hi], dtype=np.float64), np.asarray(y[lo:hi], dtype=np.float64)
+        area = np.abs((ax - avg_x) * (by - ay) - (ax - bx) * (avg_y - ay))
+        a = lo + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
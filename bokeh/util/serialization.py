@@ -23,6 +23,22 @@ log = logging.getLogger(__name__)
 
 _simple_id = 1000
 
+if is_numpy:
+    # dtypes that BokehJS can view directly as a typed array, without any
+    # conversion, when they are sent as binary buffers
+    BINARY_ARRAY_TYPES = set([
+        np.dtype(np.float32),
+        np.dtype(np.float64),
+        np.dtype(np.uint8),
+        np.dtype(np.int8),
+        np.dtype(np.uint16),
+        np.dtype(np.int16),
+        np.dtype(np.uint32),
+        np.dtype(np.int32),
+    ])
+else:
+    BINARY_ARRAY_TYPES = set()
+
 def make_id():
     """ Return a new unique ID for a Bokeh object.
 
@@ -78,6 +94,19 @@ def transform_numerical_array(obj):
         obj = obj.filled(np.nan)  # Set masked values to nan
     if not np.isnan(obj).any() and not np.isinf(obj).any():
         return obj.tolist()
+    elif obj.ndim == 1:
+        # only replace the non-finite values, rather than converting
+        # the whole array to objects
+        transformed = obj.tolist()
+        for i in np.flatnonzero(~np.isfinite(obj)).tolist():
+            value = transformed[i]
+            if value != value:
+                transformed[i] = 'NaN'
+            elif value > 0:
+                transformed[i] = 'Infinity'
+            else:
+                transformed[i] = '-Infinity'
+        return transformed
     else:
         transformed = obj.astype('object')
         transformed[np.isnan(obj)] = 'NaN'
@@ -115,16 +144,105 @@ def traverse_data(datum, is_numpy=is_numpy, use_numpy=True):
             datum_copy.append(item)
     return datum_copy
 
-def transform_column_source_data(data):
+def transform_column_source_data(data, buffers=None):
     """iterate through the data of a ColumnSourceData object replacing
     non-JSON-compliant objects with compliant ones
+
+    If ``buffers`` is a list, NumPy arrays with a dtype that BokehJS can
+    consume directly are not converted to lists, but are appended to
+    ``buffers`` and replaced with a reference to the buffer (see
+    ``encode_binary_dict``).
     """
     data_copy = {}
     for key in iterkeys(data):
-        if pd and isinstance(data[key], (pd.Series, pd.Index)):
-            data_copy[key] = transform_series(data[key])
-        elif isinstance(data[key], np.ndarray):
-            data_copy[key] = transform_array(data[key])
+        value = data[key]
+        if pd and isinstance(value, (pd.Series, pd.Index)):
+            value = value.values
+            if not isinstance(value, np.ndarray):
+                data_copy[key] = transform_array(value)
+                continue
+        if isinstance(value, np.ndarray):
+            if buffers is not None and can_encode_binary(value):
+                data_copy[key] = encode_binary_dict(value, buffers)
+            else:
+                data_copy[key] = transform_array(value)
         else:
-            data_copy[key] = traverse_data(data[key])
+            data_copy[key] = traverse_data(value)
     return data_copy
+
+def can_encode_binary(array):
+    """ Whether a NumPy array can be sent as a raw binary buffer. """
+    return (isinstance(array, np.ndarray) and
+            not isinstance(array, np.ma.MaskedArray) and
+            array.dtype in BINARY_ARRAY_TYPES)
+
+def encode_binary_dict(array, buffers):
+    """ Append the data of a NumPy array to a list of binary buffers and
+    return a JSON-compatible reference to it.
+
+    The array data is always sent as C-contiguous, little-endian bytes,
+    which is what BokehJS typed arrays expect on all current platforms.
+
+    Args:
+        array (ndarray) : the array to encode
+        buffers (list) : a list of ``(header, payload)`` tuples to append to
+
+    Returns:
+        dict : ``{'__buffer__': id, 'shape': shape, 'dtype': dtype, 'order': 'little'}``
+
+    """
+    buffer_id = make_id()
+    little_endian = array.dtype.newbyteorder('<')
+    payload = np.ascontiguousarray(array, dtype=little_endian).tobytes()
+    buffers.append(({'id': buffer_id}, payload))
+    return {
+        '__buffer__' : buffer_id,
+        'shape'      : array.shape,
+        'dtype'      : array.dtype.name,
+        'order'      : 'little',
+    }
+
+def decode_binary_dict(obj, buffers):
+    """ Create a NumPy array from a buffer reference created by
+    ``encode_binary_dict``.
+
+    Args:
+        obj (dict) : a buffer reference
+        buffers (dict) : a mapping of buffer ids to binary payloads
+
+    Returns:
+        ndarray
+
+    """
+    buffer_id = obj['__buffer__']
+    if buffer_id not in buffers:
+        raise ValueError("Missing binary buffer %r" % buffer_id)
+    order = '<' if obj.get('order', 'little') == 'little' else '>'
+    dtype = np.dtype(obj['dtype']).newbyteorder(order)
+    array = np.frombuffer(buffers[buffer_id], dtype=dtype)
+    # arrays from frombuffer are read-only views, but data source columns
+    # may be modified in place later, so always make a native order copy
+    array = array.astype(dtype.newbyteorder('='))
+    return array.reshape(obj['shape'])
+
+def decode_buffer_refs(obj, buffers):
+    """ Replace any buffer references nested in a JSON-like object with the
+    NumPy arrays they refer to.
+
+    Args:
+        obj (JSON-like) : decoded message content
+        buffers (dict) : a mapping of buffer ids to binary payloads
+
+    Returns:
+        JSON-like
+
+    """
+    if isinstance(obj, dict):
+        if '__buffer__' in obj:
+            return decode_binary_dict(obj, buffers)
+        for key, value in obj.items():
+            obj[key] = decode_buffer_refs(value, buffers)
+    elif isinstance(obj, list):
+        for i, value in enumerate(obj):
+            obj[i] = decode_buffer_refs(value, buffers)
+    return obj
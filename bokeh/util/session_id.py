@@ -13,6 +13,7 @@ import hashlib
 import hmac
 import random
 import time
+import zlib
 
 from six import binary_type
 
@@ -98,7 +99,8 @@ def generate_secret_key():
     """
     return _get_random_string()
 
-def generate_session_id(secret_key=settings.secret_key_bytes(), signed=settings.sign_sessions()):
+def generate_session_id(secret_key=settings.secret_key_bytes(), signed=settings.sign_sessions(),
+                        worker=None, num_workers=1):
     """Generate a random session ID.
 
     Typically, each browser tab connected to a Bokeh application
@@ -118,15 +120,36 @@ def generate_session_id(secret_key=settings.secret_key_bytes(), signed=settings.
         secret_key (str, optional) : Secret key (default: value of 'BOKEH_SECRET_KEY' env var)
         signed (bool, optional) : Whether to sign the session ID (default: value of
                                   'BOKEH_SIGN_SESSIONS' env var)
+        worker (int, optional) : Index of the server worker process that the
+                                 session ID should belong to, see ``session_id_worker``
+                                 (default: None, any worker)
+        num_workers (int, optional) : Number of server worker processes (default: 1)
 
     """
     secret_key = _ensure_bytes(secret_key)
-    if signed:
-        # note: '-' can also be in the base64 encoded signature
-        base_id = _get_random_string(secret_key=secret_key)
-        return base_id + '-' + _signature(base_id, secret_key)
-    else:
-        return _get_random_string(secret_key=secret_key)
+    while True:
+        if signed:
+            # note: '-' can also be in the base64 encoded signature
+            base_id = _get_random_string(secret_key=secret_key)
+            session_id = base_id + '-' + _signature(base_id, secret_key)
+        else:
+            session_id = _get_random_string(secret_key=secret_key)
+        if worker is None or session_id_worker(session_id, num_workers) == worker:
+            return session_id
+
+def session_id_worker(session_id, num_workers):
+    """Return the index of the server worker process that owns a session.
+
+    When a Bokeh server runs several worker processes, every request for a
+    session has to be handled by the same worker. Any session ID maps to
+    exactly one worker, in the same way in every process.
+
+    Args:
+        session_id (str) : The session ID
+        num_workers (int) : The number of server worker processes
+
+    """
+    return (zlib.crc32(codecs.encode(session_id, 'utf-8')) & 0xffffffff) % num_workers
 
 def check_session_id_signature(session_id, secret_key=settings.secret_key_bytes(),
                                signed=settings.sign_sessions()):
@@ -0,0 +1,55 @@
+from __future__ import absolute_import
+
+import unittest
+
+import numpy as np
+
+from bokeh.util.downsample import visible_slice, stride_indices, minmax_indices, lttb_indices
+
+class TestDownsample(unittest.TestCase):
+
+    def setUp(self):
+        self.x = np.arange(1001, dtype=np.float64)
+        self.y = np.random.RandomState(0).randn(1001)
+
+    def test_visible_slice(self):
+        self.assertEqual(visible_slice(self.x), (0, 1001))
+        self.assertEqual(visible_slice(self.x, 10.5, 20.5), (10, 22))
+        self.assertEqual(visible_slice(self.x, 20.5, 10.5), (10, 22))
+        self.assertEqual(visible_slice(self.x, 10, 20), (9, 22))
+        self.assertEqual(visible_slice(self.x, None, 20), (0, 22))
+        self.assertEqual(visible_slice(self.x, -10, -5), (0, 1))
+        self.assertEqual(visible_slice(self.x, 2000, 3000), (1000, 1001))
+
+    def _check_indices(self, indices, start, stop, n):
+        self.assertTrue(len(indices) <= n)
+        self.assertEqual(indices[0], start)
+        self.assertEqual(indices[-1], stop - 1)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+
+    def test_indices(self):
+        for start, stop in [(0, 1001), (100, 900)]:
+            for n in (4, 5, 10, 99, 100):
+                self._check_indices(stride_indices(start, stop, n), start, stop, n)
+                self._check_indices(minmax_indices(self.y, start, stop, n), start, stop, n)
+                self._check_indices(lttb_indices(self.x, self.y, start, stop, n), start, stop, n)
+
+    def test_no_downsampling_needed(self):
+        for indices in (stride_indices(10, 20, 10), minmax_indices(self.y, 10, 20, 10),
+                        lttb_indices(self.x, self.y, 10, 20, 10)):
+            self.assertTrue(np.array_equal(indices, np.arange(10, 20)))
+
+    def test_minmax_keeps_extremes(self):
+        indices = minmax_indices(self.y, 0, 1001, 50)
+        self.assertIn(np.argmin(self.y), indices)
+        self.assertIn(np.argmax(self.y), indices)
+
+    def test_lttb_keeps_peak(self):
+        y = np.zeros(1001)
+        y[500] = 1
+        self.assertIn(500, lttb_indices(self.x, y, 0, 1001, 10))
+
+    def test_too_few_points(self):
+        for func, args in [(stride_indices, ()), (minmax_indices, (self.y,)), (lttb_indices, (self.x, self.y))]:
+            with self.assertRaises(ValueError):
+                func(*(args + (0, 1001, 3)))
@@ -2,7 +2,10 @@ from __future__ import absolute_import
 
 import unittest
 
-from bokeh.util.serialization import make_id, traverse_data
+import numpy as np
+
+from bokeh.util.serialization import (make_id, traverse_data, transform_column_source_data,
+                                      encode_binary_dict, decode_binary_dict, decode_buffer_refs)
 
 class DummyRequestCallable():
     def json(self):
@@ -36,5 +39,67 @@ class TestTraverseData(unittest.TestCase):
     def test_without_numpy(self):
         self.assertTrue(traverse_data(self.testing, False) == self.expected)
 
+class TestBinaryDicts(unittest.TestCase):
+
+    def test_roundtrip(self):
+        for dtype in (np.float32, np.float64, np.uint8, np.int8, np.uint16, np.int16, np.uint32, np.int32):
+            array = np.arange(12, dtype=dtype).reshape(3, 4)
+            buffers = []
+            obj = encode_binary_dict(array, buffers)
+            self.assertEqual(len(buffers), 1)
+            header, payload = buffers[0]
+            self.assertEqual(obj['__buffer__'], header['id'])
+            self.assertEqual(obj['dtype'], np.dtype(dtype).name)
+            self.assertEqual(obj['shape'], (3, 4))
+            self.assertEqual(obj['order'], 'little')
+            self.assertEqual(len(payload), array.nbytes)
+            decoded = decode_binary_dict(obj, {header['id']: payload})
+            self.assertEqual(decoded.dtype, array.dtype)
+            self.assertTrue(np.array_equal(decoded, array))
+
+    def test_big_endian_sent_little_endian(self):
+        array = np.arange(4, dtype='>f8')
+        buffers = []
+        obj = encode_binary_dict(array, buffers)
+        self.assertEqual(buffers[0][1], np.arange(4, dtype='<f8').tobytes())
+        decoded = decode_binary_dict(obj, dict([(buffers[0][0]['id'], buffers[0][1])]))
+        self.assertTrue(np.array_equal(decoded, array))
+
+    def test_decoded_array_is_writeable(self):
+        buffers = []
+        obj = encode_binary_dict(np.zeros(3), buffers)
+        decoded = decode_binary_dict(obj, dict([(buffers[0][0]['id'], buffers[0][1])]))
+        decoded[0] = 10
+        self.assertEqual(decoded[0], 10)
+
+    def test_missing_buffer(self):
+        obj = encode_binary_dict(np.zeros(3), [])
+        self.assertRaises(ValueError, decode_binary_dict, obj, {})
+
+    def test_transform_column_source_data(self):
+        buffers = []
+        data = dict(a=np.arange(3, dtype=np.float64),
+                    b=np.arange(3, dtype=np.int64),
+                    c=[1, 2, 3],
+                    d=np.ma.masked_array([1.0, 2.0], mask=[0, 1]))
+        out = transform_column_source_data(data, buffers=buffers)
+        self.assertEqual(len(buffers), 1)
+        self.assertEqual(out['a']['__buffer__'], buffers[0][0]['id'])
+        self.assertEqual(out['b'], [0, 1, 2])
+        self.assertEqual(out['c'], [1, 2, 3])
+        self.assertEqual(out['d'], [1.0, 'NaN'])
+
+    def test_transform_column_source_data_without_buffers(self):
+        out = transform_column_source_data(dict(a=np.arange(3, dtype=np.float64)))
+        self.assertEqual(out['a'], [0.0, 1.0, 2.0])
+
+    def test_decode_buffer_refs(self):
+        buffers = []
+        content = dict(events=[dict(data=dict(x=encode_binary_dict(np.ones(2), buffers), y=[1]))])
+        payloads = dict((header['id'], payload) for header, payload in buffers)
+        decoded = decode_buffer_refs(content, payloads)
+        self.assertTrue(np.array_equal(decoded['events'][0]['data']['x'], np.ones(2)))
+        self.assertEqual(decoded['events'][0]['data']['y'], [1])
+
 if __name__ == "__main__":
     unittest.main()
@@ -8,6 +8,7 @@ import bokeh.util.session_id
 from bokeh.util.session_id import ( generate_session_id,
                                     generate_secret_key,
                                     check_session_id_signature,
+                                    session_id_worker,
                                     _signature,
                                     _reseed_if_needed,
                                     _base64_encode )
@@ -73,6 +74,18 @@ class TestSessionId(unittest.TestCase):
         self.assertTrue(check_session_id_signature(session_id, secret_key="abc", signed=True))
         self.assertFalse(check_session_id_signature(session_id, secret_key="qrs", signed=True))
 
+    def test_generate_for_worker(self):
+        for worker in range(4):
+            session_id = generate_session_id(signed=True, secret_key="abc", worker=worker, num_workers=4)
+            self.assertEqual(worker, session_id_worker(session_id, 4))
+            self.assertTrue(check_session_id_signature(session_id, secret_key="abc", signed=True))
+
+    def test_session_id_worker(self):
+        self.assertEqual(0, session_id_worker("foo", 1))
+        self.assertEqual(session_id_worker("foo", 7), session_id_worker("foo", 7))
+        workers = set(session_id_worker(generate_session_id(signed=False), 3) for i in range(100))
+        self.assertEqual(set([0, 1, 2]), workers)
+
     def test_check_signature_of_unsigned(self):
         session_id = generate_session_id(signed=False, secret_key="abc") # secret shouldn't be used
         self.assertFalse(check_session_id_signature(session_id, secret_key="abc", signed=True))
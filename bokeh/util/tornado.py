@@ -7,6 +7,7 @@ import logging
 log = logging.getLogger(__name__)
 
 from tornado import gen
+from tornado.escape import utf8
 
 from bokeh.document import NextTickCallback, PeriodicCallback, TimeoutCallback
 
@@ -27,6 +28,48 @@ def yield_for_all_futures(result):
             result = yield future
     raise gen.Return(result)
 
+# zlib's own default, and what Tornado compresses with when no level is given
+DEFAULT_WEBSOCKET_COMPRESSION_LEVEL = 6
+
+def websocket_compression_options(level):
+    """ Returns the ``compression_options`` that enable permessage-deflate
+    on a Tornado websocket at the given zlib level, or None to disable
+    compression if level is None.
+
+    Tornado < 4.5 ignores the level and always compresses at its default.
+    """
+    if level is None:
+        return None
+    return dict(compression_level=level, mem_level=8)
+
+def write_websocket_message(protocol, message, binary=False):
+    """ Writes a message to a Tornado websocket protocol.
+
+    Returns:
+        tuple(Future, int, int) : the Future for the write, the size of
+            the message and the number of bytes written to the wire, or
+            0 if this version of Tornado doesn't count them
+    """
+    message = utf8(message)
+    wire_bytes = getattr(protocol, '_wire_bytes_out', None)
+    future = protocol.write_message(message, binary)
+    if wire_bytes is None:
+        return future, len(message), 0
+    return future, len(message), getattr(protocol, '_wire_bytes_out', wire_bytes) - wire_bytes
+
+def websocket_write_buffer_size(protocol):
+    """ Returns the number of bytes written to a Tornado websocket protocol
+    that are still waiting to be sent over the network.
+    """
+    stream = getattr(protocol, 'stream', None)
+    if stream is None:
+        return 0
+    size = getattr(stream, '_write_buffer_size', None)
+    if size is None:
+        # tornado >= 5 keeps the size in the buffer itself
+        size = len(stream._write_buffer)
+    return size
+
 class _AsyncPeriodic(object):
     """Like ioloop.PeriodicCallback except the 'func' can be async and
         return a Future, and we wait for func to finish each time
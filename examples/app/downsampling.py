@@ -0,0 +1,43 @@
+''' Explore a random walk of ten million points, sending only about
+two thousand of them to the browser at a time.
+
+Zoom in with the mouse wheel or the box zoom tool, and the server
+computes which of the points in the new range to show. Choose how the
+points are picked with the radio buttons.
+
+Use the ``bokeh serve`` command to run the example by executing:
+
+    bokeh serve downsampling.py
+
+at your command prompt. Then navigate to the URL
+
+    http://localhost:5006/downsampling
+
+in your browser.
+
+'''
+import numpy as np
+
+from bokeh.io import curdoc
+from bokeh.models import DownsampledDataSource, Range1d, RadioButtonGroup, VBox
+from bokeh.plotting import Figure
+
+N = 10000000
+x = np.arange(N, dtype=np.float64)
+y = np.cumsum(np.random.randn(N))
+
+plot = Figure(plot_width=1000, plot_height=400, x_range=Range1d(0, N, bounds=(0, N)),
+              tools="xpan,xwheel_zoom,xbox_zoom,reset")
+
+source = DownsampledDataSource(data=dict(x=x, y=y), x_range=plot.x_range, max_points=2000)
+plot.line('x', 'y', source=source)
+
+methods = ["minmax", "lttb", "stride"]
+method = RadioButtonGroup(labels=methods, active=0)
+
+def update_method(attr, old, new):
+    source.method = methods[new]
+
+method.on_change('active', update_method)
+
+curdoc().add_root(VBox(children=[method, plot]))
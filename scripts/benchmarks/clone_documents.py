@@ -0,0 +1,53 @@
+""" Compare initializing session documents by running the application
+handlers every time with cloning a document the handlers built once.
+
+Ex: ' python clone_documents.py --plots 20 --sessions 20'
+"""
+from __future__ import print_function
+
+import argparse
+import timeit
+
+import numpy as np
+
+
+def make_application(plots, rows, clone_documents):
+    from bokeh.application import Application
+    from bokeh.application.handlers import FunctionHandler
+    from bokeh.models import ColumnDataSource, VBox
+    from bokeh.plotting import Figure
+
+    def modify_document(doc):
+        x = np.linspace(0, 10, rows)
+        source = ColumnDataSource(data=dict(x=x, y=np.sin(x)))
+        figures = []
+        for i in range(plots):
+            p = Figure(title="plot %d" % i)
+            p.line('x', 'y', source=source)
+            p.circle('x', 'y', source=source)
+            figures.append(p)
+        doc.add_root(VBox(children=figures))
+
+    return Application(FunctionHandler(modify_document), clone_documents=clone_documents)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--plots', type=int, default=20,
+                        help='number of plots in each document')
+    parser.add_argument('--rows', type=int, default=10000,
+                        help='number of rows in the data source')
+    parser.add_argument('--sessions', type=int, default=20,
+                        help='number of documents to create')
+    args = parser.parse_args()
+
+    for clone_documents in (False, True):
+        app = make_application(args.plots, args.rows, clone_documents)
+        # the first document builds the template when cloning
+        app.create_document()
+        total = timeit.timeit(app.create_document, number=args.sessions)
+        print("clone_documents=%-5s %8.2f ms per document" % (clone_documents, total / args.sessions * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+""" Measure how long it takes to add one more root, and change a reference
+in it, as a document grows.
+
+Ex: ' python document_add_root.py --roots 2000 --step 250'
+"""
+from __future__ import print_function
+
+import argparse
+import timeit
+
+
+def make_root():
+    from bokeh.models import ColumnDataSource, Circle, GlyphRenderer, Plot, DataRange1d, PanTool
+
+    source = ColumnDataSource(data=dict(x=[1, 2, 3], y=[1, 2, 3]))
+    plot = Plot(x_range=DataRange1d(), y_range=DataRange1d(), tools=[PanTool()])
+    plot.renderers.append(GlyphRenderer(data_source=source, glyph=Circle(x='x', y='y')))
+    return plot
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--roots', type=int, default=2000,
+                        help='number of roots to add')
+    parser.add_argument('--step', type=int, default=250,
+                        help='report timings every STEP roots')
+    args = parser.parse_args()
+
+    from bokeh.document import Document
+    from bokeh.models import DataRange1d
+
+    doc = Document()
+    print("%8s %8s %14s %14s" % ("roots", "models", "add_root (ms)", "change (ms)"))
+    for n in range(1, args.roots + 1):
+        root = make_root()
+        if n % args.step:
+            doc.add_root(root)
+            continue
+        add = timeit.timeit(lambda: doc.add_root(root), number=1)
+        change = timeit.timeit(lambda: setattr(root, 'x_range', DataRange1d()), number=1)
+        print("%8d %8d %14.3f %14.3f" % (n, len(doc._all_models), add * 1000, change * 1000))
+
+
+if __name__ == '__main__':
+    main()
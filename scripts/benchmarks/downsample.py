@@ -0,0 +1,41 @@
+""" Measure how long a DownsampledDataSource takes to compute its view
+when the range it shows changes, for each downsampling method.
+
+Ex: ' python downsample.py --points 10000000 --max-points 2000'
+"""
+from __future__ import print_function
+
+import argparse
+import timeit
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--points', type=int, default=10000000,
+                        help='number of points in the full data')
+    parser.add_argument('--max-points', type=int, default=2000,
+                        help='most points in the view')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='number of times to repeat each benchmark')
+    args = parser.parse_args()
+
+    import numpy as np
+    from bokeh.models import DownsampledDataSource, Range1d
+
+    x = np.arange(args.points, dtype=np.float64)
+    y = np.cumsum(np.random.randn(args.points))
+    x_range = Range1d(0, args.points)
+    source = DownsampledDataSource(data=dict(x=x, y=y), x_range=x_range, max_points=args.max_points)
+
+    print("%-8s %14s %14s" % ("method", "all (ms)", "1/10 (ms)"))
+    for method in ("stride", "minmax", "lttb"):
+        source.method = method
+        times = []
+        for end in (args.points, args.points // 10):
+            x_range.end = end
+            times.append(min(timeit.repeat(source._update_view, number=1, repeat=args.repeat)))
+        print("%-8s %14.2f %14.2f" % (method, times[0] * 1000, times[1] * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+""" Measure how long it takes to build a figure with many glyph renderers,
+one glyph method call at a time and in a batch.
+
+Ex: ' python figure_renderers.py --renderers 1000 2000 4000'
+"""
+from __future__ import print_function
+
+import argparse
+import time
+
+
+def build(n, batch):
+    from bokeh.plotting import Figure
+
+    p = Figure(tools="pan,box_select")
+    start = time.time()
+    if batch:
+        with p.batch():
+            add_lines(p, n)
+    else:
+        add_lines(p, n)
+    return time.time() - start
+
+
+def add_lines(p, n):
+    for i in range(n):
+        p.line([1, 2, 3], [i, i + 1, i], legend="odd" if i % 2 else "even")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--renderers', type=int, nargs='+', default=[500, 1000, 2000],
+                        help='numbers of renderers to add to a figure')
+    parser.add_argument('--batch-only', action='store_true',
+                        help='only time batches, which is faster for many renderers')
+    args = parser.parse_args()
+
+    print("%10s %14s %14s" % ("renderers", "one by one (s)", "batch (s)"))
+    for n in args.renderers:
+        single = float('nan') if args.batch_only else build(n, False)
+        print("%10d %14.2f %14.2f" % (n, single, build(n, True)))
+
+
+if __name__ == '__main__':
+    main()
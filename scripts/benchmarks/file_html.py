@@ -0,0 +1,46 @@
+""" Measure how long it takes to save many standalone HTML files with
+inline resources, one after another and in a pool of processes.
+
+Ex: ' python file_html.py --files 200 --procs 4'
+"""
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+
+def make_plot(n):
+    from bokeh.plotting import figure
+
+    p = figure(title="Report %d" % n)
+    p.line(list(range(10)), [n] * 10)
+    return p
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--files', type=int, default=200,
+                        help='number of HTML files to save')
+    parser.add_argument('--procs', type=int, default=None,
+                        help='number of processes to save files in (default: one per CPU)')
+    args = parser.parse_args()
+
+    from bokeh.io import save_many
+    from bokeh.resources import INLINE
+
+    dirname = tempfile.mkdtemp()
+    try:
+        jobs = [(os.path.join(dirname, "%d.html" % n), (n,)) for n in range(args.files)]
+        for name, num_procs in [("sequential", 1), ("parallel", args.procs)]:
+            start = time.time()
+            save_many(make_plot, jobs, resources=INLINE, num_procs=num_procs)
+            print("%-10s %8.1f files/s" % (name, args.files / (time.time() - start)))
+    finally:
+        shutil.rmtree(dirname)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+""" Measure how long it takes to import Bokeh modules in a new Python
+process, and to import bokeh.plotting and save a plot to static HTML.
+
+Ex: ' python import_time.py --repeat 5 bokeh.models bokeh.plotting'
+"""
+from __future__ import print_function
+
+import argparse
+import subprocess
+import sys
+
+TIMED = """
+import time
+start = time.time()
+%s
+print(time.time() - start)
+"""
+
+FILE_HTML = """
+from bokeh.embed import file_html
+from bokeh.plotting import figure
+from bokeh.resources import CDN
+p = figure()
+p.line([1, 2, 3], [1, 2, 3])
+file_html(p, CDN)
+"""
+
+
+def best_time(code, repeat):
+    times = []
+    for i in range(repeat):
+        output = subprocess.check_output([sys.executable, "-c", TIMED % code])
+        times.append(float(output.decode('utf-8').strip().splitlines()[-1]))
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('modules', nargs='*', default=['bokeh', 'bokeh.models', 'bokeh.plotting'],
+                        help='modules to import')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of processes to take the fastest time from')
+    args = parser.parse_args()
+
+    for module in args.modules:
+        print("%-30s %8.1f ms" % ("import " + module, best_time("import " + module, args.repeat) * 1000))
+    print("%-30s %8.1f ms" % ("file_html of a line plot", best_time(FILE_HTML, args.repeat) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+""" Measure ``Document.to_json_string`` throughput with each of the JSON
+serialization engines selectable with ``BOKEH_JSON_SERIALIZER``.
+
+Ex: ' python json_serialization.py --rows 1000000 --plots 20'
+"""
+from __future__ import print_function
+
+import argparse
+import os
+import timeit
+
+import numpy as np
+
+
+def make_document(rows, plots):
+    from bokeh.document import Document
+    from bokeh.models import ColumnDataSource, VBox
+    from bokeh.plotting import Figure
+
+    x = np.linspace(0, 100, rows)
+    y = np.sin(x)
+    y[::100] = np.nan
+    source = ColumnDataSource(data=dict(x=x, y=y, z=np.arange(rows)))
+
+    figures = []
+    for i in range(plots):
+        p = Figure(title="plot %d" % i)
+        p.line('x', 'y', source=source)
+        p.circle('x', 'y', source=source, size=2)
+        figures.append(p)
+
+    doc = Document()
+    doc.add_root(VBox(children=figures))
+    return doc
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=200000,
+                        help='number of rows in the data source')
+    parser.add_argument('--plots', type=int, default=20,
+                        help='number of plots sharing the data source')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of serializations to time')
+    args = parser.parse_args()
+
+    from bokeh.core.json_encoder import JSON_SERIALIZERS
+
+    doc = make_document(args.rows, args.plots)
+
+    for engine in sorted(JSON_SERIALIZERS):
+        os.environ["BOKEH_JSON_SERIALIZER"] = engine
+        size = len(doc.to_json_string())
+        best = min(timeit.repeat(doc.to_json_string, number=1, repeat=args.repeat))
+        print("%-10s %8.3f s  %8.1f MB/s  (%d bytes)" % (engine, best, size / best / 1e6, size))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+""" Micro-benchmarks for model construction and property access.
+
+Ex: ' python model_properties.py --number 10000'
+"""
+from __future__ import print_function
+
+import argparse
+import timeit
+
+
+def bench_construct_circle():
+    from bokeh.models import Circle
+    return lambda: Circle(x='x', y='y', size=10, fill_color="red")
+
+
+def bench_construct_renderer():
+    from bokeh.models import Circle, ColumnDataSource, GlyphRenderer
+    source = ColumnDataSource(data=dict(x=[1], y=[1]))
+    return lambda: GlyphRenderer(data_source=source, glyph=Circle(x='x', y='y'))
+
+
+def bench_figure_glyphs():
+    from bokeh.plotting import Figure
+    def run():
+        p = Figure()
+        for i in range(10):
+            p.circle([1, 2, 3], [1, 2, 3], size=i)
+    return run
+
+
+def bench_setattr():
+    from bokeh.models import Circle
+    c = Circle()
+    def run():
+        c.x = 'a'
+        c.y = 'b'
+        c.line_alpha = 0.5
+        c.name = 'c'
+    return run
+
+
+def bench_getattr():
+    from bokeh.models import Circle
+    c = Circle(x='a')
+    return lambda: (c.x, c.y, c.line_alpha, c.name)
+
+
+def bench_properties():
+    from bokeh.models import Circle
+    return lambda: (Circle.properties(), Circle.properties_with_refs(),
+                    Circle.properties_containers(), Circle.dataspecs())
+
+
+BENCHMARKS = [
+    ("construct Circle", bench_construct_circle, 1),
+    ("construct GlyphRenderer", bench_construct_renderer, 1),
+    ("Figure with 10 glyphs", bench_figure_glyphs, 100),
+    ("4 x setattr", bench_setattr, 1),
+    ("4 x getattr", bench_getattr, 1),
+    ("properties lookups", bench_properties, 1),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--number', type=int, default=10000,
+                        help='number of calls to time for the fastest benchmarks')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='number of times to repeat each benchmark')
+    args = parser.parse_args()
+
+    for name, setup, cost in BENCHMARKS:
+        run = setup()
+        number = max(1, args.number // cost)
+        best = min(timeit.repeat(run, number=number, repeat=args.repeat))
+        print("%-25s %10.2f us" % (name, best / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+""" Measure how many pages for new sessions a Bokeh server serves per
+second, with many requests in flight at once.
+
+Ex: ' python server_pages.py --requests 1000 --concurrency 1000'
+"""
+from __future__ import print_function
+
+import argparse
+import time
+
+
+def make_document(doc):
+    # keep sessions cheap to create, so that serving the page dominates
+    from bokeh.models import Paragraph
+
+    doc.add_root(Paragraph(text="page"))
+
+
+def uncached_page(session_id, resources, title, websocket_url):
+    # how pages were rendered before they were cached
+    from bokeh.embed import _bundle_for_objs_and_resources, _html_page_for_render_items
+    from bokeh.util.serialization import make_id
+
+    render_items = [{ 'sessionid' : session_id, 'elementid' : make_id(), 'use_for_title' : True }]
+    bundle = _bundle_for_objs_and_resources(None, resources)
+    return _html_page_for_render_items(bundle, {}, render_items, title, websocket_url=websocket_url)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=1000,
+                        help='number of pages to request, each for a new session')
+    parser.add_argument('--concurrency', type=int, default=1000,
+                        help='number of requests in flight at once')
+    parser.add_argument('--port', type=int, default=5006,
+                        help='port to run the server on')
+    args = parser.parse_args()
+
+    from tornado import gen
+    from tornado.httpclient import AsyncHTTPClient
+    from tornado.ioloop import IOLoop
+
+    from bokeh.application import Application
+    from bokeh.application.handlers import FunctionHandler
+    from bokeh.server.server import Server
+    import bokeh.server.views.doc_handler as doc_handler
+
+    loop = IOLoop()
+    server = Server({'/app': Application(FunctionHandler(make_document))}, io_loop=loop, port=args.port)
+    server.start(start_loop=False)
+    url = "http://localhost:%d/app" % args.port
+    client = AsyncHTTPClient(io_loop=loop, force_instance=True, max_clients=args.concurrency)
+
+    @gen.coroutine
+    def fetch_all():
+        yield [client.fetch(url) for i in range(args.requests)]
+
+    cached_page = doc_handler.server_html_page_for_session
+    for name, page in [("uncached", uncached_page), ("cached", cached_page)]:
+        doc_handler.server_html_page_for_session = page
+        start = time.time()
+        loop.run_sync(fetch_all, timeout=600)
+        print("%-10s %8.1f pages/s" % (name, args.requests / (time.time() - start)))
+
+
+if __name__ == '__main__':
+    main()